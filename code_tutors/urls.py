@@ -36,11 +36,14 @@ urlpatterns = [
     path('list-tutors/tutor/<int:tutor_id>/', views.tutor_detail, name='tutor_detail'),
     path('list-tutors/tutor/<int:tutor_id>/delete-tutor/', views.delete_tutor, name='delete_tutor'),
     path('student-sessions/', views.student_sessions, name='student_sessions'),
+    path('student-sessions/export/<str:export_format>/', views.export_student_sessions, name='export_student_sessions'),
     path('student-sessions/send-invoice/<int:session_id>/', views.send_invoice, name='send_invoice'),
     path('student-sessions/remove-session/<int:session_id>/', views.remove_session, name='remove_session'),
     path('request-session/', views.request_session, name='request_session'),
     path('pending-requests/', views.list_pending_requests, name='pending_requests'),
+    path('pending-requests/approve/', views.approve_pending_requests, name='approve_pending_requests'),
     path('invoices/', views.invoices, name='invoices'),
+    path('invoices/export/<str:export_format>/', views.export_invoices, name='export_invoices'),
     path('available-tutors/<int:request_id>/', views.available_tutors, name='available_tutors'),
     path('available-tutors/<int:request_id>/approve-session/<int:tutor_session_id>/', views.approve_session, name='approve_session'),
     path('student-pending-payments/', views.student_pending_payments, name='student_pending_payments'),
@@ -49,6 +52,7 @@ urlpatterns = [
     path('your-tutor-sessions/', views.your_tutor_sessions, name='your_tutor_sessions'),
     path('session/<int:session_id>/', views.session_details, name='session_details'),
     path('requested-sessions/', views.requested_sessions, name='requested_sessions'),
+    path('ops/perf/', views.perf_report, name='perf_report'),
 
 ]
 urlpatterns += static(settings.STATIC_URL, document_root=settings.STATIC_ROOT)
\ No newline at end of file
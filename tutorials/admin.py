@@ -1,17 +1,36 @@
-from django.contrib import admin
+from django.contrib import admin, messages
+from django.contrib.admin.views.main import ORDER_VAR
 from .models import (
-    Admin, User, Student, ProgrammingLanguage, Tutor, Session, TutorSession, RequestedStudentSession, StudentSession, Invoice
+    Admin, User, Student, ProgrammingLanguage, Tutor, Session, TutorSession, RequestedStudentSession, StudentSession, Invoice, RateCard, Term
 )
+from .search import search
+from .services import send_invoices
+
+
+class UserSearchMixin:
+    """Search the change list with the full-text user index instead of icontains lookups, best matches first."""
+
+    search_user_field = 'pk'
+
+    def get_search_results(self, request, queryset, search_term):
+        if not search_term.strip():
+            return queryset, False
+        results = search(queryset, search_term, self.search_user_field)
+        # The change list orders before it searches, so rank the results unless a column was picked to sort by
+        if ORDER_VAR not in request.GET:
+            results = results.order_by('search_rank', '-pk')
+        return results, False
 
 @admin.register(User)
-class UserAdmin(admin.ModelAdmin):
+class UserAdmin(UserSearchMixin, admin.ModelAdmin):
     list_display = ['username', 'email', 'first_name', 'last_name']
     search_fields = ['username', 'email', 'first_name', 'last_name']
 
 @admin.register(Student)
-class StudentAdmin(admin.ModelAdmin):
+class StudentAdmin(UserSearchMixin, admin.ModelAdmin):
     list_display = ['user', 'enrollment_date']
     search_fields = ['user__username', 'user__first_name', 'user__last_name']
+    search_user_field = 'user'
     filter_horizontal = ['previous_sessions']
 
 @admin.register(ProgrammingLanguage)
@@ -20,26 +39,31 @@ class ProgrammingLanguageAdmin(admin.ModelAdmin):
     search_fields = ['name']
 
 @admin.register(Tutor)
-class TutorAdmin(admin.ModelAdmin):
+class TutorAdmin(UserSearchMixin, admin.ModelAdmin):
     list_display = ['user', 'expertise_list']
     search_fields = ['user__username', 'user__first_name', 'user__last_name']
+    search_user_field = 'user'
     filter_horizontal = ['expertise']
 
+    def get_queryset(self, request):
+        # expertise_list reads the prefetched languages instead of querying once per row
+        return super().get_queryset(request).prefetch_related('expertise')
+
 @admin.register(Admin)
 class AdminAdmin(admin.ModelAdmin):
     list_display = ['user']
 
 @admin.register(Session)
 class SessionAdmin(admin.ModelAdmin):
-    list_display = ['programming_language', 'level', 'season', 'year', 'frequency', 'start_day', 'end_day', 'is_available']
+    list_display = ['programming_language', 'level', 'season', 'year', 'frequency', 'start_day', 'end_day']
     search_fields = ['programming_language__name', 'season', 'year']
-    list_filter = ['level', 'season', 'year', 'frequency', 'is_available']
+    list_filter = ['level', 'season', 'year', 'frequency']
 
 @admin.register(TutorSession)
 class TutorSessionAdmin(admin.ModelAdmin):
-    list_display = ['tutor', 'session', 'created_at']
+    list_display = ['tutor', 'session', 'created_at', 'is_available']
     search_fields = ['tutor__user__username', 'session__programming_language__name']
-    list_filter = ['created_at']
+    list_filter = ['created_at', 'is_available']
 
 @admin.register(RequestedStudentSession)
 class RequestedStudentSessionAdmin(admin.ModelAdmin):
@@ -53,6 +77,12 @@ class StudentSessionAdmin(admin.ModelAdmin):
     list_display = ('student', 'tutor_session', 'status', 'registered_at')
     search_fields = ('student__user__username', 'tutor_session__session__programming_language__name')
     list_filter = ('status',)
+    actions = ['send_invoices']
+
+    @admin.action(description="Send invoices for the selected sessions")
+    def send_invoices(self, request, queryset):
+        invoices = send_invoices(queryset)
+        self.message_user(request, f"Created {len(invoices)} invoices.", messages.SUCCESS)
 
 @admin.register(Invoice)
 class InvoiceAdmin(admin.ModelAdmin):
@@ -60,3 +90,12 @@ class InvoiceAdmin(admin.ModelAdmin):
     search_fields = ['session__student__user__username', 'session__tutor__user__username']
     list_filter = ['payment_status', 'created_at']
 
+@admin.register(RateCard)
+class RateCardAdmin(admin.ModelAdmin):
+    list_display = ['duration_hours', 'level', 'programming_language', 'amount']
+    list_filter = ['duration_hours', 'level', 'programming_language']
+
+@admin.register(Term)
+class TermAdmin(admin.ModelAdmin):
+    list_display = ['season', 'year', 'start_date', 'weeks', 'end_date']
+    list_filter = ['year', 'season']
@@ -0,0 +1,210 @@
+"""Global assignment of pending session requests to available tutor sessions.
+
+A request can be served by any tutor session whose session has the same
+language, level, season and year as the request's, as in `tutorials.matching`.
+A tutor session is taken by its first enrollment, so each available tutor
+session serves at most one request. Several tutors can offer the same catalog
+session, and each of their tutor sessions is a slot of its own. A tutor may be
+limited to a number of active enrollments.
+
+`plan_assignments` solves this as a maximum flow, with Dinic's algorithm, over
+a network compressed by match group instead of one node per request:
+
+    source -> match group (capacity: its pending requests)
+           -> tutor, one edge per tutor session (capacity 1)
+           -> sink (capacity: the tutor's remaining enrollments)
+
+The requests of a match group are interchangeable, so the flow into a group is
+handed to its oldest requests, each preferring a session identical to the one
+it asked for.
+"""
+from collections import defaultdict, deque
+
+from django.db.models import Count
+from tutorials.models import RequestedStudentSession, StudentSession, TutorSession
+
+
+# The session fields of MATCH_FIELDS as read through a request or a tutor session, in the order of a match key
+MATCH_COLUMNS = ['session__programming_language_id', 'session__level', 'session__season', 'session__year']
+
+
+def pending_requests(lock=False):
+    """Return every pending request as a (pk, student_id, session_id, key) row, oldest first."""
+
+    requests = RequestedStudentSession.objects.filter(is_approved=False)
+    if lock:
+        requests = requests.select_for_update()
+    return [
+        (pk, student_id, session_id, tuple(key))
+        for pk, student_id, session_id, *key in requests.order_by('requested_at', 'pk').values_list(
+            'pk', 'student_id', 'session_id', *MATCH_COLUMNS
+        )
+    ]
+
+
+def available_tutor_sessions(lock=False):
+    """Return every available tutor session as a (pk, tutor_id, session_id, key) row, oldest first."""
+
+    tutor_sessions = TutorSession.objects.filter(is_available=True)
+    if lock:
+        tutor_sessions = tutor_sessions.select_for_update(of=('self',))
+    return [
+        (pk, tutor_id, session_id, tuple(key))
+        for pk, tutor_id, session_id, *key in tutor_sessions.order_by('created_at', 'pk').values_list(
+            'pk', 'tutor_id', 'session_id', *MATCH_COLUMNS
+        )
+    ]
+
+
+def tutor_loads():
+    """Return the number of enrollments that are not cancelled, per tutor id."""
+
+    return dict(
+        StudentSession.objects.exclude(status='Cancelled').order_by().values('tutor_session__tutor_id')
+        .annotate(count=Count('pk')).values_list('tutor_session__tutor_id', 'count')
+    )
+
+
+def plan_assignments(requests, tutor_sessions, tutor_capacity=None, loads=None):
+    """Assign as many requests as possible to tutor sessions.
+
+    `requests` and `tutor_sessions` are rows as returned by `pending_requests`
+    and `available_tutor_sessions`. `tutor_capacity` is the maximum number of
+    enrollments of a tutor, counting the `loads` they already have, or None for
+    no limit. Returns the (request, tutor session) row pairs and the requests
+    left unassigned.
+    """
+
+    loads = loads or {}
+    demand = defaultdict(list)
+    for request in requests:
+        demand[request[3]].append(request)
+
+    # Nodes: 0 is the source, 1 the sink, then match groups and tutors
+    nodes = {}
+
+    def node(name):
+        if name not in nodes:
+            nodes[name] = len(nodes) + 2
+        return nodes[name]
+
+    network = FlowNetwork()
+    unlimited = len(requests)
+    tutor_edges = {}
+    for tutor_session in tutor_sessions:
+        _, tutor_id, _, key = tutor_session
+        if key not in demand:
+            continue
+        remaining = unlimited if tutor_capacity is None else tutor_capacity - loads.get(tutor_id, 0)
+        if remaining <= 0:
+            continue
+        group = ('group', key)
+        if group not in nodes:
+            network.add_edge(0, node(group), len(demand[key]))
+        tutor = ('tutor', tutor_id)
+        if tutor not in nodes:
+            network.add_edge(node(tutor), 1, remaining)
+        tutor_edges[network.add_edge(nodes[group], nodes[tutor], 1)] = tutor_session
+    network.max_flow(0, 1, len(nodes) + 2)
+
+    # The tutor sessions carrying flow, per match group, oldest first
+    chosen = defaultdict(list)
+    for edge, tutor_session in tutor_edges.items():
+        if network.flow(edge):
+            chosen[tutor_session[3]].append(tutor_session)
+
+    assignments = []
+    unassigned = []
+    for key, group_requests in demand.items():
+        slots = chosen.get(key, [])
+        served = group_requests[:len(slots)]
+        unassigned.extend(group_requests[len(slots):])
+        # Requests first take a tutor session of the very session they asked for, then any other
+        by_session = defaultdict(deque)
+        for tutor_session in slots:
+            by_session[tutor_session[2]].append(tutor_session)
+        remaining = []
+        for request in served:
+            if by_session.get(request[2]):
+                assignments.append((request, by_session[request[2]].popleft()))
+            else:
+                remaining.append(request)
+        assignments.extend(zip(remaining, (tutor_session for left in by_session.values() for tutor_session in left)))
+    return assignments, unassigned
+
+
+class FlowNetwork:
+    """A flow network with integer capacities, solved with Dinic's algorithm."""
+
+    def __init__(self):
+        self.heads = []
+        self.capacities = []
+        self.edges = defaultdict(list)
+
+    def add_edge(self, tail, head, capacity):
+        """Add an edge and its residual edge, returning the index of the edge."""
+
+        edge = len(self.heads)
+        self.heads.extend([head, tail])
+        self.capacities.extend([capacity, 0])
+        self.edges[tail].append(edge)
+        self.edges[head].append(edge + 1)
+        return edge
+
+    def flow(self, edge):
+        """Return the flow through an edge, which is the capacity of its residual edge."""
+
+        return self.capacities[edge ^ 1]
+
+    def max_flow(self, source, sink, node_count):
+        """Push the maximum flow from the source to the sink and return its value."""
+
+        heads, capacities = self.heads, self.capacities
+        adjacency = [self.edges.get(node, []) for node in range(node_count)]
+        total = 0
+        while True:
+            # Breadth first search for the distance of every node from the source in the residual network
+            levels = [-1] * node_count
+            levels[source] = 0
+            queue = deque([source])
+            while queue:
+                tail = queue.popleft()
+                for edge in adjacency[tail]:
+                    head = heads[edge]
+                    if capacities[edge] and levels[head] < 0:
+                        levels[head] = levels[tail] + 1
+                        queue.append(head)
+            if levels[sink] < 0:
+                return total
+
+            # Depth first search for a blocking flow along edges that move one level further
+            next_edge = [0] * node_count
+            while True:
+                path = []
+                tail = source
+                while tail != sink:
+                    edges = adjacency[tail]
+                    while next_edge[tail] < len(edges):
+                        edge = edges[next_edge[tail]]
+                        head = heads[edge]
+                        if capacities[edge] and levels[head] == levels[tail] + 1:
+                            break
+                        next_edge[tail] += 1
+                    else:
+                        # A dead end: retreat to the previous node and skip the edge that led here
+                        if not path:
+                            break
+                        levels[tail] = -1
+                        edge = path.pop()
+                        tail = heads[edge ^ 1]
+                        next_edge[tail] += 1
+                        continue
+                    path.append(edge)
+                    tail = head
+                if tail != sink:
+                    break
+                pushed = min(capacities[edge] for edge in path)
+                for edge in path:
+                    capacities[edge] -= pushed
+                    capacities[edge ^ 1] += pushed
+                total += pushed
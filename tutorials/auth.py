@@ -0,0 +1,52 @@
+"""Loading the signed in user together with their role profile.
+
+`ProfileBackend` fetches the user of a session with their student, tutor and
+admin profiles joined in, so reading any of them afterwards, or finding that
+one does not exist, needs no further query. `ProfileMiddleware` exposes the
+profile that matches the user's role as `request.profile`, or None for
+anonymous users and users whose profile is missing. It loads the user as the
+request comes in, which costs nothing for visitors without a session and is
+the query a signed in page would make anyway.
+"""
+from django.contrib.auth.backends import ModelBackend
+from django.core.exceptions import ObjectDoesNotExist
+from tutorials.models import User
+
+
+# The reverse one-to-one accessor of the profile of each role
+PROFILE_FIELDS = {
+    User.Roles.STUDENT: 'student_profile',
+    User.Roles.TUTOR: 'tutor_profile',
+    User.Roles.ADMIN: 'admin_profile',
+}
+
+
+class ProfileBackend(ModelBackend):
+    """The model backend, loading the user's profiles in the same query as the user."""
+
+    def get_user(self, user_id):
+        user = User.objects.select_related(*PROFILE_FIELDS.values()).filter(pk=user_id).first()
+        return user if self.user_can_authenticate(user) else None
+
+
+class ProfileMiddleware:
+    """Set `request.profile` to the profile matching the role of the signed in user."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        request.profile = get_profile(request.user)
+        return self.get_response(request)
+
+
+def get_profile(user):
+    """Return the profile matching the user's role, or None when there is none."""
+
+    field = PROFILE_FIELDS.get(getattr(user, 'role', None))
+    if field is None or not user.is_authenticated:
+        return None
+    try:
+        return getattr(user, field)
+    except ObjectDoesNotExist:
+        return None
@@ -0,0 +1,192 @@
+"""The session catalog: one Session row per distinct combination of its catalog fields.
+
+Requests and tutor offers for the same kind of session share a single row,
+which the `unique_session` constraint enforces. `merge_duplicate_sessions`
+folds rows created before the constraint existed into the oldest copy.
+"""
+from django.apps import apps as django_apps
+
+
+CATALOG_FIELDS = ['programming_language', 'level', 'season', 'year', 'frequency', 'duration_hours']
+MERGE_BATCH_SIZE = 500
+# Enrollment statuses from the least to the most advanced, to keep the furthest one when two enrollments merge
+ENROLLMENT_STATUS_ORDER = ['Cancelled', 'Send Invoice', 'Payment Pending', 'Approved']
+
+
+def _batches(ids):
+    ids = list(ids)
+    for start in range(0, len(ids), MERGE_BATCH_SIZE):
+        yield ids[start:start + MERGE_BATCH_SIZE]
+
+
+def merge_duplicate_sessions(apps=django_apps):
+    """Merge every group of sessions sharing the catalog fields into its oldest session.
+
+    Tutor sessions, requests, enrollments, invoices and matches are repointed
+    with bulk statements. Where repointing would create a second row for the
+    same tutor, student or match, the rows are merged into the existing one. A
+    merged request hands its matches and, if older, its request date to the
+    kept request. A merged enrollment hands its invoices, its status if more
+    advanced and its registration date if earlier to the kept enrollment.
+    `apps` is the model registry, so the same code can run from a data migration.
+    Returns the number of sessions removed.
+    """
+
+    Session = apps.get_model('tutorials', 'Session')
+    TutorSession = apps.get_model('tutorials', 'TutorSession')
+    StudentSession = apps.get_model('tutorials', 'StudentSession')
+    RequestedStudentSession = apps.get_model('tutorials', 'RequestedStudentSession')
+    Student = apps.get_model('tutorials', 'Student')
+    Invoice = apps.get_model('tutorials', 'Invoice')
+
+    canonical = {}
+    duplicates = {}
+    for pk, *key in Session.objects.order_by('pk').values_list('pk', *CATALOG_FIELDS):
+        keeper = canonical.setdefault(tuple(key), pk)
+        if keeper != pk:
+            duplicates[pk] = keeper
+    if not duplicates:
+        return 0
+
+    # Tutor sessions: keep one per tutor on the canonical session, move or merge the rest
+    keepers = {}
+    moved_tutor_sessions = []
+    merged_tutor_sessions = {}
+    rows = []
+    for batch in _batches(set(duplicates) | set(duplicates.values())):
+        rows.extend(TutorSession.objects.filter(session_id__in=batch).values_list('pk', 'tutor_id', 'session_id'))
+    # Tutor sessions already on a canonical session come first, so they are the ones kept
+    rows.sort(key=lambda row: (row[2] in duplicates, row[0]))
+    for pk, tutor_id, session_id in rows:
+        target = duplicates.get(session_id, session_id)
+        keeper = keepers.setdefault((tutor_id, target), pk)
+        if keeper != pk:
+            merged_tutor_sessions[pk] = keeper
+        elif session_id != target:
+            moved_tutor_sessions.append(TutorSession(pk=pk, session_id=target))
+    TutorSession.objects.bulk_update(moved_tutor_sessions, ['session'], batch_size=MERGE_BATCH_SIZE)
+
+    if merged_tutor_sessions:
+        _merge_enrollments(StudentSession, Invoice, merged_tutor_sessions)
+        _repoint_many_to_many(
+            RequestedStudentSession.available_tutor_sessions.through, 'tutorsession_id', merged_tutor_sessions
+        )
+        for batch in _batches(merged_tutor_sessions):
+            TutorSession.objects.filter(pk__in=batch).delete()
+
+    # Requests: a student keeps one request per canonical session, dated from their earliest copy
+    requested = {}
+    for batch in _batches(set(duplicates.values())):
+        requested.update(
+            ((student_id, session_id), (pk, requested_at))
+            for pk, student_id, session_id, requested_at in RequestedStudentSession.objects.filter(session_id__in=batch)
+            .values_list('pk', 'student_id', 'session_id', 'requested_at')
+        )
+    moved_requests = []
+    merged_requests = {}
+    earliest = {}
+    for batch in _batches(duplicates):
+        for pk, student_id, session_id, requested_at in RequestedStudentSession.objects.filter(session_id__in=batch) \
+                .order_by('pk').values_list('pk', 'student_id', 'session_id', 'requested_at'):
+            target = duplicates[session_id]
+            kept, kept_at = requested.setdefault((student_id, target), (pk, requested_at))
+            if kept == pk:
+                moved_requests.append(RequestedStudentSession(pk=pk, session_id=target))
+            else:
+                merged_requests[pk] = kept
+                if requested_at < earliest.get(kept, kept_at):
+                    earliest[kept] = requested_at
+    RequestedStudentSession.objects.bulk_update(moved_requests, ['session'], batch_size=MERGE_BATCH_SIZE)
+    RequestedStudentSession.objects.bulk_update(
+        [RequestedStudentSession(pk=pk, requested_at=requested_at) for pk, requested_at in earliest.items()],
+        ['requested_at'],
+        batch_size=MERGE_BATCH_SIZE,
+    )
+    if merged_requests:
+        # The matches of a merged request carry over to the request that is kept
+        _repoint_many_to_many(
+            RequestedStudentSession.available_tutor_sessions.through, 'requestedstudentsession_id', merged_requests
+        )
+        for batch in _batches(merged_requests):
+            RequestedStudentSession.objects.filter(pk__in=batch).delete()
+
+    _repoint_many_to_many(Student.previous_sessions.through, 'session_id', duplicates)
+
+    for batch in _batches(duplicates):
+        Session.objects.filter(pk__in=batch).delete()
+    return len(duplicates)
+
+
+def _merge_enrollments(StudentSession, Invoice, merged_tutor_sessions):
+    """Move the enrollments of merged tutor sessions, folding a student's second enrollment into the first.
+
+    The enrollment that is kept takes the most advanced status and the earliest
+    registration date of the two, so a paid enrollment is not billed again.
+    """
+
+    enrolled = {}
+    for batch in _batches(set(merged_tutor_sessions.values())):
+        enrolled.update(
+            ((student_id, tutor_session_id), (pk, status, registered_at))
+            for pk, student_id, tutor_session_id, status, registered_at in StudentSession.objects.filter(
+                tutor_session_id__in=batch
+            ).values_list('pk', 'student_id', 'tutor_session_id', 'status', 'registered_at')
+        )
+    moved = []
+    dropped = {}
+    merged = {}
+    for batch in _batches(merged_tutor_sessions):
+        for pk, student_id, tutor_session_id, status, registered_at in StudentSession.objects.filter(
+            tutor_session_id__in=batch
+        ).order_by('pk').values_list('pk', 'student_id', 'tutor_session_id', 'status', 'registered_at'):
+            target = merged_tutor_sessions[tutor_session_id]
+            key = (student_id, target)
+            kept = enrolled.setdefault(key, (pk, status, registered_at))
+            if kept[0] == pk:
+                moved.append(StudentSession(pk=pk, tutor_session_id=target))
+                continue
+            kept_pk, kept_status, kept_at = merged.get(key, kept)
+            dropped[pk] = kept_pk
+            merged[key] = (
+                kept_pk,
+                max(kept_status, status, key=ENROLLMENT_STATUS_ORDER.index),
+                min(kept_at, registered_at),
+            )
+    StudentSession.objects.bulk_update(moved, ['tutor_session'], batch_size=MERGE_BATCH_SIZE)
+    StudentSession.objects.bulk_update(
+        [
+            StudentSession(pk=pk, status=status, registered_at=registered_at)
+            for pk, status, registered_at in merged.values()
+        ],
+        ['status', 'registered_at'],
+        batch_size=MERGE_BATCH_SIZE,
+    )
+
+    # Invoices follow their enrollment into the one that is kept
+    invoices = []
+    for batch in _batches(dropped):
+        invoices.extend(
+            Invoice(pk=pk, session_id=dropped[session_id])
+            for pk, session_id in Invoice.objects.filter(session_id__in=batch).values_list('pk', 'session_id')
+        )
+    Invoice.objects.bulk_update(invoices, ['session'], batch_size=MERGE_BATCH_SIZE)
+    for batch in _batches(dropped):
+        StudentSession.objects.filter(pk__in=batch).delete()
+
+
+def _repoint_many_to_many(through, column, replacements):
+    """Point the rows of a many-to-many table at the replacement ids, skipping rows that already exist."""
+
+    other = next(
+        field.column for field in through._meta.concrete_fields
+        if field.column != column and not field.primary_key
+    )
+    rows = []
+    for batch in _batches(replacements):
+        matching = through.objects.filter(**{f'{column}__in': batch})
+        rows.extend(
+            through(**{other: other_id, column: replacements[replaced_id]})
+            for other_id, replaced_id in matching.values_list(other, column)
+        )
+        matching.delete()
+    through.objects.bulk_create(rows, batch_size=MERGE_BATCH_SIZE, ignore_conflicts=True)
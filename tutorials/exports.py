@@ -0,0 +1,81 @@
+"""Streaming CSV and JSON Lines exports of invoices and student sessions.
+
+Each export reads plain value tuples, with every join resolved by the one
+SELECT, and walks them with `QuerySet.iterator()`, so memory use does not grow
+with the number of rows. The CSV header is produced before the query runs,
+which lets a streaming response send its first byte straight away.
+"""
+import csv
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+from tutorials.models import Invoice, StudentSession
+
+
+EXPORT_CHUNK_SIZE = 2000
+EXPORT_FORMATS = {
+    'csv': 'text/csv',
+    'jsonl': 'application/jsonl',
+}
+
+# Export name: (model, [(column, field lookup), ...])
+EXPORTS = {
+    'invoices': (Invoice, [
+        ('id', 'pk'),
+        ('created_at', 'created_at'),
+        ('student_username', 'session__student__user__username'),
+        ('student_first_name', 'session__student__user__first_name'),
+        ('student_last_name', 'session__student__user__last_name'),
+        ('tutor_username', 'session__tutor_session__tutor__user__username'),
+        ('session', 'session__tutor_session__session__label'),
+        ('amount', 'amount'),
+        ('payment_status', 'payment_status'),
+        ('due_date', 'due_date'),
+        ('payment_date', 'payment_date'),
+    ]),
+    'student_sessions': (StudentSession, [
+        ('id', 'pk'),
+        ('registered_at', 'registered_at'),
+        ('status', 'status'),
+        ('student_username', 'student__user__username'),
+        ('student_first_name', 'student__user__first_name'),
+        ('student_last_name', 'student__user__last_name'),
+        ('tutor_username', 'tutor_session__tutor__user__username'),
+        ('session', 'tutor_session__session__label'),
+        ('programming_language', 'tutor_session__session__programming_language__name'),
+        ('level', 'tutor_session__session__level'),
+        ('season', 'tutor_session__session__season'),
+        ('year', 'tutor_session__session__year'),
+    ]),
+}
+
+
+class Echo:
+    """A file-like object whose write() returns the value instead of storing it."""
+
+    def write(self, value):
+        return value
+
+
+def export_rows(name):
+    """Return the column names of an export and an iterator over its value tuples."""
+
+    model, columns = EXPORTS[name]
+    rows = model.objects.order_by('pk').values_list(*[lookup for _, lookup in columns])
+    return [column for column, _ in columns], rows.iterator(chunk_size=EXPORT_CHUNK_SIZE)
+
+
+def export_lines(name, export_format):
+    """Yield an export line by line, as CSV or as JSON Lines."""
+
+    header, rows = export_rows(name)
+    if export_format == 'csv':
+        writer = csv.writer(Echo())
+        yield writer.writerow(header)
+        for row in rows:
+            yield writer.writerow(row)
+    elif export_format == 'jsonl':
+        for row in rows:
+            yield json.dumps(dict(zip(header, row)), cls=DjangoJSONEncoder) + '\n'
+    else:
+        raise ValueError(f"Unknown export format {export_format!r}.")
@@ -1,13 +1,83 @@
 """Forms for the tutorials app."""
 from django import forms
 from django.contrib.auth import authenticate
+from django.core.exceptions import ValidationError
 from django.core.validators import RegexValidator
-from .models import User, Tutor, Student, ProgrammingLanguage, Session
+from django.db import IntegrityError, transaction
+from django.forms.models import ModelChoiceIterator
+from .catalog import CATALOG_FIELDS
+from .languages import get_language, get_languages
+from .models import User, ProgrammingLanguage, Session
+from .services import build_user, register_user
+from .terms import term_years
 
 from django import forms
 from django.contrib.auth import authenticate
 
 
+class LanguageChoiceIterator(ModelChoiceIterator):
+    """List the languages from the registry instead of querying the field's queryset."""
+
+    def __iter__(self):
+        if self.field.empty_label is not None:
+            yield ('', self.field.empty_label)
+        for language in get_languages().values():
+            yield self.choice(language)
+
+    def __len__(self):
+        return len(get_languages()) + (self.field.empty_label is not None)
+
+    def __bool__(self):
+        return self.field.empty_label is not None or bool(get_languages())
+
+
+class LanguageChoiceField(forms.ModelChoiceField):
+    """A choice of one programming language, rendered and validated without a query."""
+
+    iterator = LanguageChoiceIterator
+
+    def __init__(self, **kwargs):
+        super().__init__(queryset=ProgrammingLanguage.objects.all(), **kwargs)
+
+    def to_python(self, value):
+        if value in self.empty_values:
+            return None
+        self.validate_no_null_characters(value)
+        language = get_language(value)
+        if language is None:
+            raise ValidationError(self.error_messages['invalid_choice'], code='invalid_choice', params={'value': value})
+        return language
+
+
+class LanguageMultipleChoiceField(forms.ModelMultipleChoiceField):
+    """A choice of several programming languages, rendered and validated without a query."""
+
+    iterator = LanguageChoiceIterator
+
+    def __init__(self, **kwargs):
+        super().__init__(queryset=ProgrammingLanguage.objects.all(), **kwargs)
+
+    def clean(self, value):
+        if not self.required and not value:
+            return []
+        return super().clean(value)
+
+    def _check_values(self, value):
+        """Return the languages with the given primary keys, in registry order."""
+        try:
+            value = frozenset(value)
+        except TypeError:
+            raise ValidationError(self.error_messages['invalid_list'], code='invalid_list')
+        selected = set()
+        for pk in value:
+            self.validate_no_null_characters(pk)
+            language = get_language(pk)
+            if language is None:
+                raise ValidationError(self.error_messages['invalid_choice'], code='invalid_choice', params={'value': pk})
+            selected.add(language.pk)
+        return [language for pk, language in get_languages().items() if pk in selected]
+
+
 class SessionForm(forms.ModelForm):
     class Meta:
         model = Session
@@ -20,8 +90,7 @@ class SessionForm(forms.ModelForm):
             'duration_hours',
         ]
 
-    programming_language = forms.ModelChoiceField(
-        queryset=ProgrammingLanguage.objects.all(),
+    programming_language = LanguageChoiceField(
         required=True,
         label="Select the programming language",
         widget=forms.Select(attrs={'class': 'form-control'})
@@ -41,7 +110,6 @@ class SessionForm(forms.ModelForm):
     )
 
     year = forms.ChoiceField(
-        choices=[(2024, '2024'), (2025, '2025'), (2026, '2026')],
         required=True,
         widget=forms.Select(attrs={'class': 'form-control'})
     )
@@ -64,9 +132,35 @@ class SessionForm(forms.ModelForm):
         self.fields['level'].label = 'Level of Expertise'
         self.fields['season'].label = 'Season'
         self.fields['year'].label = 'Year'
+        self.fields['year'].choices = [(year, str(year)) for year in term_years()]
         self.fields['frequency'].label = 'Session Frequency'
         self.fields['duration_hours'].label = 'Duration (Hours)'
 
+    def clean(self):
+        """Bind the form to the catalog session it describes, when that session already exists."""
+        cleaned_data = super().clean()
+        if all(field in cleaned_data for field in CATALOG_FIELDS):
+            existing = Session.objects.filter(**self._catalog_lookup()).first()
+            if existing is not None:
+                self.instance = existing
+        return cleaned_data
+
+    def save(self, commit=True):
+        """Return the catalog session described by the form, creating it only if it does not exist yet."""
+        if self.instance.pk is not None:
+            return self.instance
+        if not commit:
+            return super().save(commit=False)
+        try:
+            with transaction.atomic():
+                return super().save()
+        except IntegrityError:
+            # Another request created the same session after this form was validated
+            return Session.objects.get(**self._catalog_lookup())
+
+    def _catalog_lookup(self):
+        return {field: self.cleaned_data[field] for field in CATALOG_FIELDS}
+
 
 class LogInForm(forms.Form):
     username = forms.CharField(max_length=150, widget=forms.TextInput(attrs={
@@ -166,8 +260,7 @@ class SignUpForm(NewPasswordMixin, forms.ModelForm):
         widget=forms.RadioSelect(attrs={'class': 'form-check-input'})
     )
 
-    expertise = forms.ModelMultipleChoiceField(
-        queryset=ProgrammingLanguage.objects.all(),
+    expertise = LanguageMultipleChoiceField(
         required=False,
         widget=forms.CheckboxSelectMultiple(attrs={'class': 'form-check-input'}),
         label="Select programming languages you specialize in"
@@ -180,34 +273,19 @@ class SignUpForm(NewPasswordMixin, forms.ModelForm):
         fields = ['first_name', 'last_name', 'username', 'email']
 
     def save(self):
-        """Create a new user."""
+        """Create a new user with the profile of their role."""
 
         super().save(commit=False)
 
-        user = User.objects.create_user(
+        role = self.cleaned_data.get('role')
+        user = build_user(
             self.cleaned_data.get('username'),
             first_name=self.cleaned_data.get('first_name'),
             last_name=self.cleaned_data.get('last_name'),
             email=self.cleaned_data.get('email'),
+            role=role,
             password=self.cleaned_data.get('new_password'),
         )
-
-        role = self.cleaned_data.get('role')
-
-        if role == User.Roles.TUTOR:
-            tutor = Tutor.objects.create(user=user)
-            tutor.save()
-
-            # Assign specialties to the tutor
-            expertise = self.cleaned_data.get('expertise')
-            if expertise:
-                tutor.expertise.set(expertise)
-
-        else:
-            student = Student.objects.create(user=user)
-            student.save()
-        
-        user.role = role
-        user.save()
-
-        return user
\ No newline at end of file
+        # Only tutors have specialties
+        expertise = self.cleaned_data.get('expertise') if role == User.Roles.TUTOR else ()
+        return register_user(user, expertise)
\ No newline at end of file
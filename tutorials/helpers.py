@@ -1,8 +1,10 @@
 from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, Q
 from django.shortcuts import redirect
 from django.contrib.auth.models import User
 from django.contrib.auth import get_user_model
-from .models import TutorSession
+from .models import TutorSession, Invoice, RequestedStudentSession, Session
 
 User = get_user_model()
 
@@ -18,16 +20,76 @@ def login_prohibited(view_function):
 
 
 def get_user_counts():
+    """Return the number of users overall and per role, using a single query."""
 
-    total_users = User.objects.count()
-    student_count = User.objects.filter(role='STUDENT').count()
-    tutor_count = User.objects.filter(role='TUTOR').count()
-    admin_count = User.objects.filter(role='ADMIN').count()
+    return User.objects.aggregate(
+        total_users=Count('pk'),
+        student_count=Count('pk', filter=Q(role=User.Roles.STUDENT)),
+        tutor_count=Count('pk', filter=Q(role=User.Roles.TUTOR)),
+        admin_count=Count('pk', filter=Q(role=User.Roles.ADMIN)),
+    )
+
+
+ADMIN_STATISTICS_CACHE_KEY = 'tutorials:admin_statistics'
+INVOICE_COUNTS_CACHE_KEY = 'tutorials:invoice_counts'
+ADMIN_STATISTICS_TIMEOUT = 300
+
+
+def get_admin_statistics():
+    """Return the admin dashboard statistics, computing them only when the cache is empty.
+
+    The cached value is invalidated by the signal handlers in `tutorials.signals`
+    whenever a counted row changes; the timeout bounds staleness after bulk
+    updates, which do not send signals.
+    """
+
+    statistics = cache.get(ADMIN_STATISTICS_CACHE_KEY)
+    if statistics is None:
+        statistics = compute_admin_statistics()
+        cache.set(ADMIN_STATISTICS_CACHE_KEY, statistics, ADMIN_STATISTICS_TIMEOUT)
+    return statistics
+
+
+def invalidate_admin_statistics():
+    """Discard the cached admin dashboard statistics and invoice counts."""
+
+    cache.delete_many([ADMIN_STATISTICS_CACHE_KEY, INVOICE_COUNTS_CACHE_KEY])
+
+
+def get_invoice_counts():
+    """Return the number of invoices per payment status, cached like the admin statistics."""
+
+    counts = cache.get(INVOICE_COUNTS_CACHE_KEY)
+    if counts is None:
+        counts = compute_invoice_counts()
+        cache.set(INVOICE_COUNTS_CACHE_KEY, counts, ADMIN_STATISTICS_TIMEOUT)
+    return counts
+
+
+def compute_invoice_counts():
+    """Count the invoices of every payment status with one grouped query."""
+
+    counts = {status: 0 for status, _ in Invoice.PAYMENT_STATUS_CHOICES}
+    for row in Invoice.objects.order_by().values('payment_status').annotate(count=Count('pk')):
+        counts[row['payment_status']] = row['count']
+    return counts
+
+
+def compute_admin_statistics():
+    """Compute the admin dashboard statistics with one grouped query per table."""
+
+    sessions_by_language = list(
+        Session.objects.order_by('programming_language__name', 'season')
+        .values('programming_language__name', 'season')
+        .annotate(count=Count('pk'))
+    )
 
     return {
-        'total_users': total_users,
-        'student_count': student_count,
-        'tutor_count': tutor_count,
-        'admin_count': admin_count,
+        **get_user_counts(),
+        'pending_requests': RequestedStudentSession.objects.filter(is_approved=False).count(),
+        'invoices_by_status': get_invoice_counts(),
+        'sessions_by_language': [
+            {'language': row['programming_language__name'], 'season': row['season'], 'count': row['count']}
+            for row in sessions_by_language
+        ],
     }
-
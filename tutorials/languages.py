@@ -0,0 +1,51 @@
+"""The programming language registry, shared by the language form fields.
+
+The languages are read once per process into a read-only mapping and kept
+until a `ProgrammingLanguage` row is saved or deleted, when the signal
+handlers in `tutorials.signals` discard it, and again when that change
+commits. Commands that bulk insert languages call `invalidate_languages()`
+themselves. Other processes pick up a change when they restart.
+
+The cached instances are shared between requests, so they must only be read.
+"""
+from types import MappingProxyType
+from tutorials.models import ProgrammingLanguage
+
+
+_languages = None
+_generation = 0
+
+
+def get_languages():
+    """Return the languages as a read-only {pk: ProgrammingLanguage} mapping, in primary key order."""
+
+    global _languages
+    languages = _languages
+    if languages is None:
+        generation = _generation
+        languages = MappingProxyType({
+            language.pk: language for language in ProgrammingLanguage.objects.order_by('pk')
+        })
+        # A language change during the load leaves the cache empty, so the next call reloads it.
+        if generation == _generation:
+            _languages = languages
+    return languages
+
+
+def invalidate_languages():
+    """Discard the cached languages."""
+
+    global _languages, _generation
+    _generation += 1
+    _languages = None
+
+
+def get_language(value):
+    """Return the language with the given primary key, or None when there is no such language."""
+
+    if isinstance(value, ProgrammingLanguage):
+        value = value.pk
+    try:
+        return get_languages().get(int(value))
+    except (TypeError, ValueError):
+        return None
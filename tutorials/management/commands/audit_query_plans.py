@@ -0,0 +1,81 @@
+import re
+
+from django.core.management.base import BaseCommand, CommandError
+from tutorials import selectors
+from tutorials.matching import matching_pending_requests, matching_tutor_sessions
+from tutorials.models import Student, Tutor, Session, RequestedStudentSession
+from tutorials.pagination import KeysetPaginator
+
+
+# SQLite reports "SCAN table" for a full table scan, PostgreSQL "Seq Scan on table".
+FULL_SCAN = re.compile(r'\bSCAN (?P<sqlite>\w+)(?P<index> USING)?|Seq Scan on (?P<postgresql>\w+)')
+
+
+class Command(BaseCommand):
+    PAGE_SIZE = 10
+
+    help = "Runs EXPLAIN on the main query of each view against the current database and flags full table scans"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--verbose-plans', action='store_true',
+                            help='Print the full plan of every query')
+        parser.add_argument('--fail-on-scan', action='store_true',
+                            help='Exit with an error when any query scans a whole table')
+
+    def handle(self, *args, **options):
+        student = Student.objects.first()
+        tutor = Tutor.objects.first()
+        requested_session = RequestedStudentSession.objects.filter(is_approved=False).first()
+        session = Session.objects.first()
+        if not all([student, tutor, requested_session, session]):
+            raise CommandError('The database has no data to plan against, run the seed command first.')
+
+        flagged = 0
+        for name, queryset in self.view_queries(student, tutor, requested_session, session):
+            plan = queryset.explain()
+            scans = self.full_scans(plan)
+            flagged += bool(scans)
+            status = self.style.WARNING('FULL SCAN') if scans else self.style.SUCCESS('ok')
+            self.stdout.write(f"{name:<44} {status} {', '.join(scans)}")
+            if options['verbose_plans']:
+                for line in plan.splitlines():
+                    self.stdout.write(f"    {line}")
+
+        self.stdout.write(f"{flagged} of the audited queries scan a whole table.")
+        if flagged and options['fail_on_scan']:
+            raise CommandError('Full table scans found.')
+
+    def view_queries(self, student, tutor, requested_session, session):
+        """Return the main query of each view, limited to its first page like the view does."""
+
+        return [
+            ('list_pending_requests', self.first_page(selectors.pending_requests_list(), ['-requested_at'])),
+            ('list_tutors', self.first_page(Tutor.objects.select_related('user'), ['user__first_name'])),
+            ('list_students', self.first_page(Student.objects.select_related('user'), ['user__first_name'])),
+            ('student_sessions', self.first_page(selectors.student_sessions_list(), ['-registered_at'])),
+            ('invoices', self.first_page(selectors.invoices_list(), ['-created_at'])),
+            ('available_tutors', requested_session.available_tutor_sessions.select_related(
+                'tutor__user', 'session'
+            ).order_by('created_at', 'pk')[:self.PAGE_SIZE]),
+            ('student_pending_payments', selectors.student_pending_invoices(student)),
+            ('your_sessions', selectors.student_enrollments(student)),
+            ('requested_sessions', selectors.student_requested_sessions(student)),
+            ('your_tutor_sessions', selectors.tutor_sessions_with_students(tutor)),
+            ('request_session (tutor session matches)', matching_tutor_sessions(session)),
+            ('request_session (pending request matches)', matching_pending_requests(session)),
+        ]
+
+    def first_page(self, queryset, ordering):
+        paginator = KeysetPaginator(queryset, self.PAGE_SIZE, ordering)
+        return queryset.order_by(*paginator.ordering)[:self.PAGE_SIZE + 1]
+
+    def full_scans(self, plan):
+        """Return the tables the plan reads in full, ignoring scans that walk an index."""
+
+        tables = []
+        for match in FULL_SCAN.finditer(plan):
+            if match.group('postgresql'):
+                tables.append(match.group('postgresql'))
+            elif not match.group('index'):
+                tables.append(match.group('sqlite'))
+        return tables
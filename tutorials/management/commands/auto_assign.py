@@ -0,0 +1,50 @@
+from collections import Counter
+from time import perf_counter
+
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand, CommandError
+from tutorials.languages import get_languages
+from tutorials.services import assign_pending_requests
+
+
+class Command(BaseCommand):
+    help = ('Assigns as many pending session requests as possible to available tutor sessions at once, '
+            'and reports the demand left unmatched')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--tutor-capacity', type=int,
+                            help='Maximum number of enrollments per tutor, counting those they already have '
+                                 '(default: no limit)')
+        parser.add_argument('--dry-run', action='store_true',
+                            help='Report the assignment without enrolling anyone')
+        parser.add_argument('--top', type=int, default=20,
+                            help='Number of match groups with the most unmatched requests to list (default: 20)')
+
+    def handle(self, *args, **options):
+        if options['tutor_capacity'] is not None and options['tutor_capacity'] < 0:
+            raise CommandError('--tutor-capacity cannot be negative.')
+        start = perf_counter()
+        try:
+            student_sessions, unassigned = assign_pending_requests(options['tutor_capacity'], options['dry_run'])
+        except ValidationError as error:
+            raise CommandError(f"{' '.join(error.messages)} Nothing was assigned, run the command again.")
+        elapsed = perf_counter() - start
+
+        verb = 'Would assign' if options['dry_run'] else 'Assigned'
+        self.stdout.write(
+            f"{verb} {len(student_sessions)} of {len(student_sessions) + len(unassigned)} pending requests "
+            f"in {elapsed:.2f}s; {len(unassigned)} are left unmatched."
+        )
+        self.report_unmatched(unassigned, options['top'])
+
+    def report_unmatched(self, unassigned, top):
+        """List the match groups with the most unmatched requests."""
+
+        if not unassigned or top <= 0:
+            return
+        languages = get_languages()
+        groups = Counter(key for _, _, _, key in unassigned)
+        self.stdout.write(f"{'language':<12} {'level':<13} {'season':<8} {'year':>5} {'unmatched':>10}")
+        for (language_id, level, season, year), count in groups.most_common(top):
+            language = languages.get(language_id)
+            self.stdout.write(f"{language.name if language else language_id:<12} {level:<13} {season:<8} {year:>5} {count:>10}")
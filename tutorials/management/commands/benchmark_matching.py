@@ -0,0 +1,127 @@
+from time import perf_counter
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from tutorials.terms import get_terms, term_dates
+from tutorials.models import User, Tutor, Student, Session, ProgrammingLanguage, TutorSession, RequestedStudentSession
+
+
+class Command(BaseCommand):
+    TUTOR_COUNT = 100
+    LEVELS = ['beginner', 'intermediate', 'advanced']
+    FREQUENCIES = ['Weekly', 'Bi-Weekly']
+    DURATIONS = [1, 2]
+
+    help = 'Measures the cost of matching a session request as the TutorSession table grows'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', nargs='+', type=int, default=[1000, 10000, 50000],
+                            help='TutorSession table sizes to measure')
+        parser.add_argument('--requests', type=int, default=50,
+                            help='Number of session requests to match at each size')
+
+    def handle(self, *args, **options):
+        # Everything is rolled back, so the benchmark can run against any database.
+        with transaction.atomic():
+            self.languages = self.create_programming_languages()
+            self.tutors = self.create_tutors()
+            self.session_count = 0
+            self.tutor_session_count = 0
+            self.request_count = 0
+
+            self.stdout.write(f"{'tutor sessions':>15} {'ms/request':>12} {'queries/request':>16} {'matches/request':>16}")
+            for size in sorted(options['sizes']):
+                self.grow_tutor_sessions(size)
+                elapsed, queries, matches = self.time_requests(options['requests'])
+                self.stdout.write(f"{size:>15} {elapsed:>12.2f} {queries:>16.1f} {matches:>16.1f}")
+
+            transaction.set_rollback(True)
+
+    def create_programming_languages(self):
+        for name, _ in ProgrammingLanguage.LANGUAGES:
+            ProgrammingLanguage.objects.get_or_create(name=name)
+        return list(ProgrammingLanguage.objects.all())
+
+    def create_tutors(self):
+        users = User.objects.bulk_create([
+            User(
+                username=f'@benchtutor{index}',
+                email=f'benchtutor{index}@example.org',
+                first_name='Bench',
+                last_name=f'Tutor{index}',
+                role=User.Roles.TUTOR,
+            )
+            for index in range(self.TUTOR_COUNT)
+        ])
+        return Tutor.objects.bulk_create([Tutor(user=user) for user in users])
+
+    def session_keys(self):
+        return [
+            (language, level, season, year, frequency, duration_hours)
+            for language in self.languages
+            for level in self.LEVELS
+            for year, season in get_terms()
+            for frequency in self.FREQUENCIES
+            for duration_hours in self.DURATIONS
+        ]
+
+    def grow_tutor_sessions(self, size):
+        """Add catalog sessions, each taught by every benchmark tutor, until the table holds `size` rows."""
+
+        keys = self.session_keys()
+        while self.tutor_session_count < size:
+            if self.session_count == len(keys):
+                raise CommandError(f"The session catalog supports at most {self.tutor_session_count} tutor sessions.")
+            session = self.get_session(keys[self.session_count])
+            self.session_count += 1
+            remaining = min(self.TUTOR_COUNT, size - self.tutor_session_count)
+            tutor_sessions = [TutorSession(tutor=tutor, session=session) for tutor in self.tutors[:remaining]]
+            for tutor_session in tutor_sessions:
+                tutor_session.label = tutor_session.build_label()
+            TutorSession.objects.bulk_create(tutor_sessions)
+            self.tutor_session_count += remaining
+
+    def get_session(self, key):
+        language, level, season, year, frequency, duration_hours = key
+        start_day, end_day = term_dates(year, season)
+        session, _ = Session.objects.get_or_create(
+            programming_language=language,
+            level=level,
+            season=season,
+            year=year,
+            frequency=frequency,
+            duration_hours=duration_hours,
+            defaults={'start_day': start_day, 'end_day': end_day},
+        )
+        return session
+
+    def time_requests(self, count):
+        """Return the average time, query count and match count of saving `count` new requests."""
+
+        keys = self.session_keys()
+        total_time = 0
+        total_queries = 0
+        total_matches = 0
+        for _ in range(count):
+            index = self.request_count
+            self.request_count += 1
+            user = User.objects.create(
+                username=f'@benchstudent{index}',
+                email=f'benchstudent{index}@example.org',
+                first_name='Bench',
+                last_name=f'Student{index}',
+                role=User.Roles.STUDENT,
+            )
+            student = Student.objects.create(user=user)
+            session = self.get_session(keys[index % len(keys)])
+
+            requested_session = RequestedStudentSession(student=student, session=session)
+            with CaptureQueriesContext(connection) as queries:
+                start = perf_counter()
+                requested_session.save()
+                total_time += perf_counter() - start
+            total_queries += len(queries)
+            total_matches += requested_session.available_tutor_sessions.count()
+
+        return total_time * 1000 / count, total_queries / count, total_matches / count
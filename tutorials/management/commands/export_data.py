@@ -0,0 +1,26 @@
+from time import perf_counter
+
+from django.core.management.base import BaseCommand
+from tutorials.exports import EXPORTS, EXPORT_FORMATS, export_lines
+
+
+class Command(BaseCommand):
+    help = 'Streams every invoice or student session to a CSV or JSON Lines file'
+
+    def add_arguments(self, parser):
+        parser.add_argument('export', choices=sorted(EXPORTS), help='What to export')
+        parser.add_argument('--format', choices=sorted(EXPORT_FORMATS), default='csv', help='Output format (default: csv)')
+        parser.add_argument('--output', help='File to write to (default: standard output)')
+
+    def handle(self, *args, **options):
+        start = perf_counter()
+        lines = 0
+        if options['output']:
+            with open(options['output'], 'w', newline='', encoding='utf-8') as output:
+                for line in export_lines(options['export'], options['format']):
+                    output.write(line)
+                    lines += 1
+            self.stderr.write(f"Wrote {lines} lines to {options['output']} in {perf_counter() - start:.2f}s.")
+        else:
+            for line in export_lines(options['export'], options['format']):
+                self.stdout.write(line, ending='')
@@ -0,0 +1,114 @@
+import csv
+from time import perf_counter
+
+from django.contrib.auth.hashers import identify_hasher
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand, CommandError
+from tutorials.languages import get_languages
+from tutorials.models import User
+from tutorials.services import build_user, import_users
+
+
+# The optional columns are role (default STUDENT), password and expertise
+REQUIRED_COLUMNS = ['username', 'first_name', 'last_name', 'email']
+LOOKUP_BATCH_SIZE = 500
+
+
+class Command(BaseCommand):
+    help = ('Imports students, tutors and admins from a CSV file in one transaction. Columns: username, first_name, '
+            'last_name, email and optionally role, password and expertise (language names separated by semicolons). '
+            'A password that is already a Django hash is stored as it is and a blank one leaves the password '
+            'unusable; plain text passwords are hashed one by one, which makes the import far slower.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('csv_file', help='CSV file with a header row')
+
+    def handle(self, *args, **options):
+        start = perf_counter()
+        with open(options['csv_file'], newline='', encoding='utf-8') as csv_file:
+            reader = csv.DictReader(csv_file)
+            missing = [column for column in REQUIRED_COLUMNS if column not in (reader.fieldnames or [])]
+            if missing:
+                raise CommandError(f"The CSV file has no {', '.join(missing)} column.")
+            users, expertise, errors = self.read_users(reader)
+
+        errors.extend(self.find_existing(users))
+        if errors:
+            raise CommandError('No users were imported:\n' + '\n'.join(errors))
+
+        import_users(users, expertise)
+        elapsed = perf_counter() - start
+        self.stdout.write(f"Imported {len(users)} users in {elapsed:.2f}s ({len(users) / max(elapsed, 1e-9):.0f} users/s).")
+
+    def read_users(self, reader):
+        """Return the users built from the rows, the expertise of the tutors and the errors found, one per line."""
+
+        languages = {language.name.lower(): language.pk for language in get_languages().values()}
+        users = []
+        expertise = {}
+        errors = []
+        usernames = set()
+        emails = set()
+        for row in reader:
+            line = reader.line_num
+            role = (row.get('role') or User.Roles.STUDENT).strip().upper()
+            if role not in User.Roles.values:
+                errors.append(f"Line {line}: unknown role {row['role']!r}.")
+                continue
+
+            password = row.get('password') or None
+            hashed = password is not None and is_password_hash(password)
+            user = build_user(
+                row['username'].strip(), row['first_name'].strip(), row['last_name'].strip(), row['email'].strip(),
+                role, password=None if hashed else password, password_hash=password if hashed else None,
+            )
+            try:
+                user.full_clean(exclude=['password'], validate_unique=False, validate_constraints=False)
+            except ValidationError as error:
+                errors.extend(
+                    f"Line {line}: {field}: {' '.join(messages)}" for field, messages in error.message_dict.items()
+                )
+                continue
+
+            if user.username in usernames:
+                errors.append(f"Line {line}: username {user.username} appears more than once.")
+            if user.email in emails:
+                errors.append(f"Line {line}: email {user.email} appears more than once.")
+            usernames.add(user.username)
+            emails.add(user.email)
+
+            names = [name.strip() for name in (row.get('expertise') or '').split(';') if name.strip()]
+            if names and role != User.Roles.TUTOR:
+                errors.append(f"Line {line}: only tutors have expertise.")
+            unknown = [name for name in names if name.lower() not in languages]
+            if unknown:
+                errors.append(f"Line {line}: unknown programming languages {', '.join(unknown)}.")
+            elif names:
+                expertise[user.username] = sorted({languages[name.lower()] for name in names})
+            users.append(user)
+        return users, expertise, errors
+
+    def find_existing(self, users):
+        """Return an error for every username or email that already belongs to a user."""
+
+        errors = []
+        for start in range(0, len(users), LOOKUP_BATCH_SIZE):
+            batch = users[start:start + LOOKUP_BATCH_SIZE]
+            errors.extend(
+                f"Username {username} is already taken."
+                for username in User.objects.filter(username__in=[user.username for user in batch])
+                .values_list('username', flat=True)
+            )
+            errors.extend(
+                f"Email {email} is already taken."
+                for email in User.objects.filter(email__in=[user.email for user in batch]).values_list('email', flat=True)
+            )
+        return errors
+
+
+def is_password_hash(password):
+    try:
+        identify_hasher(password)
+    except ValueError:
+        return False
+    return True
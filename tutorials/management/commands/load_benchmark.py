@@ -0,0 +1,210 @@
+import json
+import re
+from multiprocessing import get_context
+from time import perf_counter
+
+from django.conf import settings
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.test import Client
+from django.urls import URLPattern, get_resolver, reverse
+from tutorials.models import User, Student, Tutor, TutorSession, RequestedStudentSession
+
+
+# The users the seed command always creates, one per role
+ROLE_USERNAMES = {
+    User.Roles.ADMIN: '@johndoe',
+    User.Roles.TUTOR: '@janedoe',
+    User.Roles.STUDENT: '@charlie',
+}
+
+# (URL name, role of the logged in user or None for anonymous requests, names of the URL arguments)
+ROUTES = [
+    ('home', None, []),
+    ('log_in', None, []),
+    ('sign_up', None, []),
+    ('dashboard', User.Roles.ADMIN, []),
+    ('dashboard', User.Roles.TUTOR, []),
+    ('dashboard', User.Roles.STUDENT, []),
+    ('password', User.Roles.STUDENT, []),
+    ('profile', User.Roles.STUDENT, []),
+    ('list_students', User.Roles.ADMIN, []),
+    ('student_detail', User.Roles.ADMIN, ['student_id']),
+    ('list_tutors', User.Roles.ADMIN, []),
+    ('tutor_detail', User.Roles.ADMIN, ['tutor_id']),
+    ('student_sessions', User.Roles.ADMIN, []),
+    ('export_student_sessions', User.Roles.ADMIN, ['export_format']),
+    ('pending_requests', User.Roles.ADMIN, []),
+    ('available_tutors', User.Roles.ADMIN, ['request_id']),
+    ('invoices', User.Roles.ADMIN, []),
+    ('export_invoices', User.Roles.ADMIN, ['export_format']),
+    ('perf_report', User.Roles.ADMIN, []),
+    ('request_session', User.Roles.STUDENT, []),
+    ('request_session', User.Roles.TUTOR, []),
+    ('student_pending_payments', User.Roles.STUDENT, []),
+    ('your_sessions', User.Roles.STUDENT, []),
+    ('requested_sessions', User.Roles.STUDENT, []),
+    ('your_tutor_sessions', User.Roles.TUTOR, []),
+    ('session_details', User.Roles.TUTOR, ['session_id']),
+]
+
+# Routes that change data or end the session, so a read-only benchmark does not request them
+UNSAFE_ROUTES = {
+    'log_out', 'delete_student', 'delete_tutor', 'send_invoice', 'remove_session',
+    'approve_session', 'approve_pending_requests', 'confirm_payment',
+}
+
+QUERY_COUNT = re.compile(r'\bdb;[^,]*desc="(\d+) queries"')
+
+
+class Command(BaseCommand):
+    help = ('Seeds the database, then requests every named route with the Django test client from several '
+            'worker processes and saves the latency, throughput and query counts as a JSON baseline')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--scale', type=int,
+                            help='Total number of tutors and students to seed (default: the seed command default)')
+        parser.add_argument('--skip-seed', action='store_true',
+                            help='Benchmark the data already in the database')
+        parser.add_argument('--workers', type=int, default=4,
+                            help='Number of worker processes (default: 4)')
+        parser.add_argument('--requests', type=int, default=50,
+                            help='Requests per route and worker (default: 50)')
+        parser.add_argument('--output', default='load_benchmark.json',
+                            help='File to save the JSON baseline to (default: load_benchmark.json)')
+
+    def handle(self, *args, **options):
+        if options['workers'] < 1 or options['requests'] < 1:
+            raise CommandError('--workers and --requests must be at least 1.')
+        if not options['skip_seed']:
+            call_command('seed', scale=options['scale'])
+
+        routes = self.resolve_routes()
+        missing = sorted(self.named_routes() - UNSAFE_ROUTES - {name for name, _, _ in ROUTES})
+        if missing:
+            self.stderr.write(self.style.WARNING(f"Routes not benchmarked: {', '.join(missing)}"))
+
+        # Forked workers inherit the set up project, but must open their own database connections
+        connections.close_all()
+        start = perf_counter()
+        with get_context('fork').Pool(options['workers'], initializer=init_worker) as pool:
+            results = pool.map(run_worker, [(routes, options['requests'])] * options['workers'])
+        elapsed = perf_counter() - start
+
+        baseline = self.summarise(routes, results, options, elapsed)
+        with open(options['output'], 'w', encoding='utf-8') as output:
+            json.dump(baseline, output, indent=2, sort_keys=True)
+            output.write('\n')
+        self.report(baseline)
+        self.stdout.write(f"Saved the baseline to {options['output']}.")
+
+    def named_routes(self):
+        return {pattern.name for pattern in get_resolver().url_patterns if isinstance(pattern, URLPattern) and pattern.name}
+
+    def resolve_routes(self):
+        """Return the label, role and path of every benchmarked route, using the first matching rows as arguments."""
+
+        missing_users = set(ROLE_USERNAMES.values()) - set(
+            User.objects.filter(username__in=ROLE_USERNAMES.values()).values_list('username', flat=True)
+        )
+        arguments = {
+            'student_id': Student.objects.values_list('pk', flat=True).first(),
+            'tutor_id': Tutor.objects.values_list('pk', flat=True).first(),
+            'request_id': RequestedStudentSession.objects.filter(is_approved=False).values_list('pk', flat=True).first(),
+            'session_id': TutorSession.objects.values_list('pk', flat=True).first(),
+            'export_format': 'csv',
+        }
+        if missing_users or None in arguments.values():
+            raise CommandError('The database has no data to benchmark, run without --skip-seed.')
+
+        return [
+            (
+                f"{name}[{(role or 'anonymous').lower()}]",
+                role,
+                reverse(name, kwargs={argument: arguments[argument] for argument in argument_names}),
+            )
+            for name, role, argument_names in ROUTES
+        ]
+
+    def summarise(self, routes, results, options, elapsed):
+        summary = {}
+        for label, role, path in routes:
+            samples = [sample for result in results for sample in result[label]]
+            latencies = sorted(latency for latency, _, _ in samples)
+            queries = [count for _, count, _ in samples if count is not None]
+            summary[label] = {
+                'path': path,
+                'requests': len(samples),
+                'errors': sum(status >= 400 for _, _, status in samples),
+                'p50_ms': round(percentile(latencies, 50) * 1000, 2),
+                'p95_ms': round(percentile(latencies, 95) * 1000, 2),
+                'p99_ms': round(percentile(latencies, 99) * 1000, 2),
+                # The workers request the same route concurrently, so its throughput is estimated from the latencies
+                'requests_per_second': round(len(samples) * options['workers'] / sum(latencies), 1),
+                'queries_per_request': round(sum(queries) / len(queries), 1) if queries else None,
+            }
+        total_requests = sum(route['requests'] for route in summary.values())
+        return {
+            'scale': options['scale'],
+            'workers': options['workers'],
+            'requests_per_route': options['requests'] * options['workers'],
+            'total_requests': total_requests,
+            'total_seconds': round(elapsed, 2),
+            'requests_per_second': round(total_requests / elapsed, 1),
+            'routes': summary,
+        }
+
+    def report(self, baseline):
+        self.stdout.write(f"{'route':<40} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'req/s':>9} {'queries':>8} {'errors':>7}")
+        for label, route in baseline['routes'].items():
+            queries = '-' if route['queries_per_request'] is None else f"{route['queries_per_request']:.1f}"
+            self.stdout.write(
+                f"{label:<40} {route['p50_ms']:>9.2f} {route['p95_ms']:>9.2f} {route['p99_ms']:>9.2f} "
+                f"{route['requests_per_second']:>9.1f} {queries:>8} {route['errors']:>7}"
+            )
+        self.stdout.write(
+            f"{baseline['total_requests']} requests in {baseline['total_seconds']:.2f}s "
+            f"({baseline['requests_per_second']:.1f} requests/s across {baseline['workers']} workers)."
+        )
+
+
+def percentile(ordered, percent):
+    return ordered[min(len(ordered) - 1, len(ordered) * percent // 100)]
+
+
+def init_worker():
+    """Prepare a worker process to send requests through the test client."""
+
+    connections.close_all()
+    settings.ALLOWED_HOSTS = [*settings.ALLOWED_HOSTS, 'testserver']
+
+
+def run_worker(job):
+    """Request every route `count` times after one warm-up request, returning (seconds, queries, status) samples."""
+
+    routes, count = job
+    clients = {None: Client()}
+    for role, username in ROLE_USERNAMES.items():
+        clients[role] = Client()
+        clients[role].force_login(User.objects.get(username=username))
+
+    results = {}
+    for label, role, path in routes:
+        client = clients[role]
+        request(client, path)
+        results[label] = [request(client, path) for _ in range(count)]
+    connections.close_all()
+    return results
+
+
+def request(client, path):
+    start = perf_counter()
+    response = client.get(path)
+    if response.streaming:
+        for _ in response.streaming_content:
+            pass
+    response.close()
+    elapsed = perf_counter() - start
+    match = QUERY_COUNT.search(response.get('Server-Timing', ''))
+    return elapsed, int(match.group(1)) if match else None, response.status_code
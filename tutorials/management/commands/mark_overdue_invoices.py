@@ -0,0 +1,13 @@
+from time import perf_counter
+
+from django.core.management.base import BaseCommand
+from tutorials.services import mark_overdue_invoices
+
+
+class Command(BaseCommand):
+    help = 'Marks every pending invoice past its due date as overdue; meant to run daily from a scheduler such as cron'
+
+    def handle(self, *args, **options):
+        start = perf_counter()
+        count = mark_overdue_invoices()
+        self.stdout.write(f"Marked {count} invoices as overdue in {perf_counter() - start:.2f}s.")
@@ -1,270 +1,296 @@
+from django.contrib.auth.hashers import make_password
 from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from tutorials.helpers import invalidate_admin_statistics
+from tutorials.languages import invalidate_languages
+from tutorials.search import rebuild_search_index
+from tutorials.catalog import CATALOG_FIELDS
+from tutorials.terms import get_terms
 from tutorials.models import User, Tutor, Student, Session, StudentSession, ProgrammingLanguage, TutorSession, RequestedStudentSession
 from faker import Faker
-from random import choice, randint
-from django.utils.timezone import now
-from datetime import datetime, timedelta
-
-
-def calculate_end_date(start_date, duration_weeks):
-    return start_date + timedelta(weeks=duration_weeks, days=4)
+from random import choice, randint, sample
+from time import perf_counter
+import re
 
 
 class Command(BaseCommand):
     STUDENT_COUNT = 300
     TUTOR_COUNT = 150
-    TUTOR_SESSION_COUNT = 300
-    REQ_STUDENT_SESSION_COUNT = 200
+    TUTOR_SESSIONS_PER_TUTOR = 2
+    REQUESTS_PER_STUDENT = 2 / 3
     PASSWORD = 'Password123'
+    BATCH_SIZE = 1000
 
     help = 'Seeds the database with sample data'
 
-    def __init__(self):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
         self.faker = Faker()
 
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--scale', type=int, default=None,
+            help='Total number of tutors and students to create (default: 450)'
+        )
+
     def handle(self, *args, **options):
-        self.create_programming_languages()
-        self.create_required_users()
-        self.seed_sessions()
-        self.create_tutors_and_students()
-        self.create_tutor_sessions()
-        self.create_requested_student_sessions()
-        self.create_student_sessions()
-        
+        if options['scale'] is None:
+            tutor_count, student_count = self.TUTOR_COUNT, self.STUDENT_COUNT
+        else:
+            tutor_count = max(1, options['scale'] // 3)
+            student_count = max(1, options['scale'] - tutor_count)
+
+        # Every user shares the same password, so it is hashed only once.
+        self.password = make_password(self.PASSWORD)
+        self.total_rows = 0
+        start = perf_counter()
+
+        with transaction.atomic():
+            self.run_step('programming languages', self.create_programming_languages)
+            self.run_step('required users', self.create_required_users)
+            self.run_step('sessions', self.seed_sessions)
+            self.run_step('tutors', self.create_tutors, tutor_count)
+            self.run_step('students', self.create_students, student_count)
+            self.run_step('tutor sessions', self.create_tutor_sessions, tutor_count * self.TUTOR_SESSIONS_PER_TUTOR)
+            self.run_step('requested sessions', self.create_requested_student_sessions, int(student_count * self.REQUESTS_PER_STUDENT))
+            self.run_step('student sessions', self.create_student_sessions)
+
+        # Bulk inserts do not send the signals that keep the cached statistics and the search index fresh.
+        invalidate_admin_statistics()
+        rebuild_search_index()
+
+        elapsed = perf_counter() - start
+        print(f"Seeded {self.total_rows} rows in {elapsed:.2f}s ({self.total_rows / elapsed:.0f} rows/s).")
+
+    def run_step(self, name, step, *args):
+        """Run one seeding step and report how many rows it wrote and how fast."""
+
+        start = perf_counter()
+        rows = step(*args)
+        elapsed = perf_counter() - start
+        self.total_rows += rows
+        rate = rows / elapsed if elapsed else 0
+        print(f"Seeded {rows} rows of {name} in {elapsed:.2f}s ({rate:.0f} rows/s).")
+
     def create_programming_languages(self):
-        LANGUAGES = [
-            'Python', 'Java', 'C++', 'JavaScript', 'Ruby', 'PHP', 'Go', 'Swift', 'Kotlin', 'Rust'
+        existing = set(ProgrammingLanguage.objects.values_list('name', flat=True))
+        missing = [ProgrammingLanguage(name=name) for name, _ in ProgrammingLanguage.LANGUAGES if name not in existing]
+        ProgrammingLanguage.objects.bulk_create(missing)
+        invalidate_languages()
+        self.languages = list(ProgrammingLanguage.objects.all())
+        return len(missing)
+
+    def create_required_users(self):
+        required_users = [
+            ('@johndoe', 'johndoe@example.com', 'John', 'Doe', User.Roles.ADMIN),
+            ('@janedoe', 'janedoe@example.com', 'Jane', 'Doe', User.Roles.TUTOR),
+            ('@charlie', 'charlie@example.com', 'Charlie', 'Brown', User.Roles.STUDENT),
         ]
-        for language in LANGUAGES:
-            # Check if the language already exists before creating
-            if not ProgrammingLanguage.objects.filter(name=language).exists():
-                ProgrammingLanguage.objects.create(name=language)
-                print(f"Programming language '{language}' seeded.")
-            else:
-                print(f"Programming language '{language}' already exists.")
-
-    def create_tutors_and_students(self):
-        for _ in range(self.TUTOR_COUNT):
-            self.create_random_tutor()
-
-        for _ in range(self.STUDENT_COUNT):
-            self.create_random_student()
-
-    def create_random_tutor(self):
-        user = self.User.objects.create_user(
-            username='@' + self.faker.unique.user_name(),
-            email=self.faker.unique.email(),
-            password='Password123',
-            first_name=self.faker.first_name(),
-            last_name=self.faker.last_name(),
-        )
-        tutor = Tutor.objects.create(user=user)
-
-        # Assign random programming languages to the tutor
-        languages = ProgrammingLanguage.objects.order_by('?')[:randint(1, 4)]
-        if languages:
-            tutor.expertise.add(*languages)
-
-    def create_random_student(self):
-        user = self.User.objects.create_user(
-            username='@' + self.faker.unique.user_name(),
-            email=self.faker.unique.email(),
-            password='Password123',
-            first_name=self.faker.first_name(),
-            last_name=self.faker.last_name(),
-        )
-        Student.objects.create(user=user)
+        existing = set(User.objects.filter(username__in=[user[0] for user in required_users]).values_list('username', flat=True))
+        users = User.objects.bulk_create([
+            User(username=username, email=email, gravatar_hash=User.hash_email(email), first_name=first_name,
+                 last_name=last_name, role=role, password=self.password)
+            for username, email, first_name, last_name, role in required_users
+            if username not in existing
+        ])
+        rows = len(users)
+        for user in users:
+            if user.role == User.Roles.TUTOR:
+                tutor = Tutor.objects.bulk_create([Tutor(user=user)])[0]
+                rows += 1 + self.assign_expertise([tutor], count=3)
+            elif user.role == User.Roles.STUDENT:
+                Student.objects.bulk_create([Student(user=user)])
+                rows += 1
+            print(f"Required user {user.username} created.")
+        return rows
 
-    
     def seed_sessions(self):
-        TERM_START_DATES = {
-            2024: {
-                'Fall': datetime(2024, 9, 16),
-                'Spring': datetime(2024, 1, 8),
-                'Summer': datetime(2024, 5, 6),
-            },
-            2025: {
-                'Fall': datetime(2025, 9, 15),
-                'Spring': datetime(2025, 1, 6),
-                'Summer': datetime(2025, 5, 5),
-            },
-            2026: {
-                'Fall': datetime(2026, 9, 14),
-                'Spring': datetime(2026, 1, 5),
-                'Summer': datetime(2026, 5, 4),
-            },
-        }
         frequencies = ['Weekly', 'Bi-Weekly']
         levels = ['beginner', 'intermediate', 'advanced']
-        programming_languages = ProgrammingLanguage.objects.all()
-
-        for year, seasons in TERM_START_DATES.items():
-            for season, start_date in seasons.items():
-                for language in programming_languages:
-                    for frequency in frequencies:
-                        for level in levels:
-                            duration_weeks = 12 if season == 'Fall' else (11 if season == 'Spring' else 6)
-                            end_date = calculate_end_date(start_date, duration_weeks)
-                            Session.objects.create(
-                                programming_language=language,
-                                level=level,
-                                season=season,
-                                year=year,
-                                frequency=frequency,
-                                start_day=start_date,
-                                end_day=end_date,
-                                is_available=True,
-                            )
-        print("Sessions seeded.")
-
-    def create_tutors_and_students(self):
-        print("Creating tutors and students...")
-
-        for _ in range(self.TUTOR_COUNT):
-            user = User.objects.create_user(
-                username='@' + self.faker.unique.user_name(),
-                email=self.faker.unique.email(),
-                password=self.PASSWORD,
-                first_name=self.faker.first_name(),
-                last_name=self.faker.last_name(),
-                role=User.Roles.TUTOR,
-            )
-            tutor = Tutor.objects.create(user=user)
-            languages = ProgrammingLanguage.objects.order_by('?')[:randint(1, 4)]
-            tutor.expertise.set(languages)
-            # print(f"Tutor {user.username} created with expertise: {[lang.name for lang in languages]}.")
-
-        for _ in range(self.STUDENT_COUNT):
-            user = User.objects.create_user(
-                username='@' + self.faker.unique.user_name(),
-                email=self.faker.unique.email(),
-                password=self.PASSWORD,
-                first_name=self.faker.first_name(),
-                last_name=self.faker.last_name(),
-                role=User.Roles.STUDENT,
-            )
-            Student.objects.create(user=user)
-            # print(f"Student {user.username} created.")
-
-    def create_tutor_sessions(self):
-        tutors = Tutor.objects.prefetch_related('expertise').all()
-        sessions = Session.objects.all()
-
-        for _ in range(self.TUTOR_SESSION_COUNT):
-            tutor = choice(tutors)
-            eligible_sessions = sessions.filter(programming_language__in=tutor.expertise.all())
-            
-            if not eligible_sessions.exists():
-                continue
-            
-            session = choice(eligible_sessions)
-
-            # Check if the TutorSession already exists
-            if TutorSession.objects.filter(tutor=tutor, session=session).exists():
-                print(f"TutorSession for tutor {tutor.user.username} and session {session.programming_language.name} already exists. Skipping.")
-                continue
-            
-            TutorSession.objects.create(tutor=tutor, session=session)
-            print(f"TutorSession created for tutor {tutor.user.username} and session {session.programming_language.name}.")
-
-
-
-    def create_requested_student_sessions(self):
-        students = Student.objects.all()
-        sessions = Session.objects.all()
-
-        for _ in range(self.REQ_STUDENT_SESSION_COUNT):
-            student = choice(students)
-            session = choice(sessions)
+        sessions = []
+
+        for (year, season), (start_date, end_date) in get_terms().items():
+            for language in self.languages:
+                for frequency in frequencies:
+                    for level in levels:
+                        sessions.append(Session(
+                            programming_language=language,
+                            level=level,
+                            season=season,
+                            year=year,
+                            frequency=frequency,
+                            start_day=start_date,
+                            end_day=end_date,
+                        ))
+        # The catalog holds one session per combination, so later runs reuse the existing rows
+        existing = set(Session.objects.values_list(*CATALOG_FIELDS))
+        attnames = [Session._meta.get_field(field).attname for field in CATALOG_FIELDS]
+        sessions = [
+            session for session in sessions
+            if tuple(getattr(session, attname) for attname in attnames) not in existing
+        ]
+        for session in sessions:
+            session.label = session.build_label()
+        Session.objects.bulk_create(sessions, batch_size=self.BATCH_SIZE)
+        self.sessions = list(Session.objects.all())
+        return len(sessions)
+
+    def create_users(self, count, role, prefix):
+        """Bulk create `count` users with the given role and return them with their primary keys."""
+
+        # Offsetting by the highest existing id keeps usernames unique across repeated runs.
+        offset = User.objects.order_by('-pk').values_list('pk', flat=True).first() or 0
+        users = []
+        for index in range(offset, offset + count):
+            first_name = self.faker.first_name()
+            last_name = self.faker.last_name()
+            username = '@' + re.sub(r'\W', '', f'{first_name[:10]}{last_name[:8]}').lower() + f'{prefix}{index}'
+            email = f'{username[1:]}@example.org'
+            users.append(User(
+                username=username,
+                email=email,
+                gravatar_hash=User.hash_email(email),
+                password=self.password,
+                first_name=first_name,
+                last_name=last_name,
+                role=role,
+            ))
+        return User.objects.bulk_create(users, batch_size=self.BATCH_SIZE)
+
+    def create_tutors(self, count):
+        users = self.create_users(count, User.Roles.TUTOR, 't')
+        self.tutors = Tutor.objects.bulk_create([Tutor(user=user) for user in users], batch_size=self.BATCH_SIZE)
+        expertise_rows = self.assign_expertise(self.tutors)
+        return len(users) + len(self.tutors) + expertise_rows
+
+    def assign_expertise(self, tutors, count=None):
+        """Give each tutor between one and four random languages, inserting the M2M rows in bulk."""
+
+        through = Tutor.expertise.through
+        rows = []
+        self.tutor_languages = getattr(self, 'tutor_languages', {})
+        for tutor in tutors:
+            languages = sample(self.languages, count or randint(1, 4))
+            self.tutor_languages[tutor.pk] = {language.pk for language in languages}
+            rows.extend(through(tutor_id=tutor.pk, programminglanguage_id=language.pk) for language in languages)
+        through.objects.bulk_create(rows, batch_size=self.BATCH_SIZE)
+        return len(rows)
+
+    def create_students(self, count):
+        users = self.create_users(count, User.Roles.STUDENT, 's')
+        self.students = Student.objects.bulk_create([Student(user=user) for user in users], batch_size=self.BATCH_SIZE)
+        return len(users) + len(self.students)
+
+    def create_tutor_sessions(self, count):
+        sessions_by_language = {}
+        for session in self.sessions:
+            sessions_by_language.setdefault(session.programming_language_id, []).append(session)
+
+        pairs = {}
+        for _ in range(count):
+            tutor = choice(self.tutors)
+            language_id = choice(list(self.tutor_languages[tutor.pk]))
+            session = choice(sessions_by_language[language_id])
+            pairs[(tutor.pk, session.pk)] = (tutor, session)
+
+        tutor_sessions = [TutorSession(tutor=tutor, session=session) for tutor, session in pairs.values()]
+        for tutor_session in tutor_sessions:
+            tutor_session.label = tutor_session.build_label()
+        tutor_sessions = TutorSession.objects.bulk_create(tutor_sessions, batch_size=self.BATCH_SIZE)
+        self.first_tutor_session_id = min((tutor_session.pk for tutor_session in tutor_sessions), default=None)
+        return len(tutor_sessions)
+
+    def create_requested_student_sessions(self, count):
+        pairs = set()
+        for _ in range(count):
+            pairs.add((choice(self.students).pk, choice(self.sessions).pk))
+
+        self.requested_sessions = RequestedStudentSession.objects.bulk_create(
+            [RequestedStudentSession(student_id=student_id, session_id=session_id) for student_id, session_id in pairs],
+            batch_size=self.BATCH_SIZE,
+        )
+        return len(self.requested_sessions) + self.match_requested_sessions()
 
-            if RequestedStudentSession.objects.filter(student=student, session=session).exists():
-                continue
+    def match_requested_sessions(self):
+        """Fill in the available tutor sessions of the new requests, and of older requests the new tutor sessions match."""
 
-            requested_session = RequestedStudentSession(
-                student=student,
-                session=session,
+        self.session_keys = {
+            pk: (language_id, level, season, year)
+            for pk, language_id, level, season, year in Session.objects.values_list(
+                'pk', 'programming_language_id', 'level', 'season', 'year'
+            ).iterator(chunk_size=self.BATCH_SIZE)
+        }
+        self.tutor_sessions_by_key = {}
+        for pk, session_id in TutorSession.objects.values_list('pk', 'session_id').iterator(chunk_size=self.BATCH_SIZE):
+            self.tutor_sessions_by_key.setdefault(self.session_keys[session_id], []).append(pk)
+
+        first_request_id = min((requested_session.pk for requested_session in self.requested_sessions), default=None)
+        if first_request_id is None:
+            return 0
+        rows = self.insert_matches('request.id >= %s', [first_request_id])
+        if self.first_tutor_session_id is not None:
+            # Pending requests from earlier runs can also be served by the new tutor sessions.
+            rows += self.insert_matches(
+                'request.id < %s AND request.is_approved = %s AND tutor_session.id >= %s',
+                [first_request_id, False, self.first_tutor_session_id],
             )
-
-            requested_session.save()
-
-            print(f"Requested session created for {student.user.full_name()} and session {session}.")
-
-
+        return rows
+
+    def insert_matches(self, condition, params):
+        """Insert the request/tutor session matches selected by `condition` with one INSERT ... SELECT.
+
+        The matches are joined inside the database, which is far faster than building them in Python.
+        """
+
+        through = RequestedStudentSession.available_tutor_sessions.through
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"""
+                INSERT INTO {through._meta.db_table} (requestedstudentsession_id, tutorsession_id)
+                SELECT request.id, tutor_session.id
+                FROM {RequestedStudentSession._meta.db_table} request
+                JOIN {Session._meta.db_table} requested ON requested.id = request.session_id
+                JOIN {Session._meta.db_table} taught
+                    ON taught.programming_language_id = requested.programming_language_id
+                    AND taught.level = requested.level
+                    AND taught.season = requested.season
+                    AND taught.year = requested.year
+                JOIN {TutorSession._meta.db_table} tutor_session ON tutor_session.session_id = taught.id
+                WHERE {condition}
+                """,
+                params,
+            )
+            return cursor.rowcount
 
     def create_student_sessions(self):
-        print("Creating student sessions...")
-        requested_sessions = RequestedStudentSession.objects.filter(is_approved=False).prefetch_related(
-            'available_tutor_sessions', 'student', 'session'
-        )
-
-        for requested_session in requested_sessions:
-            available_tutor_sessions = requested_session.available_tutor_sessions.all()
-
-            if not available_tutor_sessions.exists():
-                print(f"No available tutor sessions for requested session: {requested_session}")
+        unavailable = set(TutorSession.objects.filter(is_available=False).values_list('pk', flat=True))
+        enrolled = set()
+        student_sessions = []
+        approved_requests = []
+
+        for requested_session in self.requested_sessions:
+            language_id, _, season, year = self.session_keys[requested_session.session_id]
+            available = self.tutor_sessions_by_key.get(self.session_keys[requested_session.session_id])
+            if not available:
                 continue
 
-            tutor_session = choice(available_tutor_sessions)
-
-            if not tutor_session.session.is_available:
-                print(f"Session {tutor_session.session} is unavailable for tutor {tutor_session.tutor.user.username}. Skipping.")
+            tutor_session_id = choice(available)
+            if tutor_session_id in unavailable:
                 continue
 
-            if StudentSession.objects.filter(
-                student=requested_session.student,
-                tutor_session__session__programming_language=requested_session.session.programming_language,
-                tutor_session__session__year=requested_session.session.year,
-                tutor_session__session__season=requested_session.session.season,
-            ).exists():
-                print(f"Student {requested_session.student.user.username} is already enrolled in a similar session.")
+            enrollment_key = (requested_session.student_id, language_id, year, season)
+            if enrollment_key in enrolled:
                 continue
 
-            student_session = StudentSession.objects.create(
-                student=requested_session.student,
-                tutor_session=tutor_session
-            )
-
-            tutor_session.session.is_available = False
-            tutor_session.session.save()
-
-            # tutor_session.delete()
-            requested_session.delete()
-
-    def create_required_users(self):
-        if not User.objects.filter(username="@johndoe").exists():
-            admin_user = User.objects.create_user(
-                username="@johndoe",
-                email="johndoe@example.com",
-                password=self.PASSWORD,
-                first_name="John",
-                last_name="Doe",
-                role=User.Roles.ADMIN,
-            )
-            print("Admin user @johndoe created.")
-        
-        if not User.objects.filter(username="@janedoe").exists():
-            tutor_user = User.objects.create_user(
-                username="@janedoe",
-                email="janedoe@example.com",
-                password=self.PASSWORD,
-                first_name="Jane",
-                last_name="Doe",
-                role=User.Roles.TUTOR,
-            )
-            tutor = Tutor.objects.create(user=tutor_user)
-            programming_languages = ProgrammingLanguage.objects.order_by('?')[:3]
-            tutor.expertise.set(programming_languages)
-            print(f"Tutor @janedoe created with expertise: {[lang.name for lang in programming_languages]}")
-        
-        if not User.objects.filter(username="@charlie").exists():
-            student_user = User.objects.create_user(
-                username="@charlie",
-                email="charlie@example.com",
-                password=self.PASSWORD,
-                first_name="Charlie",
-                last_name="Brown",
-                role=User.Roles.STUDENT,
-            )
-            student = Student.objects.create(user=student_user)
-            print("Student user @charlie created.")
-            
\ No newline at end of file
+            enrolled.add(enrollment_key)
+            unavailable.add(tutor_session_id)
+            student_sessions.append(StudentSession(student_id=requested_session.student_id, tutor_session_id=tutor_session_id))
+            approved_requests.append(requested_session.pk)
+
+        StudentSession.objects.bulk_create(student_sessions, batch_size=self.BATCH_SIZE)
+        newly_unavailable = [student_session.tutor_session_id for student_session in student_sessions]
+        for start in range(0, len(newly_unavailable), self.BATCH_SIZE):
+            TutorSession.objects.filter(pk__in=newly_unavailable[start:start + self.BATCH_SIZE]).update(is_available=False)
+        for start in range(0, len(approved_requests), self.BATCH_SIZE):
+            RequestedStudentSession.objects.filter(pk__in=approved_requests[start:start + self.BATCH_SIZE]).delete()
+        return len(student_sessions)
@@ -0,0 +1,15 @@
+from time import perf_counter
+
+from django.core.management.base import BaseCommand
+from tutorials.services import send_invoices
+
+
+class Command(BaseCommand):
+    help = "Invoices every student session in 'Send Invoice' status; sessions already invoiced are skipped, so it is safe to re-run"
+
+    def handle(self, *args, **options):
+        start = perf_counter()
+        invoices = send_invoices()
+        elapsed = perf_counter() - start
+        rate = len(invoices) / elapsed if elapsed else 0
+        self.stdout.write(f"Created {len(invoices)} invoices in {elapsed:.2f}s ({rate:.0f} invoices/s).")
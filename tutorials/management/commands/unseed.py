@@ -1,61 +1,106 @@
+from django.apps import apps
+from django.contrib.admin.models import LogEntry
 from django.core.management.base import BaseCommand
-from tutorials.models import User, Tutor, Student, Session, StudentSession, ProgrammingLanguage, TutorSession, RequestedStudentSession
+from django.core.management.color import no_style
+from django.db import connection, transaction
+from django.db.models import Q
+from django.db.models.deletion import DO_NOTHING, get_candidate_relations_to_delete
+from tutorials.helpers import invalidate_admin_statistics
+from tutorials.languages import invalidate_languages
+from tutorials.search import rebuild_search_index
+from tutorials.models import User, Admin, Tutor, Student, Session, StudentSession, ProgrammingLanguage, TutorSession, RequestedStudentSession, Invoice, RateCard, Term
+from time import perf_counter
+
 
 class Command(BaseCommand):
-    help = 'Unseeds the database by deleting all seeded data'
+    REQUIRED_USERS = ['@johndoe', '@janedoe', '@charlie']
+    # Reference data that seed reads but does not create, and the languages the rate card refers to
+    REFERENCE_MODELS = [Term, RateCard, ProgrammingLanguage]
+
+    help = 'Unseeds the database by deleting all seeded data but the term calendar, rate card and programming languages'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--truncate', action='store_true',
+            help='Empty every tutorials table, including all users, with the fastest statements the '
+                 'database offers. The term calendar, rate card and programming languages are kept. '
+                 'Only meant for test databases.'
+        )
 
     def handle(self, *args, **options):
-        self.delete_student_sessions()
-        self.delete_requested_student_sessions()
-        self.delete_tutor_sessions()
-        self.delete_sessions()
-        self.delete_tutors_and_students()
-        self.delete_programming_languages()
-        self.delete_required_users()
-        print("Database unseeding completed.")
-
-    def delete_student_sessions(self):
-        count = StudentSession.objects.count()
-        StudentSession.objects.all().delete()
-        print(f"Deleted {count} StudentSession records.")
-
-    def delete_requested_student_sessions(self):
-        count = RequestedStudentSession.objects.count()
-        RequestedStudentSession.objects.all().delete()
-        print(f"Deleted {count} RequestedStudentSession records.")
-
-    def delete_tutor_sessions(self):
-        count = TutorSession.objects.count()
-        TutorSession.objects.all().delete()
-        print(f"Deleted {count} TutorSession records.")
-
-    def delete_sessions(self):
-        count = Session.objects.count()
-        Session.objects.all().delete()
-        print(f"Deleted {count} Session records.")
-
-    def delete_tutors_and_students(self):
-        # Delete tutors
-        tutor_count = Tutor.objects.count()
-        Tutor.objects.all().delete()
-        print(f"Deleted {tutor_count} Tutor records.")
-
-        # Delete students
-        student_count = Student.objects.count()
-        Student.objects.all().delete()
-        print(f"Deleted {student_count} Student records.")
-
-        # Delete associated users
-        tutor_and_student_users = User.objects.filter(role__in=[User.Roles.TUTOR, User.Roles.STUDENT]).count()
-        User.objects.filter(role__in=[User.Roles.TUTOR, User.Roles.STUDENT]).delete()
-        print(f"Deleted {tutor_and_student_users} User records (TUTORS and STUDENTS).")
-
-    def delete_programming_languages(self):
-        count = ProgrammingLanguage.objects.count()
-        ProgrammingLanguage.objects.all().delete()
-        print(f"Deleted {count} ProgrammingLanguage records.")
-
-    def delete_required_users(self):
-        required_users = ['@johndoe', '@janedoe', '@charlie']
-        deleted_count = User.objects.filter(username__in=required_users).delete()[0]
-        print(f"Deleted {deleted_count} required user accounts ({', '.join(required_users)}).")
+        start = perf_counter()
+        with transaction.atomic():
+            if options['truncate']:
+                self.truncate_tables()
+            else:
+                self.delete_seeded_rows()
+
+        # Raw deletes do not send the signals that keep the cached statistics, languages and search index fresh.
+        invalidate_admin_statistics()
+        invalidate_languages()
+        rebuild_search_index()
+        print(f"Database unseeding completed in {perf_counter() - start:.2f}s.")
+
+    def deletion_plan(self):
+        """Return the seeded rows to delete, each table listed after every table that references it.
+
+        The reference data is kept, as with --truncate, since deleting a language
+        would cascade to the rate card.
+        """
+
+        seeded_users = User.objects.filter(
+            Q(role__in=[User.Roles.TUTOR, User.Roles.STUDENT]) | Q(username__in=self.REQUIRED_USERS)
+        )
+        return [
+            ('Invoice', Invoice.objects.all()),
+            ('StudentSession', StudentSession.objects.all()),
+            ('RequestedStudentSession available tutor sessions', RequestedStudentSession.available_tutor_sessions.through.objects.all()),
+            ('RequestedStudentSession', RequestedStudentSession.objects.all()),
+            ('TutorSession', TutorSession.objects.all()),
+            ('Student previous sessions', Student.previous_sessions.through.objects.all()),
+            ('Session', Session.objects.all()),
+            ('Tutor expertise', Tutor.expertise.through.objects.all()),
+            ('Tutor', Tutor.objects.all()),
+            ('Student', Student.objects.all()),
+            ('Admin', Admin.objects.filter(user__in=seeded_users)),
+            ('User groups', User.groups.through.objects.filter(user__in=seeded_users)),
+            ('User permissions', User.user_permissions.through.objects.filter(user__in=seeded_users)),
+            ('Admin log entries', LogEntry.objects.filter(user__in=seeded_users)),
+            ('User', seeded_users),
+        ]
+
+    def delete_seeded_rows(self):
+        deleted_models = set()
+        for label, queryset in self.deletion_plan():
+            start = perf_counter()
+            if self.can_raw_delete(queryset.model, deleted_models):
+                count = queryset._raw_delete(queryset.db)
+            else:
+                count = queryset.delete()[0]
+            deleted_models.add(queryset.model)
+            print(f"Deleted {count} {label} records in {perf_counter() - start:.2f}s.")
+
+    def can_raw_delete(self, model, deleted_models):
+        """Return True when every row that could cascade from `model` was already deleted.
+
+        A single DELETE statement is then equivalent to Django's cascade collector,
+        which would otherwise load every related object into memory first.
+        """
+
+        return all(
+            relation.on_delete is DO_NOTHING or relation.related_model in deleted_models
+            for relation in get_candidate_relations_to_delete(model._meta)
+        )
+
+    def truncate_tables(self):
+        """Empty the tables of every tutorials model but the reference data with the database's flush statements."""
+
+        models = apps.get_app_config('tutorials').get_models(include_auto_created=True)
+        tables = [LogEntry._meta.db_table] + [
+            model._meta.db_table for model in models if model not in self.REFERENCE_MODELS
+        ]
+        start = perf_counter()
+        statements = connection.ops.sql_flush(no_style(), tables, reset_sequences=True, allow_cascade=True)
+        connection.ops.execute_sql_flush(statements)
+        print(f"Truncated {len(tables)} tables in {perf_counter() - start:.2f}s.")
+
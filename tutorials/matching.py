@@ -0,0 +1,91 @@
+"""Matching of student session requests to the tutor sessions that can serve them.
+
+Matches are stored in `RequestedStudentSession.available_tutor_sessions` and kept
+up to date incrementally: a request is matched when it is saved, and the signal
+handlers in `tutorials.signals` rematch the affected rows whenever a tutor session
+or session changes. Deleting either cascades to the stored matches, and reading
+the matches never has to recompute them.
+"""
+from tutorials.models import RequestedStudentSession, TutorSession
+
+MATCH_FIELDS = {'programming_language', 'level', 'season', 'year'}
+MATCH_BATCH_SIZE = 500
+
+AvailableTutorSession = RequestedStudentSession.available_tutor_sessions.through
+
+
+def _match_filter(session, prefix='session__'):
+    return {
+        f'{prefix}programming_language_id': session.programming_language_id,
+        f'{prefix}level': session.level,
+        f'{prefix}season': session.season,
+        f'{prefix}year': session.year,
+    }
+
+
+def matching_tutor_sessions(session):
+    """Return the tutor sessions teaching the same language, level, season and year as the session."""
+
+    return TutorSession.objects.filter(**_match_filter(session))
+
+
+def matching_pending_requests(session):
+    """Return the pending requests for the same language, level, season and year as the session."""
+
+    return RequestedStudentSession.objects.filter(is_approved=False, **_match_filter(session))
+
+
+def _insert_matches(requested_session_ids, tutor_session_ids):
+    AvailableTutorSession.objects.bulk_create(
+        [
+            AvailableTutorSession(requestedstudentsession_id=requested_session_id, tutorsession_id=tutor_session_id)
+            for requested_session_id in requested_session_ids
+            for tutor_session_id in tutor_session_ids
+        ],
+        batch_size=MATCH_BATCH_SIZE,
+        ignore_conflicts=True,
+    )
+
+
+def match_requested_session(requested_session):
+    """Replace the available tutor sessions of a request with its current matches."""
+
+    tutor_session_ids = list(
+        matching_tutor_sessions(requested_session.session).values_list('pk', flat=True)
+    )
+    AvailableTutorSession.objects.filter(requestedstudentsession_id=requested_session.pk).delete()
+    _insert_matches([requested_session.pk], tutor_session_ids)
+    return tutor_session_ids
+
+
+def match_tutor_session(tutor_session):
+    """Replace the pending requests a tutor session is offered to with its current matches."""
+
+    requested_session_ids = list(
+        matching_pending_requests(tutor_session.session).values_list('pk', flat=True)
+    )
+    AvailableTutorSession.objects.filter(tutorsession_id=tutor_session.pk).delete()
+    _insert_matches(requested_session_ids, [tutor_session.pk])
+    return requested_session_ids
+
+
+def rematch_session(session):
+    """Rematch every tutor session and pending request attached to a session after it changed."""
+
+    tutor_session_ids = list(session.tutor_sessions.values_list('pk', flat=True))
+    if tutor_session_ids:
+        AvailableTutorSession.objects.filter(tutorsession_id__in=tutor_session_ids).delete()
+        _insert_matches(
+            list(matching_pending_requests(session).values_list('pk', flat=True)),
+            tutor_session_ids,
+        )
+
+    requested_session_ids = list(
+        session.requests.filter(is_approved=False).values_list('pk', flat=True)
+    )
+    if requested_session_ids:
+        AvailableTutorSession.objects.filter(requestedstudentsession_id__in=requested_session_ids).delete()
+        _insert_matches(
+            requested_session_ids,
+            list(matching_tutor_sessions(session).values_list('pk', flat=True)),
+        )
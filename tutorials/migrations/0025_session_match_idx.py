@@ -0,0 +1,17 @@
+# Generated by Django 5.1.2 on 2026-10-17 18:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tutorials', '0024_alter_invoice_session'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='session',
+            index=models.Index(fields=['programming_language', 'level', 'season', 'year'], name='session_match_idx'),
+        ),
+    ]
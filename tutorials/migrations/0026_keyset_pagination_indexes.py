@@ -0,0 +1,30 @@
+# Generated by Django 5.1.2 on 2026-10-17 18:51
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('tutorials', '0025_session_match_idx'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='invoice',
+            index=models.Index(fields=['created_at', 'id'], name='invoice_created_at_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='requestedstudentsession',
+            index=models.Index(fields=['requested_at', 'id'], name='request_requested_at_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='studentsession',
+            index=models.Index(fields=['registered_at', 'id'], name='enrollment_registered_at_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(fields=['first_name', 'id'], name='user_first_name_idx'),
+        ),
+    ]
@@ -0,0 +1,44 @@
+# Generated by Django 5.1.2 on 2026-10-17 19:06
+
+from django.db import migrations, models
+
+
+def populate_labels(apps, schema_editor):
+    Session = apps.get_model('tutorials', 'Session')
+    TutorSession = apps.get_model('tutorials', 'TutorSession')
+
+    sessions = []
+    for session in Session.objects.select_related('programming_language').iterator(chunk_size=500):
+        session.label = (f'{session.programming_language.name} ({session.level}) - {session.season} {session.year} - '
+                         f'{session.frequency} - {session.start_day} to {session.end_day}')
+        sessions.append(session)
+    Session.objects.bulk_update(sessions, ['label'], batch_size=500)
+
+    labels = {session.pk: session.label for session in sessions}
+    tutor_sessions = []
+    for tutor_session in TutorSession.objects.select_related('tutor__user').iterator(chunk_size=500):
+        user = tutor_session.tutor.user
+        tutor_session.label = f'Tutor: {user.first_name} {user.last_name} - Session: {labels[tutor_session.session_id]}'
+        tutor_sessions.append(tutor_session)
+    TutorSession.objects.bulk_update(tutor_sessions, ['label'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tutorials', '0026_keyset_pagination_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='session',
+            name='label',
+            field=models.CharField(blank=True, editable=False, help_text='Precomputed display text, kept in sync by save() and the language signals', max_length=255),
+        ),
+        migrations.AddField(
+            model_name='tutorsession',
+            name='label',
+            field=models.CharField(blank=True, editable=False, help_text='Precomputed display text, kept in sync by save() and the session and user signals', max_length=400),
+        ),
+        migrations.RunPython(populate_labels, migrations.RunPython.noop),
+    ]
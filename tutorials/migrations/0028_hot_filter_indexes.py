@@ -0,0 +1,30 @@
+# Generated by Django 5.1.2 on 2026-10-17 19:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('tutorials', '0027_session_labels'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='invoice',
+            index=models.Index(fields=['payment_status', 'session'], name='invoice_status_session_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='requestedstudentsession',
+            index=models.Index(fields=['is_approved', 'requested_at', 'id'], name='request_pending_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='studentsession',
+            index=models.Index(fields=['student', 'status'], name='enrollment_student_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(fields=['role'], name='user_role_idx'),
+        ),
+    ]
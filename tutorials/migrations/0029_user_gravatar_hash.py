@@ -0,0 +1,29 @@
+# Generated by Django 5.1.2 on 2026-10-17 19:13
+
+from django.db import migrations, models
+from libgravatar import md5_hash, sanitize_email
+
+
+def populate_gravatar_hashes(apps, schema_editor):
+    User = apps.get_model('tutorials', 'User')
+    users = []
+    for user in User.objects.only('pk', 'email').iterator(chunk_size=500):
+        user.gravatar_hash = md5_hash(sanitize_email(user.email))
+        users.append(user)
+    User.objects.bulk_update(users, ['gravatar_hash'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tutorials', '0028_hot_filter_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='gravatar_hash',
+            field=models.CharField(blank=True, editable=False, help_text='MD5 hash of the email, stored when the email is saved', max_length=32),
+        ),
+        migrations.RunPython(populate_gravatar_hashes, migrations.RunPython.noop),
+    ]
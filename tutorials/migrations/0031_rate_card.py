@@ -0,0 +1,28 @@
+# Generated by Django 5.1.2 on 2026-10-17 19:27
+
+import django.core.validators
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tutorials', '0030_invoice_status_due_date_idx'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RateCard',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('duration_hours', models.PositiveIntegerField(help_text='Duration of each session in hours', validators=[django.core.validators.MinValueValidator(1)])),
+                ('level', models.CharField(blank=True, choices=[('beginner', 'Beginner'), ('intermediate', 'Intermediate'), ('advanced', 'Advanced')], help_text='Leave blank to price every level', max_length=20)),
+                ('amount', models.DecimalField(decimal_places=2, max_digits=10)),
+                ('programming_language', models.ForeignKey(blank=True, help_text='Leave blank to price every language', null=True, on_delete=django.db.models.deletion.CASCADE, related_name='rate_cards', to='tutorials.programminglanguage')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('duration_hours', 'level', 'programming_language'), name='unique_rate_card'), models.UniqueConstraint(condition=models.Q(('programming_language', None)), fields=('duration_hours', 'level'), name='unique_rate_card_for_every_language')],
+            },
+        ),
+    ]
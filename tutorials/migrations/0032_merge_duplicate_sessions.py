@@ -0,0 +1,19 @@
+# Generated by Django 5.1.2 on 2026-10-17 19:33
+
+from django.db import migrations
+
+
+def merge_duplicate_sessions(apps, schema_editor):
+    from tutorials.catalog import merge_duplicate_sessions
+    merge_duplicate_sessions(apps)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tutorials', '0031_rate_card'),
+    ]
+
+    operations = [
+        migrations.RunPython(merge_duplicate_sessions, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.1.2 on 2026-10-17 19:33
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tutorials', '0032_merge_duplicate_sessions'),
+    ]
+
+    operations = [
+        migrations.AddConstraint(
+            model_name='session',
+            constraint=models.UniqueConstraint(fields=('programming_language', 'level', 'season', 'year', 'frequency', 'duration_hours'), name='unique_session'),
+        ),
+        migrations.RemoveIndex(
+            model_name='session',
+            name='session_match_idx',
+        ),
+    ]
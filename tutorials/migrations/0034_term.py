@@ -0,0 +1,57 @@
+# Generated by Django 5.1.2 on 2026-10-17 19:43
+
+import django.core.validators
+from datetime import date
+from django.db import migrations, models
+
+
+# The calendar that used to be hardcoded as Session.TERM_START_DATES
+TERMS = [
+    ('Spring', 2024, date(2024, 1, 8), 11),
+    ('Summer', 2024, date(2024, 5, 6), 6),
+    ('Fall', 2024, date(2024, 9, 16), 12),
+    ('Spring', 2025, date(2025, 1, 6), 11),
+    ('Summer', 2025, date(2025, 5, 5), 6),
+    ('Fall', 2025, date(2025, 9, 15), 12),
+    ('Spring', 2026, date(2026, 1, 5), 11),
+    ('Summer', 2026, date(2026, 5, 4), 6),
+    ('Fall', 2026, date(2026, 9, 14), 12),
+]
+
+
+def create_terms(apps, schema_editor):
+    Term = apps.get_model('tutorials', 'Term')
+    Term.objects.bulk_create([
+        Term(season=season, year=year, start_date=start_date, weeks=weeks)
+        for season, year, start_date, weeks in TERMS
+    ])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tutorials', '0033_unique_session'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='session',
+            name='year',
+            field=models.PositiveIntegerField(help_text='Enter the year (e.g., 2024)', validators=[django.core.validators.MinValueValidator(2024)]),
+        ),
+        migrations.CreateModel(
+            name='Term',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('season', models.CharField(choices=[('Fall', 'Fall'), ('Spring', 'Spring'), ('Summer', 'Summer')], max_length=20)),
+                ('year', models.PositiveIntegerField(validators=[django.core.validators.MinValueValidator(2024)])),
+                ('start_date', models.DateField(help_text='First day of the term')),
+                ('weeks', models.PositiveIntegerField(help_text='Number of teaching weeks in the term', validators=[django.core.validators.MinValueValidator(1)])),
+            ],
+            options={
+                'ordering': ['year', 'start_date'],
+                'constraints': [models.UniqueConstraint(fields=('year', 'season'), name='unique_term')],
+            },
+        ),
+        migrations.RunPython(create_terms, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,43 @@
+# Generated by Django 5.1.2 on 2026-10-17 20:05
+
+from django.db import migrations
+
+
+def create_search_index(apps, schema_editor):
+    # Only SQLite has FTS5; elsewhere tutorials.search falls back to icontains lookups
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    schema_editor.execute(
+        "CREATE VIRTUAL TABLE tutorials_user_search USING fts5("
+        "username, first_name, last_name, email, expertise, "
+        "tokenize = 'unicode61 remove_diacritics 2', prefix = '2 3')"
+    )
+    schema_editor.execute(
+        "INSERT INTO tutorials_user_search (rowid, username, first_name, last_name, email, expertise) "
+        "SELECT account.id, account.username, account.first_name, account.last_name, "
+        "CASE WHEN instr(account.email, '@') THEN substr(account.email, 1, instr(account.email, '@') - 1) "
+        "ELSE account.email END, ("
+        "    SELECT group_concat(language.name, ' ') "
+        "    FROM tutorials_tutor tutor "
+        "    JOIN tutorials_tutor_expertise expertise ON expertise.tutor_id = tutor.id "
+        "    JOIN tutorials_programminglanguage language ON language.id = expertise.programminglanguage_id "
+        "    WHERE tutor.user_id = account.id"
+        ") FROM tutorials_user account"
+    )
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    schema_editor.execute("DROP TABLE tutorials_user_search")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tutorials', '0034_term'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
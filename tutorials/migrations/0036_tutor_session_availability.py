@@ -0,0 +1,34 @@
+# Generated by Django 5.1.2 on 2026-10-17 21:10
+
+from django.db import migrations, models
+
+
+def take_enrolled_tutor_sessions(apps, schema_editor):
+    # A tutor session is taken by its first enrollment, whatever the catalog session said before the merge
+    TutorSession = apps.get_model('tutorials', 'TutorSession')
+    TutorSession.objects.filter(student_sessions__isnull=False).update(is_available=False)
+
+
+def take_sessions_of_taken_tutor_sessions(apps, schema_editor):
+    Session = apps.get_model('tutorials', 'Session')
+    Session.objects.filter(tutor_sessions__is_available=False).update(is_available=False)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tutorials', '0035_user_search'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='tutorsession',
+            name='is_available',
+            field=models.BooleanField(default=True, help_text='Indicates if the tutor session can take a student; its first enrollment takes it'),
+        ),
+        migrations.RunPython(take_enrolled_tutor_sessions, take_sessions_of_taken_tutor_sessions),
+        migrations.RemoveField(
+            model_name='session',
+            name='is_available',
+        ),
+    ]
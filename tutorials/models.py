@@ -1,14 +1,13 @@
 from django.core.validators import RegexValidator
 from django.contrib.auth.models import AbstractUser
-from django.db import models
-from libgravatar import Gravatar
+from django.db import models, transaction
+from libgravatar import Gravatar, md5_hash, sanitize_email
 from django.utils.timezone import now
-from datetime import datetime, timedelta
+from datetime import timedelta
 from django.core.validators import MinValueValidator
-from datetime import date, datetime, timedelta
-from datetime import datetime, timedelta
 from django.db import models
-from django.core.validators import MinValueValidator, MaxValueValidator
+from django.core.exceptions import ValidationError
+from django.core.validators import MinValueValidator
 from decimal import Decimal
 from django.utils import timezone
 
@@ -18,6 +17,14 @@ def calculate_end_date(start_date, duration_weeks):
 def default_end_time():
     return now() + timedelta(hours=2)
 
+def gravatar_url(email_hash, size):
+    """Return the URL of a gravatar image, in the same form as libgravatar's get_image."""
+    if size == Gravatar.DEFAULT_IMAGE_SIZE:
+        return f'https://www.gravatar.com/avatar/{email_hash}?default=mp'
+    if not 0 < size < 2048:
+        raise ValueError("Invalid image size.")
+    return f'https://www.gravatar.com/avatar/{email_hash}?size={size}&default=mp'
+
 class User(AbstractUser):
     class Roles(models.TextChoices):
         ADMIN = 'ADMIN', 'Admin'
@@ -41,20 +48,44 @@ class User(AbstractUser):
         default=Roles.STUDENT,
         blank=False
     )
+    gravatar_hash = models.CharField(
+        max_length=32,
+        blank=True,
+        editable=False,
+        help_text="MD5 hash of the email, stored when the email is saved"
+    )
 
     class Meta:
         """Model options."""
         ordering = ['last_name', 'first_name']
+        indexes = [
+            models.Index(fields=['first_name', 'id'], name='user_first_name_idx'),
+            models.Index(fields=['role'], name='user_role_idx'),
+        ]
 
     def full_name(self):
         """Return a string containing the user's full name."""
         return f'{self.first_name} {self.last_name}'
 
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None or 'email' in update_fields:
+            self.gravatar_hash = self.hash_email(self.email)
+            if update_fields is not None:
+                kwargs['update_fields'] = {*update_fields, 'gravatar_hash'}
+        super().save(*args, **kwargs)
+
+    @staticmethod
+    def hash_email(email):
+        """Return the gravatar hash of an email address."""
+        return md5_hash(sanitize_email(email))
+
     def gravatar(self, size=120):
         """Return a URL to the user's gravatar."""
-        gravatar_object = Gravatar(self.email)
-        gravatar_url = gravatar_object.get_image(size=size, default='mp')
-        return gravatar_url
+        if not self.gravatar_hash:
+            # Rows inserted without save(), such as fixtures, are hashed on first use
+            self.gravatar_hash = self.hash_email(self.email)
+        return gravatar_url(self.gravatar_hash, size)
 
     def mini_gravatar(self):
         """Return a URL to a miniature version of the user's gravatar."""
@@ -67,9 +98,9 @@ class Student(models.Model):
 
     def save(self, *args, **kwargs):
         # Automatically set the role to 'STUDENT' when a student object is created
-        if not self.user.role or self.user.role != User.Roles.STUDENT:
+        if self.user.role != User.Roles.STUDENT:
             self.user.role = User.Roles.STUDENT
-            self.user.save()
+            self.user.save(update_fields=['role'])
         super(Student, self).save(*args, **kwargs)
 
     def __str__(self):
@@ -110,13 +141,21 @@ class Tutor(models.Model):
 
     def save(self, *args, **kwargs):
         # Automatically set the role to 'TUTOR' when a tutor object is created
-        if not self.user.role or self.user.role != User.Roles.TUTOR:
+        if self.user.role != User.Roles.TUTOR:
             self.user.role = User.Roles.TUTOR
-            self.user.save()
+            self.user.save(update_fields=['role'])
         super(Tutor, self).save(*args, **kwargs)
 
     def expertise_list(self):
-        return ', '.join([language.name for language in self.expertise.all()])
+        from tutorials.languages import get_languages
+        prefetched = getattr(self, '_prefetched_objects_cache', {}).get('expertise')
+        if prefetched is not None:
+            language_ids = {language.pk for language in prefetched}
+        else:
+            language_ids = set(
+                self.expertise.through.objects.filter(tutor=self).values_list('programminglanguage_id', flat=True)
+            )
+        return ', '.join([language.name for pk, language in get_languages().items() if pk in language_ids])
 
     expertise_list.short_description = 'Expertise'
 
@@ -128,9 +167,9 @@ class Admin(models.Model):
 
     def save(self, *args, **kwargs):
         # Automatically set the role to 'ADMIN' when an admin object is created
-        if not self.user.role or self.user.role != User.Roles.ADMIN:
+        if self.user.role != User.Roles.ADMIN:
             self.user.role = User.Roles.ADMIN
-            self.user.save()
+            self.user.save(update_fields=['role'])
         super(Admin, self).save(*args, **kwargs)
 
     def __str__(self):
@@ -148,23 +187,11 @@ class Session(models.Model):
         ('Summer', 'Summer'),
     ]
 
-    TERM_START_DATES = {
-        2024: {
-            'Fall': datetime(2024, 9, 16),
-            'Spring': datetime(2024, 1, 8),
-            'Summer': datetime(2024, 5, 6),  # Starts in May
-        },
-        2025: {
-            'Fall': datetime(2025, 9, 15),
-            'Spring': datetime(2025, 1, 6),
-            'Summer': datetime(2025, 5, 5),  # Starts in May
-        },
-        2026: {
-            'Fall': datetime(2026, 9, 14),
-            'Spring': datetime(2026, 1, 5),
-            'Summer': datetime(2026, 5, 4),  # Starts in May
-        },
-    }
+    LEVELS = [
+        ('beginner', 'Beginner'),
+        ('intermediate', 'Intermediate'),
+        ('advanced', 'Advanced'),
+    ]
 
     programming_language = models.ForeignKey(
         'ProgrammingLanguage',
@@ -175,11 +202,7 @@ class Session(models.Model):
     )
     level = models.CharField(
         max_length=20,
-        choices=[
-            ('beginner', 'Beginner'),
-            ('intermediate', 'Intermediate'),
-            ('advanced', 'Advanced'),
-        ]
+        choices=LEVELS
     )
     season = models.CharField(
         max_length=20,
@@ -189,7 +212,7 @@ class Session(models.Model):
     )
     year = models.PositiveIntegerField(
         help_text="Enter the year (e.g., 2024)",
-        validators=[MinValueValidator(2024), MaxValueValidator(2026)]
+        validators=[MinValueValidator(2024)]
     )
     frequency = models.CharField(
         max_length=20,
@@ -203,32 +226,90 @@ class Session(models.Model):
     )
     start_day = models.DateField(help_text="Start date of the session term.")
     end_day = models.DateField(help_text="End date of the session term.")
-    is_available = models.BooleanField(
-        default=True,
-        help_text="Indicates if the session is available for registration"
+    label = models.CharField(
+        max_length=255,
+        blank=True,
+        editable=False,
+        help_text="Precomputed display text, kept in sync by save() and the language signals"
     )
 
-    def save(self, *args, **kwargs):
-        if self.year not in self.TERM_START_DATES:
-            raise ValueError(f"Start dates not configured for year {self.year}.")
-        if self.season not in self.TERM_START_DATES[self.year]:
-            raise ValueError(f"Start date for {self.season} in {self.year} not configured.")
+    class Meta:
+        constraints = [
+            # One catalog row per kind of session; its index also serves the matching lookups
+            models.UniqueConstraint(
+                fields=['programming_language', 'level', 'season', 'year', 'frequency', 'duration_hours'],
+                name='unique_session',
+            ),
+        ]
 
-        self.start_day = self.TERM_START_DATES[self.year][self.season]
-        duration_weeks = 12 if self.season == 'Fall' else (11 if self.season == 'Spring' else 6)  # Adjust summer duration
+    def clean(self):
+        from tutorials.terms import term_dates
+        if self.year is not None and term_dates(self.year, self.season) is None:
+            raise ValidationError({'year': f"No {self.season} term is scheduled for {self.year}."})
 
-        self.end_day = calculate_end_date(self.start_day, duration_weeks)
+    def save(self, *args, **kwargs):
+        from tutorials.terms import term_dates
+        dates = term_dates(self.year, self.season)
+        if dates is None:
+            raise ValueError(f"Start date for {self.season} in {self.year} not configured.")
+        self.start_day, self.end_day = dates
 
-        
-        if isinstance(self.end_day, datetime):
-            self.end_day = self.end_day.date()
+        label = self.build_label()
+        label_changed = label != self.label
+        self.label = label
+        if label_changed and kwargs.get('update_fields') is not None:
+            kwargs['update_fields'] = {*kwargs['update_fields'], 'label'}
 
         super(Session, self).save(*args, **kwargs)
 
-    def __str__(self):
+        if label_changed:
+            TutorSession.refresh_labels(TutorSession.objects.filter(session=self))
+
+    def build_label(self):
+        """Return the display text of the session."""
         return (f'{self.programming_language.name} ({self.level}) - {self.season} {self.year} - '
                 f'{self.frequency} - {self.start_day} to {self.end_day}')
 
+    @classmethod
+    def refresh_labels(cls, sessions):
+        """Recompute the labels of the given sessions, and of their tutor sessions, writing only those that changed."""
+        changed = []
+        for session in sessions.select_related('programming_language'):
+            label = session.build_label()
+            if label != session.label:
+                session.label = label
+                changed.append(session)
+        cls.objects.bulk_update(changed, ['label'], batch_size=500)
+        TutorSession.refresh_labels(TutorSession.objects.filter(session__in=[session.pk for session in changed]))
+
+    def __str__(self):
+        return self.label or self.build_label()
+
+
+class Term(models.Model):
+    """A teaching term, which sets the start and end dates of the sessions held in it."""
+
+    season = models.CharField(max_length=20, choices=Session.SEASONS)
+    year = models.PositiveIntegerField(validators=[MinValueValidator(2024)])
+    start_date = models.DateField(help_text="First day of the term")
+    weeks = models.PositiveIntegerField(
+        validators=[MinValueValidator(1)],
+        help_text="Number of teaching weeks in the term"
+    )
+
+    class Meta:
+        ordering = ['year', 'start_date']
+        constraints = [
+            models.UniqueConstraint(fields=['year', 'season'], name='unique_term'),
+        ]
+
+    @property
+    def end_date(self):
+        return calculate_end_date(self.start_date, self.weeks)
+
+    def __str__(self):
+        return f'{self.season} {self.year}'
+
 
 class TutorSession(models.Model):
     tutor = models.ForeignKey(
@@ -243,16 +324,42 @@ class TutorSession(models.Model):
     )
     created_at = models.DateTimeField(auto_now_add=True)
     notes = models.TextField(blank=True, null=True)
+    is_available = models.BooleanField(
+        default=True,
+        help_text="Indicates if the tutor session can take a student; its first enrollment takes it"
+    )
+    label = models.CharField(
+        max_length=400,
+        blank=True,
+        editable=False,
+        help_text="Precomputed display text, kept in sync by save() and the session and user signals"
+    )
 
     class Meta:
         unique_together = ('tutor', 'session') 
 
     def __str__(self):
+        return self.label or self.build_label()
+
+    def build_label(self):
+        """Return the display text of the tutor session."""
         return f'Tutor: {self.tutor.user.full_name()} - Session: {self.session}'
 
+    @classmethod
+    def refresh_labels(cls, tutor_sessions):
+        """Recompute the labels of the given tutor sessions, writing only those that changed."""
+        changed = []
+        for tutor_session in tutor_sessions.select_related('tutor__user', 'session__programming_language'):
+            label = tutor_session.build_label()
+            if label != tutor_session.label:
+                tutor_session.label = label
+                changed.append(tutor_session)
+        cls.objects.bulk_update(changed, ['label'], batch_size=500)
+
     def save(self, *args, **kwargs):
         if not self.pk and TutorSession.objects.filter(tutor=self.tutor, session=self.session).exists():
             raise ValueError(f"A TutorSession already exists for tutor '{self.tutor}' and session '{self.session}'.")
+        self.label = self.build_label()
         super(TutorSession, self).save(*args, **kwargs)
 
 class RequestedStudentSession(models.Model):
@@ -265,6 +372,10 @@ class RequestedStudentSession(models.Model):
     class Meta:
         unique_together = ('student', 'session')
         ordering = ['-requested_at']
+        indexes = [
+            models.Index(fields=['requested_at', 'id'], name='request_requested_at_idx'),
+            models.Index(fields=['is_approved', 'requested_at', 'id'], name='request_pending_idx'),
+        ]
         verbose_name = "Requested Student Session"
         verbose_name_plural = "Requested Student Sessions"
 
@@ -275,15 +386,9 @@ class RequestedStudentSession(models.Model):
         # First save the object to get an ID before setting the ManyToMany field
         super(RequestedStudentSession, self).save(*args, **kwargs)
 
-        # Now assign the ManyToMany relationship
-        tutor_sessions = TutorSession.objects.all()
-        if tutor_sessions:
-            for tutor_session in tutor_sessions:
-                if tutor_session.session.programming_language == self.session.programming_language and tutor_session.session.level == self.session.level and tutor_session.session.season == self.session.season and tutor_session.session.year == self.session.year:
-                    self.available_tutor_sessions.add(tutor_session)
-
-            # Save the object again after updating the ManyToMany field
-            super(RequestedStudentSession, self).save(*args, **kwargs)
+        # Now assign the ManyToMany relationship from a single indexed query
+        from tutorials.matching import match_requested_session
+        match_requested_session(self)
 
     def __str__(self):
         status = "Approved" if self.is_approved else "Pending"
@@ -298,17 +403,69 @@ class StudentSession(models.Model):
 
     class Meta:
         unique_together = ('student', 'tutor_session')
+        indexes = [
+            models.Index(fields=['registered_at', 'id'], name='enrollment_registered_at_idx'),
+            models.Index(fields=['student', 'status'], name='enrollment_student_status_idx'),
+        ]
         verbose_name = "Student Session"
         verbose_name_plural = "Student Sessions"
 
     def save(self, *args, **kwargs):
-        self.tutor_session.session.is_available = False
-        self.tutor_session.session.save()
-        super(StudentSession, self).save(*args, **kwargs)
+        """Save the enrollment, marking its tutor session as taken only when the enrollment is new."""
+        if not self._state.adding:
+            super(StudentSession, self).save(*args, **kwargs)
+            return
+        with transaction.atomic():
+            super(StudentSession, self).save(*args, **kwargs)
+            TutorSession.objects.filter(pk=self.tutor_session_id, is_available=True).update(is_available=False)
+        # Keep a tutor session already loaded through this enrollment in step with its row
+        if StudentSession.tutor_session.is_cached(self):
+            self.tutor_session.is_available = False
 
     def __str__(self):
         return f'{self.student.user.full_name()} -> {self.tutor_session}'
 
+class RateCard(models.Model):
+    """The invoice amount for sessions of a given length, optionally narrowed to a level and a language."""
+
+    duration_hours = models.PositiveIntegerField(
+        validators=[MinValueValidator(1)],
+        help_text="Duration of each session in hours"
+    )
+    level = models.CharField(
+        max_length=20,
+        choices=Session.LEVELS,
+        blank=True,
+        help_text="Leave blank to price every level"
+    )
+    programming_language = models.ForeignKey(
+        ProgrammingLanguage,
+        on_delete=models.CASCADE,
+        related_name='rate_cards',
+        null=True,
+        blank=True,
+        help_text="Leave blank to price every language"
+    )
+    amount = models.DecimalField(max_digits=10, decimal_places=2)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['duration_hours', 'level', 'programming_language'],
+                name='unique_rate_card',
+            ),
+            models.UniqueConstraint(
+                fields=['duration_hours', 'level'],
+                condition=models.Q(programming_language=None),
+                name='unique_rate_card_for_every_language',
+            ),
+        ]
+
+    def __str__(self):
+        language = self.programming_language.name if self.programming_language_id else 'any language'
+        return f'{self.duration_hours}h {self.level or "any level"} {language}: {self.amount}'
+
+
 class Invoice(models.Model):
     PAYMENT_STATUS_CHOICES = [
         ('PENDING', 'Pending'),
@@ -339,31 +496,52 @@ class Invoice(models.Model):
     payment_date = models.DateField(null=True, blank=True)
     notes = models.TextField(blank=True)
     due_date = models.DateField(null=True, blank=True)
+
+    PAYMENT_TERM = timedelta(days=30)
     
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['created_at', 'id'], name='invoice_created_at_idx'),
+            models.Index(fields=['payment_status', 'session'], name='invoice_status_session_idx'),
+            models.Index(fields=['payment_status', 'due_date'], name='invoice_status_due_date_idx'),
+        ]
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        invoice = super().from_db(db, field_names, values)
+        invoice._priced_session_id = invoice.__dict__.get('session_id')
+        return invoice
 
     def save(self, *args, **kwargs):
-        if self.session:
-            session = self.session.tutor_session.session
-            
-            if session.duration_hours <= 1:
-                self.amount = Decimal('30.00')
-            elif session.duration_hours <= 2:
-                self.amount = Decimal('50.00')
+        # Only a new invoice, or one moved to another session, is priced again
+        if self.session_id and (self._state.adding or self.session_id != getattr(self, '_priced_session_id', None)):
+            from tutorials.pricing import price_session
+            amount = price_session(self.session.tutor_session.session)
+            if amount is not None:
+                self.amount = amount
                 
             if not self.due_date:
-                self.due_date = timezone.now().date() + timedelta(days=30)  # Due in 30 days
+                self.due_date = self.default_due_date()
+
+            update_fields = kwargs.get('update_fields')
+            if update_fields is not None:
+                kwargs['update_fields'] = {*update_fields, 'amount', 'due_date'}
                 
         super().save(*args, **kwargs)
+        self._priced_session_id = self.session_id
+
+    @classmethod
+    def default_due_date(cls):
+        """Return the due date of an invoice issued today."""
+        return timezone.now().date() + cls.PAYMENT_TERM
 
     def __str__(self):
         return f"Invoice #{self.id} - {self.session.student.user.get_full_name()} - {self.payment_status}"
 
     def mark_as_paid(self):
-        from django.utils import timezone
         self.payment_status = 'PAID'
         self.payment_date = timezone.now().date()
-        self.save()
+        self.save(update_fields=['payment_status', 'payment_date'])
 
     
\ No newline at end of file
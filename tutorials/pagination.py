@@ -0,0 +1,184 @@
+"""Keyset (cursor) pagination for the admin list pages.
+
+Unlike `django.core.paginator.Paginator`, which counts every row and skips
+to a page with OFFSET, a keyset page is fetched by filtering on the sort key
+of the last row shown, so every page costs the same as the first one.
+"""
+import base64
+import binascii
+import json
+from collections.abc import Sequence
+from datetime import date, time
+from decimal import Decimal
+from functools import reduce
+from operator import or_
+
+from django.db.models import Q
+
+
+class CursorEncoder(json.JSONEncoder):
+    """JSON encoder keeping full precision for the date, time and decimal values of sort keys."""
+
+    def default(self, o):
+        if isinstance(o, (date, time)):
+            return o.isoformat()
+        if isinstance(o, Decimal):
+            return str(o)
+        return super().default(o)
+
+
+class InvalidCursor(Exception):
+    """Raised when a cursor token cannot be decoded for the paginator's ordering."""
+
+
+class KeysetPaginator:
+    """Paginate a queryset by the values of its sort key instead of by offset.
+
+    `ordering` lists the sort fields, each optionally prefixed with '-' for
+    descending order; the primary key is appended as a tie breaker so that
+    every row has a unique position. Sort fields must not be nullable.
+    """
+
+    NEXT = 'n'
+    PREVIOUS = 'p'
+
+    def __init__(self, object_list, per_page, ordering, count_limit=1000):
+        ordering = list(ordering)
+        if not any(field.lstrip('-') in ('pk', 'id') for field in ordering):
+            ordering.append('-pk' if ordering and ordering[-1].startswith('-') else 'pk')
+        self.object_list = object_list
+        self.per_page = per_page
+        self.ordering = ordering
+        self.count_limit = count_limit
+        self._count = None
+
+    @property
+    def count(self):
+        """Return the number of rows, counting at most `count_limit` + 1 of them."""
+
+        if self._count is None:
+            if self.count_limit is None:
+                self._count = self.object_list.count()
+            else:
+                self._count = self.object_list.order_by()[:self.count_limit + 1].count()
+        return self._count
+
+    @property
+    def count_is_estimate(self):
+        """Return True when there are more rows than `count_limit` allows counting."""
+
+        return self.count_limit is not None and self.count > self.count_limit
+
+    @property
+    def num_pages(self):
+        """Return the estimated number of pages."""
+
+        count = min(self.count, self.count_limit) if self.count_is_estimate else self.count
+        return max(1, -(-count // self.per_page))
+
+    def get_page(self, cursor=None):
+        """Return the page a cursor points to, falling back to the first page for invalid cursors."""
+
+        try:
+            direction, values, number = self.decode_cursor(cursor)
+        except InvalidCursor:
+            direction, values, number = self.NEXT, None, 1
+
+        ordering = self.ordering if direction == self.NEXT else [self._reverse(field) for field in self.ordering]
+        queryset = self.object_list.order_by(*ordering)
+        if values is not None:
+            queryset = queryset.filter(self._after(ordering, values))
+        rows = list(queryset[:self.per_page + 1])
+        has_more = len(rows) > self.per_page
+        rows = rows[:self.per_page]
+
+        if direction == self.NEXT:
+            has_previous = values is not None
+            has_next = has_more
+        else:
+            rows.reverse()
+            has_previous = has_more
+            has_next = True
+        if not has_previous:
+            number = 1
+        return KeysetPage(rows, number, self, has_previous, has_next)
+
+    def encode_cursor(self, direction, row, number):
+        values = [self._value(row, field.lstrip('-')) for field in self.ordering]
+        payload = json.dumps([direction, values, number], cls=CursorEncoder, separators=(',', ':'))
+        return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+    def decode_cursor(self, cursor):
+        if not cursor:
+            raise InvalidCursor('No cursor given.')
+        try:
+            padded = cursor + '=' * (-len(cursor) % 4)
+            direction, values, number = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        except (binascii.Error, UnicodeDecodeError, ValueError, TypeError) as error:
+            raise InvalidCursor(f'Malformed cursor {cursor!r}.') from error
+        if direction not in (self.NEXT, self.PREVIOUS) or not isinstance(values, list) \
+                or len(values) != len(self.ordering) or not isinstance(number, int):
+            raise InvalidCursor(f'Cursor {cursor!r} does not match the ordering {self.ordering}.')
+        return direction, values, max(1, number)
+
+    def _after(self, ordering, values):
+        """Return a filter for the rows that sort strictly after `values` in `ordering`."""
+
+        conditions = []
+        for position, field in enumerate(ordering):
+            name = field.lstrip('-')
+            lookup = 'lt' if field.startswith('-') else 'gt'
+            equal = {other.lstrip('-'): value for other, value in zip(ordering[:position], values)}
+            conditions.append(Q(**equal, **{f'{name}__{lookup}': values[position]}))
+        return reduce(or_, conditions)
+
+    @staticmethod
+    def _reverse(field):
+        return field[1:] if field.startswith('-') else f'-{field}'
+
+    @staticmethod
+    def _value(row, field):
+        for attribute in field.split('__'):
+            row = getattr(row, attribute)
+        return row
+
+
+class KeysetPage(Sequence):
+    """A single page of a `KeysetPaginator`, with cursors to its neighbours."""
+
+    def __init__(self, object_list, number, paginator, has_previous, has_next):
+        self.object_list = object_list
+        self.number = number
+        self.paginator = paginator
+        self._has_previous = has_previous
+        self._has_next = has_next
+
+    def __repr__(self):
+        return f'<Page {self.number}>'
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def has_next(self):
+        return self._has_next and bool(self.object_list)
+
+    def has_previous(self):
+        return self._has_previous and bool(self.object_list)
+
+    def has_other_pages(self):
+        return self.has_next() or self.has_previous()
+
+    @property
+    def next_cursor(self):
+        if not self.has_next():
+            return None
+        return self.paginator.encode_cursor(KeysetPaginator.NEXT, self.object_list[-1], self.number + 1)
+
+    @property
+    def previous_cursor(self):
+        if not self.has_previous():
+            return None
+        return self.paginator.encode_cursor(KeysetPaginator.PREVIOUS, self.object_list[0], self.number - 1)
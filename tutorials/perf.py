@@ -0,0 +1,161 @@
+"""Per-request performance instrumentation.
+
+`PerfMiddleware` measures every request: the number and duration of its
+database queries, seen through `connection.execute_wrapper`, the time spent
+rendering templates, timed by the `TimedDjangoTemplates` backend, and the
+total time. It reports them to the browser in a `Server-Timing` header and
+keeps the last `PERF_WINDOW` requests of every URL name in memory, for the
+`/ops/perf/` page. The figures are per process, and reset when it restarts.
+
+Streaming responses are measured up to the moment their first byte is
+ready, so the queries made while the body is streamed are not counted.
+"""
+import threading
+from collections import deque
+from contextlib import ExitStack
+from contextvars import ContextVar
+from time import perf_counter
+
+from django.db import connections
+from django.template.backends.django import DjangoTemplates, Template
+
+
+PERF_WINDOW = 500
+
+# Upper bounds, in milliseconds, of the request time histogram buckets
+PERF_BUCKETS = [10, 25, 50, 100, 250, 500, 1000, 2500]
+
+_current = ContextVar('perf_timings', default=None)
+_lock = threading.Lock()
+_samples = {}
+
+
+class RequestTimings:
+    """The query and template timings of the request being handled."""
+
+    def __init__(self):
+        self.queries = 0
+        self.query_time = 0.0
+        self.template_time = 0.0
+        self.template_depth = 0
+
+    def record_query(self, execute, sql, params, many, context):
+        start = perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries += 1
+            self.query_time += perf_counter() - start
+
+
+class TimedTemplate(Template):
+    """A Django template that adds its render time to the current request's timings."""
+
+    def render(self, context=None, request=None):
+        timings = _current.get()
+        if timings is None:
+            return super().render(context, request)
+        # Templates rendered from within a template are already being timed
+        timings.template_depth += 1
+        start = perf_counter()
+        try:
+            return super().render(context, request)
+        finally:
+            timings.template_depth -= 1
+            if not timings.template_depth:
+                timings.template_time += perf_counter() - start
+
+
+class TimedDjangoTemplates(DjangoTemplates):
+    """The Django template backend, with render times recorded by `PerfMiddleware`."""
+
+    def from_string(self, template_code):
+        return TimedTemplate(self.engine.from_string(template_code), self)
+
+    def get_template(self, template_name):
+        return TimedTemplate(super().get_template(template_name).template, self)
+
+
+class PerfMiddleware:
+    """Time every request, send the timings as a Server-Timing header and record them per URL name."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        timings = RequestTimings()
+        token = _current.set(timings)
+        start = perf_counter()
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(timings.record_query))
+                response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        total_time = perf_counter() - start
+
+        response['Server-Timing'] = ', '.join([
+            f'db;dur={timings.query_time * 1000:.1f};desc="{timings.queries} queries"',
+            f'tpl;dur={timings.template_time * 1000:.1f};desc="Templates"',
+            f'total;dur={total_time * 1000:.1f};desc="Total"',
+        ])
+        match = request.resolver_match
+        record_request(
+            match.view_name if match else '<unresolved>',
+            total_time, timings.query_time, timings.queries, timings.template_time
+        )
+        return response
+
+
+def record_request(url_name, total_time, query_time, queries, template_time):
+    """Add a request, with its times in seconds, to the rolling window of its URL name."""
+
+    with _lock:
+        samples = _samples.get(url_name)
+        if samples is None:
+            samples = _samples[url_name] = deque(maxlen=PERF_WINDOW)
+        samples.append((total_time * 1000, query_time * 1000, queries, template_time * 1000))
+
+
+def reset_perf_stats():
+    """Forget every recorded request."""
+
+    with _lock:
+        _samples.clear()
+
+
+def get_perf_stats():
+    """Return the summary of the recorded requests of every URL name, slowest 95th percentile first.
+
+    Times are in milliseconds. `buckets` holds the number of requests at or
+    under each bound of `PERF_BUCKETS`, followed by the number above the last.
+    """
+
+    with _lock:
+        windows = {url_name: list(samples) for url_name, samples in _samples.items()}
+
+    stats = []
+    for url_name, samples in windows.items():
+        totals = sorted(sample[0] for sample in samples)
+        count = len(samples)
+        buckets = [0] * (len(PERF_BUCKETS) + 1)
+        for total in totals:
+            buckets[next((index for index, bound in enumerate(PERF_BUCKETS) if total <= bound), len(PERF_BUCKETS))] += 1
+        stats.append({
+            'url_name': url_name,
+            'count': count,
+            'p50': _percentile(totals, 50),
+            'p95': _percentile(totals, 95),
+            'max': totals[-1],
+            'mean_queries': sum(sample[2] for sample in samples) / count,
+            'mean_db': sum(sample[1] for sample in samples) / count,
+            'mean_templates': sum(sample[3] for sample in samples) / count,
+            'buckets': buckets,
+        })
+    stats.sort(key=lambda row: row['p95'], reverse=True)
+    return stats
+
+
+def _percentile(ordered, percent):
+    return ordered[min(len(ordered) - 1, len(ordered) * percent // 100)]
@@ -0,0 +1,74 @@
+"""Invoice pricing from the rate card.
+
+The rate card is read once per process into a dictionary and kept until a
+`RateCard` row is saved or deleted, when the signal handlers in
+`tutorials.signals` discard it, and again when that change commits. Other processes pick up a change when they
+restart, so rate changes are meant to be rare, planned events.
+"""
+from decimal import Decimal
+from tutorials.models import RateCard
+
+
+# Prices used when no rate card row matches: (maximum duration in hours, amount)
+DEFAULT_PRICES = [
+    (1, Decimal('30.00')),
+    (2, Decimal('50.00')),
+]
+
+_rates = None
+_generation = 0
+
+
+def get_rates():
+    """Return the rate card as a {(duration_hours, level, programming_language_id): amount} dictionary."""
+
+    global _rates
+    rates = _rates
+    if rates is None:
+        generation = _generation
+        rates = {
+            (duration_hours, level, programming_language_id): amount
+            for duration_hours, level, programming_language_id, amount in RateCard.objects.values_list(
+                'duration_hours', 'level', 'programming_language_id', 'amount'
+            )
+        }
+        # A rate card change during the load leaves the cache empty, so the next call reloads it.
+        if generation == _generation:
+            _rates = rates
+    return rates
+
+
+def invalidate_rates():
+    """Discard the cached rate card."""
+
+    global _rates, _generation
+    _generation += 1
+    _rates = None
+
+
+def price_for(duration_hours, level, programming_language_id):
+    """Return the price of a session, or None when neither the rate card nor the defaults price it.
+
+    The most specific rate card row wins: one for the level and language, then
+    the level alone, then the language alone, then the duration alone.
+    """
+
+    rates = get_rates()
+    for key in [
+        (duration_hours, level, programming_language_id),
+        (duration_hours, level, None),
+        (duration_hours, '', programming_language_id),
+        (duration_hours, '', None),
+    ]:
+        if key in rates:
+            return rates[key]
+    for max_hours, amount in DEFAULT_PRICES:
+        if duration_hours <= max_hours:
+            return amount
+    return None
+
+
+def price_session(session):
+    """Return the price of an invoice for the given session."""
+
+    return price_for(session.duration_hours, session.level, session.programming_language_id)
@@ -0,0 +1,146 @@
+"""Ranked full-text search over users, backed by an SQLite FTS5 table.
+
+`tutorials_user_search` holds one row per user, keyed by the user id, with
+the username, names, the part of the email before the domain and, for
+tutors, the names of the languages they teach. Domains are left out because
+nearly every user would share them. The signal handlers in `tutorials.signals` rewrite a user's row when
+any of those change; commands that bulk insert or raw delete users call
+`rebuild_search_index()` instead.
+
+A search matches every word of the query as a prefix, optionally only among
+the users of one role, and ranks every match by BM25. The role is checked in
+the same query as the match, by joining the user table, so matches of other
+roles never crowd out the ones asked for. On databases other than SQLite
+there is no index, and search falls back to `icontains` lookups.
+"""
+import re
+
+from django.db import connection
+from django.db.models import FloatField, IntegerField, Q, Value
+from django.db.models.expressions import RawSQL
+from tutorials.models import ProgrammingLanguage, Tutor, User
+
+
+SEARCH_TABLE = 'tutorials_user_search'
+SEARCH_BATCH_SIZE = 500
+
+# BM25 weights of the indexed columns: username, first_name, last_name, email, expertise
+SEARCH_WEIGHTS = (10.0, 5.0, 5.0, 2.0, 1.0)
+# User fields copied into the index, also searched with icontains when there is no index
+USER_FIELDS = ['username', 'first_name', 'last_name', 'email']
+
+INDEX_SQL = f"""
+    INSERT INTO {SEARCH_TABLE} (rowid, username, first_name, last_name, email, expertise)
+    SELECT account.id, account.username, account.first_name, account.last_name,
+        CASE WHEN instr(account.email, '@') THEN substr(account.email, 1, instr(account.email, '@') - 1)
+        ELSE account.email END, (
+        SELECT group_concat(language.name, ' ')
+        FROM {Tutor._meta.db_table} tutor
+        JOIN {Tutor.expertise.through._meta.db_table} expertise ON expertise.tutor_id = tutor.id
+        JOIN {ProgrammingLanguage._meta.db_table} language ON language.id = expertise.programminglanguage_id
+        WHERE tutor.user_id = account.id
+    )
+    FROM {User._meta.db_table} account
+"""
+
+
+def is_enabled():
+    """Return True when the database has the full-text index."""
+
+    return connection.vendor == 'sqlite'
+
+
+def match_expression(text):
+    """Return the FTS5 query matching every word of `text` as a prefix, or None when it has no words."""
+
+    words = re.findall(r'\w+', text)
+    if not words:
+        return None
+    return ' '.join(f'"{word}"*' for word in words)
+
+
+def index_users(user_ids):
+    """Rewrite the index rows of the given users, dropping those of users that no longer exist."""
+
+    if not is_enabled():
+        return
+    user_ids = list(user_ids)
+    with connection.cursor() as cursor:
+        for start in range(0, len(user_ids), SEARCH_BATCH_SIZE):
+            batch = user_ids[start:start + SEARCH_BATCH_SIZE]
+            placeholders = ', '.join(['%s'] * len(batch))
+            cursor.execute(f'DELETE FROM {SEARCH_TABLE} WHERE rowid IN ({placeholders})', batch)
+            cursor.execute(f'{INDEX_SQL} WHERE account.id IN ({placeholders})', batch)
+
+
+def rebuild_search_index():
+    """Rebuild the whole index from the user, tutor and expertise tables."""
+
+    if not is_enabled():
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {SEARCH_TABLE}')
+        cursor.execute(INDEX_SQL)
+
+
+def bm25():
+    """Return the SQL of the BM25 score of a match, lower being better."""
+
+    weights = ', '.join(str(weight) for weight in SEARCH_WEIGHTS)
+    return f'bm25({SEARCH_TABLE}, {weights})'
+
+
+def search_user_ids(text, role=None, limit=None):
+    """Return the ids of the users matching `text`, of the given role if any, best match first."""
+
+    expression = match_expression(text)
+    if expression is None:
+        return []
+    sql = f'SELECT {SEARCH_TABLE}.rowid FROM {SEARCH_TABLE}'
+    params = [expression]
+    if role is not None:
+        sql += f' JOIN {User._meta.db_table} account ON account.id = {SEARCH_TABLE}.rowid'
+    sql += f' WHERE {SEARCH_TABLE} MATCH %s'
+    if role is not None:
+        sql += ' AND account.role = %s'
+        params.append(role)
+    sql += f' ORDER BY {bm25()}'
+    if limit is not None:
+        sql += ' LIMIT %s'
+        params.append(limit)
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return [user_id for user_id, in cursor.fetchall()]
+
+
+def search(queryset, text, user_field='pk', role=None):
+    """Narrow `queryset` to the rows whose user matches `text` and, if given, has the role `role`.
+
+    `user_field` is the lookup from the queryset's model to its user. The index
+    is joined into the query itself, so every match is kept for a paginator to
+    walk through, and each row is annotated with its BM25 `search_rank`, lower
+    for better matches, to order by.
+    """
+
+    lookup = '' if user_field == 'pk' else f'{user_field}__'
+    if role is not None:
+        queryset = queryset.filter(**{f'{lookup}role': role})
+    if not is_enabled():
+        conditions = Q()
+        for word in text.split():
+            conditions &= Q(*[Q(**{f'{lookup}{field}__icontains': word}) for field in USER_FIELDS], _connector=Q.OR)
+        return queryset.filter(conditions).annotate(search_rank=Value(0, output_field=IntegerField()))
+
+    expression = match_expression(text)
+    if expression is None:
+        return queryset.none().annotate(search_rank=Value(0.0, output_field=FloatField()))
+    model = queryset.model
+    field = model._meta.pk if user_field == 'pk' else model._meta.get_field(user_field)
+    user_column = f'{connection.ops.quote_name(model._meta.db_table)}.{connection.ops.quote_name(field.column)}'
+    # The unary + keeps SQLite from looking the index up by rowid once per user,
+    # which reruns the prefix match each time, so the match always drives the join.
+    return queryset.extra(
+        tables=[SEARCH_TABLE],
+        where=[f'+{SEARCH_TABLE}.rowid = {user_column}', f'{SEARCH_TABLE} MATCH %s'],
+        params=[expression],
+    ).annotate(search_rank=RawSQL(bm25(), [], output_field=FloatField()))
@@ -0,0 +1,72 @@
+"""Querysets for the list views, each loading the relations its template renders.
+
+Every selector declares the full relation graph its page walks, so rendering a
+page costs a fixed number of queries however many rows it shows. Pages that
+only print a session use its stored label, so they skip the language join.
+"""
+from django.db.models import Prefetch
+from tutorials.models import Invoice, RequestedStudentSession, StudentSession, TutorSession
+
+
+def student_sessions_list():
+    """Return all student sessions with their student, tutor and session."""
+
+    return StudentSession.objects.select_related(
+        'student__user',
+        'tutor_session__tutor__user',
+        'tutor_session__session',
+    ).order_by('-registered_at', '-pk')
+
+
+def invoices_list():
+    """Return all invoices with the student and tutor they were issued for."""
+
+    return Invoice.objects.select_related(
+        'session__student__user',
+        'session__tutor_session__tutor__user',
+    )
+
+
+def pending_requests_list():
+    """Return all pending session requests with their student and session."""
+
+    return RequestedStudentSession.objects.filter(is_approved=False).select_related(
+        'student__user',
+        'session',
+    )
+
+
+def student_enrollments(student):
+    """Return the sessions a student is enrolled in, with their tutor and session."""
+
+    return StudentSession.objects.filter(student=student).select_related(
+        'tutor_session__tutor__user',
+        'tutor_session__session__programming_language',
+    )
+
+
+def student_requested_sessions(student):
+    """Return the sessions a student has requested."""
+
+    return RequestedStudentSession.objects.filter(student=student).select_related(
+        'session__programming_language',
+    )
+
+
+def tutor_sessions_with_students(tutor):
+    """Return the sessions a tutor teaches, with the students enrolled in each."""
+
+    return TutorSession.objects.filter(tutor=tutor).select_related(
+        'session__programming_language',
+    ).prefetch_related(
+        Prefetch('student_sessions', queryset=StudentSession.objects.select_related('student__user')),
+    )
+
+
+def student_pending_invoices(student):
+    """Return a student's unpaid invoices, pending or overdue, with the tutor session they are for."""
+
+    return Invoice.objects.filter(session__student=student, payment_status__in=['PENDING', 'OVERDUE']).select_related(
+        'session__tutor_session__tutor__user',
+        'session__tutor_session__session',
+    )
@@ -0,0 +1,290 @@
+"""Write operations that span several models, each run in a single transaction.
+
+The services lock the rows they depend on with SELECT ... FOR UPDATE, so two
+admins acting on the same request at once cannot both succeed, and they write
+with bulk statements instead of calling save() on every object.
+"""
+from decimal import Decimal
+
+from django.core.exceptions import ValidationError
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+from tutorials.assignment import available_tutor_sessions, pending_requests, plan_assignments, tutor_loads
+from tutorials.helpers import invalidate_admin_statistics
+from tutorials.models import (
+    Admin, Invoice, RequestedStudentSession, Student, StudentSession, Tutor, TutorSession, User
+)
+from tutorials.pricing import price_for
+from tutorials.search import index_users
+
+
+APPROVAL_BATCH_SIZE = 500
+BILLING_BATCH_SIZE = 500
+IMPORT_BATCH_SIZE = 500
+
+# The profile model created for a user of each role
+PROFILE_MODELS = {
+    User.Roles.STUDENT: Student,
+    User.Roles.TUTOR: Tutor,
+    User.Roles.ADMIN: Admin,
+}
+
+
+def approve_session(request_id, tutor_session_id):
+    """Enroll the student of a pending request in a tutor session and remove the request.
+
+    Raises RequestedStudentSession.DoesNotExist when the request is missing or was
+    approved concurrently, TutorSession.DoesNotExist when the tutor session is missing,
+    and ValidationError when the tutor session is already taken or the student is
+    already enrolled in it.
+    """
+
+    with transaction.atomic():
+        student_id = RequestedStudentSession.objects.select_for_update().filter(
+            pk=request_id, is_approved=False
+        ).values_list('student_id', flat=True).first()
+        if student_id is None:
+            raise RequestedStudentSession.DoesNotExist(f"Could not find session request with primary key {request_id}")
+
+        # Locking the tutor session makes a concurrent approval for the same slot wait, then see it taken
+        is_available = TutorSession.objects.select_for_update().filter(
+            pk=tutor_session_id
+        ).values_list('is_available', flat=True).first()
+        if is_available is None:
+            raise TutorSession.DoesNotExist(f"Could not find tutor session with primary key {tutor_session_id}")
+        if not is_available:
+            raise ValidationError("This tutor session has already been taken.")
+
+        student_session = StudentSession(student_id=student_id, tutor_session_id=tutor_session_id)
+        try:
+            _enroll([student_session], [request_id])
+        except IntegrityError:
+            raise ValidationError("The student is already enrolled in this tutor session.")
+    return student_session
+
+
+def approve_sessions(request_ids):
+    """Approve many pending requests at once, each with the first available tutor session it matches.
+
+    Every request is given a tutor session that is still available and not
+    taken by another request of the same batch. Returns the created student
+    sessions and the ids of the requests that could not be approved. The
+    candidate tutor sessions are locked while the slots are chosen.
+    """
+
+    request_ids = list(dict.fromkeys(request_ids))
+    with transaction.atomic():
+        students = dict(
+            RequestedStudentSession.objects.select_for_update().filter(
+                pk__in=request_ids, is_approved=False
+            ).values_list('pk', 'student_id')
+        )
+        through = RequestedStudentSession.available_tutor_sessions.through
+        matches = list(
+            through.objects.filter(requestedstudentsession_id__in=students)
+            .order_by('tutorsession__created_at', 'tutorsession_id')
+            .values_list('requestedstudentsession_id', 'tutorsession_id')
+        )
+        # Locking the available tutor sessions keeps a concurrent approval from taking one before it is enrolled
+        available = set(
+            TutorSession.objects.select_for_update().filter(
+                pk__in={tutor_session_id for _, tutor_session_id in matches}, is_available=True
+            ).order_by('pk').values_list('pk', flat=True)
+        )
+        candidates = {}
+        for request_id, tutor_session_id in matches:
+            if tutor_session_id in available:
+                candidates.setdefault(request_id, []).append(tutor_session_id)
+
+        enrolled = set(
+            StudentSession.objects.filter(student_id__in=students.values()).values_list('student_id', 'tutor_session_id')
+        )
+        taken = set()
+        student_sessions = []
+        approved = []
+        for request_id in request_ids:
+            student_id = students.get(request_id)
+            for tutor_session_id in candidates.get(request_id, []):
+                if tutor_session_id in taken or (student_id, tutor_session_id) in enrolled:
+                    continue
+                taken.add(tutor_session_id)
+                enrolled.add((student_id, tutor_session_id))
+                student_sessions.append(StudentSession(student_id=student_id, tutor_session_id=tutor_session_id))
+                approved.append(request_id)
+                break
+
+        _enroll(student_sessions, approved)
+    approved = set(approved)
+    skipped = [request_id for request_id in request_ids if request_id not in approved]
+    return student_sessions, skipped
+
+
+def assign_pending_requests(tutor_capacity=None, dry_run=False):
+    """Assign as many pending requests as possible to available tutor sessions at once.
+
+    The requests and tutor sessions are loaded in a few queries and assigned by
+    `tutorials.assignment.plan_assignments`; `tutor_capacity` limits the
+    enrollments of every tutor. Unless this is a dry run, the requests and tutor
+    sessions stay locked until the enrollments are written in bulk. Returns the
+    student sessions, which are unsaved in a dry run, and the
+    (pk, student_id, session_id, key) rows of the requests left unassigned.
+    """
+
+    with transaction.atomic():
+        requests = pending_requests(lock=not dry_run)
+        loads = tutor_loads() if tutor_capacity is not None else {}
+        tutor_sessions = available_tutor_sessions(lock=not dry_run)
+        assignments, unassigned = plan_assignments(requests, tutor_sessions, tutor_capacity, loads)
+        student_sessions = [
+            StudentSession(student_id=request[1], tutor_session_id=tutor_session[0])
+            for request, tutor_session in assignments
+        ]
+        if not dry_run:
+            for start in range(0, len(assignments), APPROVAL_BATCH_SIZE):
+                batch = assignments[start:start + APPROVAL_BATCH_SIZE]
+                _enroll(student_sessions[start:start + APPROVAL_BATCH_SIZE], [request[0] for request, _ in batch])
+    return student_sessions, unassigned
+
+
+def _enroll(student_sessions, request_ids):
+    """Mark the tutor sessions unavailable, insert the enrollments and delete the approved requests.
+
+    Raises ValidationError, before writing any enrollment, when one of the tutor
+    sessions was already taken or two enrollments share one.
+    """
+
+    if not student_sessions:
+        return
+    # bulk_create skips StudentSession.save(), so the tutor sessions are taken in one statement, which
+    # only changes the ones still available
+    tutor_session_ids = {student_session.tutor_session_id for student_session in student_sessions}
+    taken = TutorSession.objects.filter(pk__in=tutor_session_ids, is_available=True).update(is_available=False)
+    if taken != len(student_sessions):
+        raise ValidationError("A tutor session has already been taken.")
+    StudentSession.objects.bulk_create(student_sessions, batch_size=APPROVAL_BATCH_SIZE)
+    RequestedStudentSession.objects.filter(pk__in=request_ids).delete()
+
+
+def send_invoices(student_sessions=None):
+    """Invoice every student session awaiting an invoice and mark it as pending payment.
+
+    `student_sessions` narrows the run to a queryset of student sessions. The
+    eligible sessions are read with their pricing fields in one query and the
+    invoices are priced from the cached rate card, so no session is loaded as an object. Sessions
+    are moved out of 'Send Invoice' in the same transaction, which makes the run
+    safe to repeat. Returns the created invoices.
+    """
+
+    if student_sessions is None:
+        student_sessions = StudentSession.objects.all()
+    with transaction.atomic():
+        eligible = list(
+            student_sessions.select_for_update(of=('self',)).filter(status='Send Invoice')
+            .values_list(
+                'pk',
+                'tutor_session__session__duration_hours',
+                'tutor_session__session__level',
+                'tutor_session__session__programming_language_id',
+            )
+        )
+        due_date = Invoice.default_due_date()
+        invoices = [
+            Invoice(
+                session_id=student_session_id,
+                amount=price_for(duration_hours, level, programming_language_id) or Decimal('0.00'),
+                due_date=due_date,
+            )
+            for student_session_id, duration_hours, level, programming_language_id in eligible
+        ]
+        Invoice.objects.bulk_create(invoices, batch_size=BILLING_BATCH_SIZE)
+        student_session_ids = [row[0] for row in eligible]
+        for start in range(0, len(student_session_ids), BILLING_BATCH_SIZE):
+            StudentSession.objects.filter(
+                pk__in=student_session_ids[start:start + BILLING_BATCH_SIZE], status='Send Invoice'
+            ).update(status='Payment Pending')
+
+    if invoices:
+        # Bulk inserts do not send the signals that keep the cached statistics fresh.
+        invalidate_admin_statistics()
+    return invoices
+
+
+def mark_overdue_invoices(today=None):
+    """Move every pending invoice whose due date has passed to OVERDUE with one UPDATE.
+
+    Returns the number of invoices moved.
+    """
+
+    today = today or timezone.now().date()
+    count = Invoice.objects.filter(payment_status='PENDING', due_date__lt=today).update(payment_status='OVERDUE')
+    if count:
+        # Bulk updates do not send the signals that keep the cached counts fresh.
+        invalidate_admin_statistics()
+    return count
+
+
+def build_user(username, first_name, last_name, email, role, password=None, password_hash=None):
+    """Return an unsaved user with the role, gravatar hash and password set, so inserting it is its only write.
+
+    `password_hash` is a password already hashed by Django, stored as it is.
+    Without either password the user is left with an unusable password.
+    """
+
+    email = User.objects.normalize_email(email)
+    user = User(
+        username=User.normalize_username(username),
+        first_name=first_name,
+        last_name=last_name,
+        email=email,
+        role=role,
+        gravatar_hash=User.hash_email(email),
+    )
+    if password_hash is not None:
+        user.password = password_hash
+    else:
+        user.set_password(password)
+    return user
+
+
+def register_user(user, expertise=()):
+    """Insert a user from `build_user` with the profile of their role and, for tutors, their expertise.
+
+    Each row is written once, in a single transaction.
+    """
+
+    with transaction.atomic():
+        user.save()
+        profile = PROFILE_MODELS[user.role].objects.create(user=user)
+        if expertise:
+            profile.expertise.set(expertise)
+    return user
+
+
+def import_users(users, expertise=None):
+    """Insert many users from `build_user` with their profiles and tutor expertise in bulk, in one transaction.
+
+    `expertise` maps usernames of tutors to the ids of the languages they teach.
+    Bulk inserts send no signals, so the search index and the admin statistics
+    are refreshed here. Returns the inserted users.
+    """
+
+    expertise = expertise or {}
+    with transaction.atomic():
+        users = User.objects.bulk_create(users, batch_size=IMPORT_BATCH_SIZE)
+        profiles = {}
+        for role, model in PROFILE_MODELS.items():
+            profiles[role] = model.objects.bulk_create(
+                [model(user=user) for user in users if user.role == role], batch_size=IMPORT_BATCH_SIZE
+            )
+        through = Tutor.expertise.through
+        through.objects.bulk_create(
+            [
+                through(tutor_id=tutor.pk, programminglanguage_id=language_id)
+                for tutor in profiles[User.Roles.TUTOR]
+                for language_id in expertise.get(tutor.user.username, ())
+            ],
+            batch_size=IMPORT_BATCH_SIZE,
+        )
+        index_users(user.pk for user in users)
+    invalidate_admin_statistics()
+    return users
@@ -0,0 +1,189 @@
+"""Signal handlers for the tutorials app."""
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
+from django.dispatch import receiver
+from tutorials.helpers import invalidate_admin_statistics
+from tutorials.languages import invalidate_languages
+from tutorials.matching import MATCH_FIELDS, match_tutor_session, rematch_session
+from tutorials.models import (
+    Invoice, ProgrammingLanguage, RateCard, RequestedStudentSession, Session, StudentSession, Term, Tutor, TutorSession, User
+)
+from tutorials.pricing import invalidate_rates
+from tutorials.search import USER_FIELDS, index_users
+from tutorials.terms import invalidate_terms
+
+
+@receiver(post_save, sender=TutorSession)
+def update_tutor_session_matches(sender, instance, raw=False, **kwargs):
+    """Offer a new or changed tutor session to the pending requests it matches."""
+
+    if raw:
+        return
+    match_tutor_session(instance)
+
+
+@receiver(post_save, sender=Session)
+def update_session_matches(sender, instance, created=False, raw=False, update_fields=None, **kwargs):
+    """Rematch the tutor sessions and requests of a session whose matching fields may have changed."""
+
+    if raw or created:
+        return
+    if update_fields is not None and not MATCH_FIELDS.intersection(update_fields):
+        return
+    rematch_session(instance)
+
+
+@receiver(post_delete, sender=StudentSession)
+def release_session(sender, instance, **kwargs):
+    """Make a tutor session available again once its last enrollment is removed."""
+
+    TutorSession.objects.filter(pk=instance.tutor_session_id, is_available=False).exclude(
+        student_sessions__isnull=False
+    ).update(is_available=True)
+
+
+@receiver(post_save, sender=ProgrammingLanguage)
+def update_language_labels(sender, instance, created=False, raw=False, **kwargs):
+    """Refresh the display labels of the sessions of a renamed language."""
+
+    if raw or created:
+        return
+    Session.refresh_labels(Session.objects.filter(programming_language=instance))
+
+
+@receiver(post_save, sender=User)
+def update_tutor_labels(sender, instance, created=False, raw=False, update_fields=None, **kwargs):
+    """Refresh the display labels of the tutor sessions of a tutor whose name may have changed."""
+
+    if raw or created or instance.role != User.Roles.TUTOR:
+        return
+    if update_fields is not None and not {'first_name', 'last_name'}.intersection(update_fields):
+        return
+    TutorSession.refresh_labels(TutorSession.objects.filter(tutor__user=instance))
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_user_statistics(sender, created=False, update_fields=None, **kwargs):
+    """Discard the admin statistics when a user is added, removed or changes role."""
+
+    if created or update_fields is None or 'role' in update_fields:
+        invalidate_admin_statistics()
+
+
+@receiver(post_save, sender=RequestedStudentSession)
+@receiver(post_delete, sender=RequestedStudentSession)
+@receiver(post_save, sender=Invoice)
+@receiver(post_delete, sender=Invoice)
+@receiver(post_save, sender=Session)
+@receiver(post_delete, sender=Session)
+@receiver(post_save, sender=ProgrammingLanguage)
+@receiver(post_delete, sender=ProgrammingLanguage)
+def invalidate_statistics(sender, **kwargs):
+    """Discard the admin statistics when a counted row changes."""
+
+    invalidate_admin_statistics()
+
+
+@receiver(post_save, sender=RateCard)
+@receiver(post_delete, sender=RateCard)
+def invalidate_rate_card(sender, **kwargs):
+    """Discard the cached rate card when a rate changes."""
+
+    _invalidate_now_and_on_commit(invalidate_rates)
+
+
+@receiver(post_save, sender=Term)
+@receiver(post_delete, sender=Term)
+def invalidate_term_calendar(sender, **kwargs):
+    """Discard the cached term calendar when a term changes."""
+
+    _invalidate_now_and_on_commit(invalidate_terms)
+
+
+@receiver(post_save, sender=Term)
+def update_term_sessions(sender, instance, raw=False, **kwargs):
+    """Move the sessions of a changed term to its dates and refresh their display labels."""
+
+    if raw:
+        return
+    sessions = Session.objects.filter(year=instance.year, season=instance.season)
+    sessions.exclude(start_day=instance.start_date, end_day=instance.end_date).update(
+        start_day=instance.start_date, end_day=instance.end_date
+    )
+    Session.refresh_labels(sessions)
+
+
+@receiver(post_save, sender=ProgrammingLanguage)
+@receiver(post_delete, sender=ProgrammingLanguage)
+def invalidate_language_registry(sender, **kwargs):
+    """Discard the cached languages when a language changes."""
+
+    _invalidate_now_and_on_commit(invalidate_languages)
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def update_user_search(sender, instance, update_fields=None, **kwargs):
+    """Rewrite the search index row of a user whose searchable fields may have changed."""
+
+    # Raw saves are indexed too, so that users loaded from fixtures can be found
+    if update_fields is not None and not set(USER_FIELDS).intersection(update_fields):
+        return
+    index_users([instance.pk])
+
+
+@receiver(post_delete, sender=Tutor)
+def update_tutor_search(sender, instance, **kwargs):
+    """Drop the expertise of a removed tutor from the search index."""
+
+    index_users([instance.user_id])
+
+
+@receiver(m2m_changed, sender=Tutor.expertise.through)
+def update_expertise_search(sender, instance, action, reverse, pk_set=None, **kwargs):
+    """Reindex the tutors whose expertise changed, from either side of the relation."""
+
+    if not reverse:
+        if action in ('post_add', 'post_remove', 'post_clear'):
+            index_users([instance.user_id])
+    elif action == 'pre_clear':
+        instance._search_user_ids = list(instance.tutors.values_list('user_id', flat=True))
+    elif action == 'post_clear':
+        index_users(instance.__dict__.pop('_search_user_ids', []))
+    elif action in ('post_add', 'post_remove'):
+        index_users(Tutor.objects.filter(pk__in=pk_set).values_list('user_id', flat=True))
+
+
+@receiver(post_save, sender=ProgrammingLanguage)
+def update_language_search(sender, instance, created=False, raw=False, **kwargs):
+    """Reindex the tutors of a renamed language."""
+
+    if raw or created:
+        return
+    index_users(instance.tutors.values_list('user_id', flat=True))
+
+
+@receiver(pre_delete, sender=ProgrammingLanguage)
+def remember_language_tutors(sender, instance, **kwargs):
+    """Note the tutors of a language before its expertise rows are deleted with it."""
+
+    instance._search_user_ids = list(instance.tutors.values_list('user_id', flat=True))
+
+
+@receiver(post_delete, sender=ProgrammingLanguage)
+def update_deleted_language_search(sender, instance, **kwargs):
+    """Reindex the former tutors of a deleted language."""
+
+    index_users(instance.__dict__.pop('_search_user_ids', []))
+
+
+def _invalidate_now_and_on_commit(invalidate):
+    """Discard a cache for the rest of the transaction and again once it commits.
+
+    A request on another connection that reloads the cache before the commit
+    still reads the old rows, so only the second call leaves it fresh.
+    """
+
+    invalidate()
+    transaction.on_commit(invalidate)
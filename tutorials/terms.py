@@ -0,0 +1,51 @@
+"""The term calendar, which gives every session its start and end dates.
+
+The calendar is read once per process into a read-only mapping and kept until
+a `Term` row is saved or deleted, when the signal handlers in
+`tutorials.signals` discard it, and again when that change commits. Looking up a term is then a dictionary access
+with no query. Other processes pick up a change when they restart, so new
+terms should be added before sessions are offered in them.
+"""
+from types import MappingProxyType
+from tutorials.models import Term
+
+
+_terms = None
+_generation = 0
+
+
+def get_terms():
+    """Return the calendar as a read-only {(year, season): (start_date, end_date)} mapping."""
+
+    global _terms
+    terms = _terms
+    if terms is None:
+        generation = _generation
+        terms = MappingProxyType({
+            (term.year, term.season): (term.start_date, term.end_date)
+            for term in Term.objects.all()
+        })
+        # A calendar change during the load leaves the cache empty, so the next call reloads it.
+        if generation == _generation:
+            _terms = terms
+    return terms
+
+
+def invalidate_terms():
+    """Discard the cached calendar."""
+
+    global _terms, _generation
+    _generation += 1
+    _terms = None
+
+
+def term_dates(year, season):
+    """Return the (start_date, end_date) of a term, or None when it is not scheduled."""
+
+    return get_terms().get((year, season))
+
+
+def term_years():
+    """Return the years that have at least one scheduled term, in order."""
+
+    return sorted({year for year, _ in get_terms()})
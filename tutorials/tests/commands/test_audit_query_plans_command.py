@@ -0,0 +1,48 @@
+from contextlib import redirect_stdout
+from io import StringIO
+from unittest.mock import patch
+from django.core.management import CommandError, call_command
+from django.test import TestCase
+from tutorials.helpers import invalidate_admin_statistics
+from tutorials.languages import invalidate_languages
+from tutorials.management.commands.audit_query_plans import Command
+from tutorials.models import RequestedStudentSession, User
+
+class AuditQueryPlansCommandTestCase(TestCase):
+    """Tests of the audit_query_plans management command."""
+
+    def setUp(self):
+        for invalidate in [invalidate_languages, invalidate_admin_statistics]:
+            invalidate()
+            self.addCleanup(invalidate)
+        with redirect_stdout(StringIO()):
+            call_command('seed', scale=30)
+
+    def test_view_queries_use_indexes(self):
+        output = self._audit()
+        self.assertNotIn('FULL SCAN', output)
+        self.assertIn('0 of the audited queries scan a whole table.', output)
+
+    def test_unindexed_query_is_reported(self):
+        view_queries = Command.view_queries
+
+        # Last names are not indexed, and without an ordering no index can even be walked
+        def with_unindexed_query(command, *args):
+            return view_queries(command, *args) + [('unindexed', User.objects.filter(last_name='Doe').order_by())]
+
+        with patch.object(Command, 'view_queries', with_unindexed_query):
+            output = self._audit()
+            with self.assertRaises(CommandError):
+                self._audit(fail_on_scan=True)
+        self.assertRegex(output, r'unindexed\s+.*FULL SCAN.*tutorials_user')
+        self.assertIn('1 of the audited queries scan a whole table.', output)
+
+    def test_empty_database_is_refused(self):
+        RequestedStudentSession.objects.all().delete()
+        with self.assertRaises(CommandError):
+            self._audit()
+
+    def _audit(self, **options):
+        stdout = StringIO()
+        call_command('audit_query_plans', stdout=stdout, no_color=True, **options)
+        return stdout.getvalue()
@@ -0,0 +1,59 @@
+import json
+from contextlib import redirect_stdout
+import os
+from io import StringIO
+from tempfile import TemporaryDirectory
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+from tutorials.helpers import invalidate_admin_statistics
+from tutorials.languages import invalidate_languages
+from tutorials.management.commands.load_benchmark import ROUTES
+from tutorials.pricing import invalidate_rates
+from tutorials.terms import invalidate_terms
+
+class LoadBenchmarkCommandTestCase(TestCase):
+    """Tests of the load_benchmark management command."""
+
+    def setUp(self):
+        # The cached languages, terms, rates and statistics outlive the test transaction
+        for invalidate in [invalidate_languages, invalidate_terms, invalidate_rates, invalidate_admin_statistics]:
+            invalidate()
+            self.addCleanup(invalidate)
+        directory = TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.output = os.path.join(directory.name, 'baseline.json')
+
+    def test_small_load_has_no_errors(self):
+        stdout = self._call(scale=4, workers=2, requests=2)
+        with open(self.output, encoding='utf-8') as output:
+            baseline = json.load(output)
+
+        self.assertEqual(len(baseline['routes']), len(ROUTES))
+        self.assertEqual(baseline['requests_per_route'], 4)
+        self.assertEqual(baseline['total_requests'], 4 * len(ROUTES))
+        for label, route in baseline['routes'].items():
+            self.assertEqual(route['errors'], 0, f"{label} returned errors")
+            self.assertEqual(route['requests'], 4)
+            self.assertLessEqual(route['p50_ms'], route['p95_ms'])
+            self.assertLessEqual(route['p95_ms'], route['p99_ms'])
+
+        self.assertIn('dashboard[admin]', stdout)
+        self.assertIn(f"{4 * len(ROUTES)} requests in", stdout)
+        self.assertIn('across 2 workers', stdout)
+        self.assertIn(f"Saved the baseline to {self.output}.", stdout)
+
+    def test_empty_database_is_refused(self):
+        with self.assertRaises(CommandError):
+            self._call(skip_seed=True)
+
+    def test_workers_and_requests_must_be_positive(self):
+        with self.assertRaises(CommandError):
+            self._call(skip_seed=True, workers=0)
+
+    def _call(self, **options):
+        stdout = StringIO()
+        # seed prints its progress instead of writing to the command's stdout
+        with open(os.devnull, 'w') as devnull, redirect_stdout(devnull):
+            call_command('load_benchmark', output=self.output, stdout=stdout, stderr=StringIO(), **options)
+        return stdout.getvalue()
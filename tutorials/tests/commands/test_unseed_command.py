@@ -0,0 +1,54 @@
+from contextlib import redirect_stdout
+from decimal import Decimal
+from io import StringIO
+from django.core.management import call_command
+from django.test import TestCase
+from tutorials.helpers import invalidate_admin_statistics
+from tutorials.languages import invalidate_languages
+from tutorials.models import ProgrammingLanguage, RateCard, Session, Term, Tutor, TutorSession, User
+from tutorials.pricing import invalidate_rates
+from tutorials.terms import invalidate_terms
+
+class UnseedCommandTestCase(TestCase):
+    """Tests of the unseed management command."""
+
+    def setUp(self):
+        # The cached languages, terms, rates and statistics outlive the test transaction
+        for invalidate in [invalidate_languages, invalidate_terms, invalidate_rates, invalidate_admin_statistics]:
+            invalidate()
+            self.addCleanup(invalidate)
+        self.term_count = Term.objects.count()
+        RateCard.objects.create(duration_hours=3, amount=Decimal('70.00'))
+        self._call('seed', scale=3)
+
+    def test_truncate_keeps_the_reference_tables(self):
+        self._call('unseed', truncate=True)
+        self.assertFalse(User.objects.exists())
+        self.assertFalse(Session.objects.exists())
+        self.assertEqual(Term.objects.count(), self.term_count)
+        self.assertEqual(RateCard.objects.count(), 1)
+        self.assertEqual(ProgrammingLanguage.objects.count(), len(ProgrammingLanguage.LANGUAGES))
+
+    def test_unseed_keeps_the_reference_tables(self):
+        RateCard.objects.create(
+            duration_hours=3, programming_language=ProgrammingLanguage.objects.first(), amount=Decimal('80.00')
+        )
+        self._call('unseed')
+        self.assertFalse(Session.objects.exists())
+        self.assertFalse(Tutor.objects.exists())
+        self.assertEqual(Term.objects.count(), self.term_count)
+        self.assertEqual(RateCard.objects.count(), 2)
+        self.assertEqual(ProgrammingLanguage.objects.count(), len(ProgrammingLanguage.LANGUAGES))
+
+    def test_seed_runs_after_truncate(self):
+        self._call('unseed', truncate=True)
+        # seed usually runs in a new process, which reads the term calendar from the database
+        invalidate_terms()
+        self._call('seed', scale=3)
+        self.assertTrue(User.objects.filter(username='@johndoe').exists())
+        self.assertTrue(Tutor.objects.exists())
+        self.assertTrue(TutorSession.objects.exists())
+
+    def _call(self, *args, **options):
+        with redirect_stdout(StringIO()):
+            call_command(*args, **options)
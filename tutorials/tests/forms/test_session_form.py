@@ -1,10 +1,13 @@
 from django.test import TestCase
-from tutorials.models import ProgrammingLanguage, Session
+from tutorials.languages import invalidate_languages
+from tutorials.models import ProgrammingLanguage, Session, Term
+from tutorials.terms import invalidate_terms
 from tutorials.forms import SessionForm
-from datetime import datetime
+from datetime import date, datetime
 
 class SessionFormTest(TestCase):
     def setUp(self):
+        self.addCleanup(invalidate_languages)
         self.language = ProgrammingLanguage.objects.create(name="Python")
         self.valid_data = {
             "programming_language": self.language.id,
@@ -38,3 +41,57 @@ class SessionFormTest(TestCase):
         self.assertTrue(form.is_valid())
         session = form.save()
         self.assertEqual(session.end_day, datetime(2024, 12, 13).date())
+
+    def test_save_creates_a_new_catalog_session(self):
+        form = SessionForm(data=self.valid_data)
+        self.assertTrue(form.is_valid())
+        session = form.save()
+        self.assertEqual(Session.objects.get(), session)
+
+    def test_save_reuses_an_existing_catalog_session(self):
+        existing = SessionForm(data=self.valid_data)
+        self.assertTrue(existing.is_valid())
+        session = existing.save()
+        form = SessionForm(data=self.valid_data)
+        self.assertTrue(form.is_valid())
+        self.assertEqual(form.save(), session)
+        self.assertEqual(Session.objects.count(), 1)
+
+    def test_save_returns_the_session_created_after_validation(self):
+        form = SessionForm(data=self.valid_data)
+        self.assertTrue(form.is_valid())
+        session = Session.objects.create(
+            programming_language=self.language,
+            level="beginner",
+            season="Fall",
+            year=2024,
+            frequency="Weekly",
+            duration_hours=2,
+        )
+        self.assertEqual(form.save(), session)
+        self.assertEqual(Session.objects.count(), 1)
+
+    def test_year_choices_follow_the_term_calendar(self):
+        self.addCleanup(invalidate_terms)
+        Term.objects.create(season="Fall", year=2027, start_date=date(2027, 9, 13), weeks=12)
+        data = self.valid_data.copy()
+        data["year"] = 2027
+        form = SessionForm(data=data)
+        self.assertIn((2027, "2027"), form.fields["year"].choices)
+        self.assertTrue(form.is_valid())
+        self.assertEqual(form.save().start_day, date(2027, 9, 13))
+
+    def test_unknown_language_is_rejected(self):
+        invalid_data = self.valid_data.copy()
+        invalid_data["programming_language"] = self.language.id + 1
+        form = SessionForm(data=invalid_data)
+        self.assertFalse(form.is_valid())
+        self.assertIn("programming_language", form.errors)
+
+    def test_language_choices_do_not_query_once_loaded(self):
+        SessionForm().as_p()
+        with self.assertNumQueries(0):
+            form = SessionForm()
+            form.as_p()
+            self.assertEqual(form.fields["programming_language"].clean(str(self.language.id)), self.language)
+        self.assertEqual(list(form.fields["programming_language"].choices), [("", "---------"), (self.language.id, "Python")])
@@ -1,8 +1,11 @@
 """Unit tests of the sign up form."""
 from django.contrib.auth.hashers import check_password
 from django import forms
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from tutorials.forms import SignUpForm
+from tutorials.languages import invalidate_languages
 from tutorials.models import User, ProgrammingLanguage
 
 class SignUpFormTestCase(TestCase):
@@ -109,3 +112,32 @@ class SignUpFormTestCase(TestCase):
         is_password_correct = check_password('Password123', user.password)
         self.assertTrue(is_password_correct)
         self.assertEqual(user.role, User.Roles.TUTOR)
+
+    def test_form_rejects_unknown_expertise(self):
+        self.form_input['role'] = User.Roles.TUTOR
+        self.form_input['expertise'] = [self.language.id, self.language.id + 1]
+        form = SignUpForm(data=self.form_input)
+        self.assertFalse(form.is_valid())
+        self.assertIn('expertise', form.errors)
+
+    def test_expertise_choices_do_not_query_once_loaded(self):
+        self.addCleanup(invalidate_languages)
+        self.form_input['role'] = User.Roles.TUTOR
+        self.form_input['expertise'] = [self.language.id]
+        SignUpForm().as_p()
+        form = SignUpForm(data=self.form_input)
+        self.assertTrue(form.is_valid())
+        with self.assertNumQueries(0):
+            form.as_p()
+            self.assertEqual(form.fields['expertise'].clean([str(self.language.id)]), [self.language])
+            self.assertEqual(form.fields['expertise'].clean([]), [])
+
+    def test_form_writes_the_new_user_row_once(self):
+        self.form_input['role'] = User.Roles.TUTOR
+        self.form_input['expertise'] = [self.language.id]
+        form = SignUpForm(data=self.form_input)
+        self.assertTrue(form.is_valid())
+        with CaptureQueriesContext(connection) as queries:
+            user = form.save()
+        self.assertFalse([query for query in queries if query['sql'].startswith('UPDATE "tutorials_user"')])
+        self.assertEqual(user.tutor_profile.expertise_list(), 'Python')
@@ -0,0 +1,164 @@
+from itertools import product
+from django.core.exceptions import ValidationError
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from tutorials.models import User, Student, Tutor, Session, TutorSession, StudentSession, ProgrammingLanguage, RequestedStudentSession
+from tutorials.services import _enroll, approve_session, approve_sessions
+
+class TestApprovalServices(TestCase):
+    """Tests for the approve_session and approve_sessions services."""
+
+    fixtures = [
+        'tutorials/tests/fixtures/default_user.json',
+        'tutorials/tests/fixtures/other_users.json'
+    ]
+
+    def setUp(self):
+        self.student = Student.objects.create(user=User.objects.get(username='@janedoe'))
+        self.tutor = Tutor.objects.create(user=User.objects.get(username='@petrapickles'))
+        self.other_tutor = Tutor.objects.create(user=User.objects.get(username='@peterpickles'))
+        self.language = ProgrammingLanguage.objects.create(name='Python')
+        self.session = self._create_session('Weekly')
+        self.other_session = self._create_session('Bi-Weekly')
+        self.tutor_session = TutorSession.objects.create(tutor=self.tutor, session=self.session)
+        self.requested_session = RequestedStudentSession.objects.create(student=self.student, session=self.session)
+        self.catalog_keys = product(['beginner', 'intermediate', 'advanced'], ['Fall', 'Spring', 'Summer'], [2024, 2025, 2026])
+
+    def test_approve_session_enrolls_the_student(self):
+        student_session = approve_session(self.requested_session.pk, self.tutor_session.pk)
+        self.assertEqual(student_session.student, self.student)
+        self.assertEqual(student_session.tutor_session, self.tutor_session)
+        self.assertFalse(TutorSession.objects.get(pk=self.tutor_session.pk).is_available)
+        self.assertFalse(RequestedStudentSession.objects.filter(pk=self.requested_session.pk).exists())
+
+    def test_approve_session_does_not_rewrite_the_tutor_session(self):
+        with CaptureQueriesContext(connection) as queries:
+            approve_session(self.requested_session.pk, self.tutor_session.pk)
+        session_writes = [query['sql'] for query in queries if query['sql'].startswith('UPDATE "tutorials_')]
+        self.assertEqual(len(session_writes), 1)
+        self.assertTrue(session_writes[0].startswith('UPDATE "tutorials_tutorsession" SET "is_available" = '))
+        self.assertNotIn('"label"', session_writes[0])
+
+    def test_approve_session_twice_fails(self):
+        approve_session(self.requested_session.pk, self.tutor_session.pk)
+        with self.assertRaises(RequestedStudentSession.DoesNotExist):
+            approve_session(self.requested_session.pk, self.tutor_session.pk)
+        self.assertEqual(StudentSession.objects.count(), 1)
+
+    def test_approve_session_with_missing_tutor_session_changes_nothing(self):
+        with self.assertRaises(TutorSession.DoesNotExist):
+            approve_session(self.requested_session.pk, 99999)
+        self.assertTrue(RequestedStudentSession.objects.filter(pk=self.requested_session.pk).exists())
+        self.assertTrue(TutorSession.objects.get(pk=self.tutor_session.pk).is_available)
+
+    def test_approve_session_for_a_taken_tutor_session_fails(self):
+        other_student = Student.objects.create(user=User.objects.get(username='@johndoe'))
+        other_request = RequestedStudentSession.objects.create(student=other_student, session=self.session)
+        approve_session(other_request.pk, self.tutor_session.pk)
+        with self.assertRaises(ValidationError):
+            approve_session(self.requested_session.pk, self.tutor_session.pk)
+        self.assertEqual(StudentSession.objects.count(), 1)
+        self.assertTrue(RequestedStudentSession.objects.filter(pk=self.requested_session.pk).exists())
+
+    def test_approve_session_for_an_existing_enrollment_fails(self):
+        StudentSession.objects.create(student=self.student, tutor_session=self.tutor_session)
+        TutorSession.objects.filter(pk=self.tutor_session.pk).update(is_available=True)
+        with self.assertRaises(ValidationError):
+            approve_session(self.requested_session.pk, self.tutor_session.pk)
+        self.assertEqual(StudentSession.objects.count(), 1)
+        self.assertTrue(RequestedStudentSession.objects.filter(pk=self.requested_session.pk).exists())
+
+    def test_approve_sessions_gives_each_tutor_session_to_one_request(self):
+        other_student = Student.objects.create(user=User.objects.get(username='@johndoe'))
+        TutorSession.objects.create(tutor=self.other_tutor, session=self.other_session)
+        second_request = RequestedStudentSession.objects.create(student=other_student, session=self.session)
+        third_request = RequestedStudentSession.objects.create(student=other_student, session=self.other_session)
+
+        student_sessions, skipped = approve_sessions([self.requested_session.pk, second_request.pk, third_request.pk])
+
+        self.assertEqual(len(student_sessions), 2)
+        self.assertEqual(skipped, [third_request.pk])
+        self.assertEqual(StudentSession.objects.count(), 2)
+        self.assertFalse(TutorSession.objects.filter(is_available=True).exists())
+        self.assertEqual(list(RequestedStudentSession.objects.values_list('pk', flat=True)), [third_request.pk])
+
+    def test_approve_sessions_serves_every_tutor_of_a_shared_session(self):
+        TutorSession.objects.create(tutor=self.other_tutor, session=self.session)
+        other_user = User.objects.create(username='@otherstudent', first_name='Other', last_name='Student', email='other@example.org')
+        students = [Student.objects.create(user=User.objects.get(username='@johndoe')), Student.objects.create(user=other_user)]
+        requests = [RequestedStudentSession.objects.create(student=student, session=self.session) for student in students]
+
+        student_sessions, skipped = approve_sessions([self.requested_session.pk] + [request.pk for request in requests])
+
+        self.assertEqual(len(student_sessions), 2)
+        self.assertEqual(skipped, [requests[1].pk])
+        self.assertEqual(
+            sorted(student_session.tutor_session.tutor_id for student_session in student_sessions),
+            sorted([self.tutor.pk, self.other_tutor.pk])
+        )
+
+    def test_approve_sessions_skips_unknown_requests(self):
+        student_sessions, skipped = approve_sessions([99999, self.requested_session.pk])
+        self.assertEqual(len(student_sessions), 1)
+        self.assertEqual(skipped, [99999])
+
+    def test_approve_sessions_query_count_does_not_grow_with_the_batch(self):
+        small = self._create_requests(2)
+        with CaptureQueriesContext(connection) as small_batch:
+            approve_sessions(small)
+        large = self._create_requests(20)
+        with CaptureQueriesContext(connection) as large_batch:
+            approve_sessions(large)
+        self.assertEqual(len(small_batch), len(large_batch))
+
+    def test_approve_sessions_skips_tutor_sessions_taken_since_they_were_matched(self):
+        self.requested_session.available_tutor_sessions.add(self.tutor_session)
+        StudentSession.objects.create(student=Student.objects.create(user=User.objects.get(username='@johndoe')), tutor_session=self.tutor_session)
+        student_sessions, skipped = approve_sessions([self.requested_session.pk])
+        self.assertEqual(student_sessions, [])
+        self.assertEqual(skipped, [self.requested_session.pk])
+        self.assertEqual(StudentSession.objects.count(), 1)
+
+    def test_enroll_refuses_a_tutor_session_it_did_not_take(self):
+        TutorSession.objects.filter(pk=self.tutor_session.pk).update(is_available=False)
+        with self.assertRaises(ValidationError):
+            _enroll([StudentSession(student=self.student, tutor_session=self.tutor_session)], [self.requested_session.pk])
+        self.assertFalse(StudentSession.objects.exists())
+        self.assertTrue(RequestedStudentSession.objects.filter(pk=self.requested_session.pk).exists())
+
+    def test_enroll_refuses_two_enrollments_in_one_tutor_session(self):
+        other_student = Student.objects.create(user=User.objects.get(username='@johndoe'))
+        with self.assertRaises(ValidationError):
+            _enroll(
+                [StudentSession(student=student, tutor_session=self.tutor_session) for student in [self.student, other_student]],
+                [self.requested_session.pk],
+            )
+        self.assertFalse(StudentSession.objects.exists())
+
+    def _create_requests(self, count):
+        request_ids = []
+        for _ in range(count):
+            index = User.objects.count()
+            user = User.objects.create(
+                username=f'@batchstudent{index}',
+                first_name='Batch',
+                last_name='Student',
+                email=f'batchstudent{index}@example.org',
+            )
+            student = Student.objects.create(user=user)
+            level, season, year = next(self.catalog_keys)
+            session = Session.objects.create(programming_language=self.language, level=level, season=season, year=year, duration_hours=1)
+            TutorSession.objects.create(tutor=self.tutor, session=session)
+            request_ids.append(RequestedStudentSession.objects.create(student=student, session=session).pk)
+        return request_ids
+
+    def _create_session(self, frequency):
+        return Session.objects.create(
+            programming_language=self.language,
+            level='beginner',
+            season='Fall',
+            year=2024,
+            frequency=frequency,
+            duration_hours=2
+        )
@@ -0,0 +1,167 @@
+from collections import Counter
+from unittest.mock import patch
+from django.core.exceptions import ValidationError
+from django.test import TestCase
+from tutorials.assignment import FlowNetwork, available_tutor_sessions, plan_assignments
+from tutorials.models import User, Student, Tutor, Session, TutorSession, StudentSession, ProgrammingLanguage, RequestedStudentSession
+from tutorials.services import assign_pending_requests
+
+PYTHON = (1, 'beginner', 'Fall', 2024)
+JAVA = (2, 'beginner', 'Fall', 2024)
+
+class TestPlanAssignments(TestCase):
+    """Tests for the assignment solver."""
+
+    def test_each_tutor_session_serves_one_request(self):
+        requests = [(1, 1, 10, PYTHON), (2, 2, 10, PYTHON), (3, 3, 11, PYTHON)]
+        tutor_sessions = [(100, 1, 10, PYTHON), (101, 1, 11, PYTHON)]
+        assignments, unassigned = plan_assignments(requests, tutor_sessions)
+        self.assertEqual(len(assignments), 2)
+        self.assertEqual(len({tutor_session[0] for _, tutor_session in assignments}), 2)
+        self.assertEqual(unassigned, [(3, 3, 11, PYTHON)])
+
+    def test_tutors_sharing_a_session_each_serve_a_request(self):
+        requests = [(1, 1, 10, PYTHON), (2, 2, 10, PYTHON), (3, 3, 10, PYTHON)]
+        tutor_sessions = [(100, 1, 10, PYTHON), (101, 2, 10, PYTHON)]
+        assignments, unassigned = plan_assignments(requests, tutor_sessions)
+        self.assertEqual(sorted((request[0], tutor_session[0]) for request, tutor_session in assignments), [(1, 100), (2, 101)])
+        self.assertEqual(unassigned, [(3, 3, 10, PYTHON)])
+
+    def test_requests_only_take_tutor_sessions_of_their_match_group(self):
+        assignments, unassigned = plan_assignments([(1, 1, 10, PYTHON)], [(100, 1, 20, JAVA)])
+        self.assertEqual(assignments, [])
+        self.assertEqual(unassigned, [(1, 1, 10, PYTHON)])
+
+    def test_requests_prefer_the_session_they_asked_for(self):
+        requests = [(1, 1, 11, PYTHON), (2, 2, 10, PYTHON)]
+        tutor_sessions = [(100, 1, 10, PYTHON), (101, 2, 11, PYTHON)]
+        assignments, _ = plan_assignments(requests, tutor_sessions)
+        self.assertEqual(sorted((request[0], tutor_session[0]) for request, tutor_session in assignments), [(1, 101), (2, 100)])
+
+    def test_tutor_capacity_counts_existing_enrollments(self):
+        requests = [(pk, pk, 10 + pk, PYTHON) for pk in range(4)]
+        tutor_sessions = [(100 + pk, 1, 10 + pk, PYTHON) for pk in range(4)]
+        assignments, unassigned = plan_assignments(requests, tutor_sessions, tutor_capacity=3, loads={1: 1})
+        self.assertEqual(len(assignments), 2)
+        self.assertEqual(len(unassigned), 2)
+
+    def test_capacity_is_spent_where_it_serves_the_most_requests(self):
+        # Tutor 1 can take one more student and teaches both groups, tutor 2 only teaches Python.
+        # Giving Python to tutor 1 first would leave the Java request unserved.
+        requests = [(1, 1, 10, PYTHON), (2, 2, 20, JAVA)]
+        tutor_sessions = [(100, 1, 10, PYTHON), (101, 2, 10, PYTHON), (102, 1, 20, JAVA)]
+        assignments, unassigned = plan_assignments(requests, tutor_sessions, tutor_capacity=1)
+        self.assertEqual(unassigned, [])
+        self.assertEqual(Counter(tutor_session[1] for _, tutor_session in assignments), {1: 1, 2: 1})
+
+    def test_oldest_requests_are_served_first(self):
+        requests = [(1, 1, 10, PYTHON), (2, 2, 10, PYTHON), (3, 3, 10, PYTHON)]
+        assignments, unassigned = plan_assignments(requests, [(100, 1, 10, PYTHON)])
+        self.assertEqual([request[0] for request, _ in assignments], [1])
+        self.assertEqual([request[0] for request in unassigned], [2, 3])
+
+    def test_flow_network_finds_the_maximum_flow(self):
+        network = FlowNetwork()
+        network.add_edge(0, 2, 3)
+        network.add_edge(0, 3, 2)
+        network.add_edge(2, 3, 1)
+        first = network.add_edge(2, 1, 2)
+        network.add_edge(3, 1, 3)
+        self.assertEqual(network.max_flow(0, 1, 4), 5)
+        self.assertEqual(network.flow(first), 2)
+
+
+class TestAssignPendingRequests(TestCase):
+    """Tests for the assign_pending_requests service."""
+
+    fixtures = [
+        'tutorials/tests/fixtures/default_user.json',
+        'tutorials/tests/fixtures/other_users.json'
+    ]
+
+    def setUp(self):
+        self.student = Student.objects.create(user=User.objects.get(username='@janedoe'))
+        self.other_student = Student.objects.create(user=User.objects.get(username='@johndoe'))
+        self.tutor = Tutor.objects.create(user=User.objects.get(username='@petrapickles'))
+        self.language = ProgrammingLanguage.objects.create(name='Python')
+        self.session = self._create_session('Weekly')
+        self.other_session = self._create_session('Bi-Weekly')
+        self.tutor_session = TutorSession.objects.create(tutor=self.tutor, session=self.session)
+        self.request = RequestedStudentSession.objects.create(student=self.student, session=self.session)
+        self.other_request = RequestedStudentSession.objects.create(student=self.other_student, session=self.other_session)
+
+    def test_requests_are_enrolled_in_bulk(self):
+        other_tutor_session = TutorSession.objects.create(tutor=self.tutor, session=self.other_session)
+        student_sessions, unassigned = assign_pending_requests()
+        self.assertEqual(len(student_sessions), 2)
+        self.assertEqual(unassigned, [])
+        self.assertTrue(StudentSession.objects.filter(student=self.student, tutor_session=self.tutor_session).exists())
+        self.assertTrue(StudentSession.objects.filter(student=self.other_student, tutor_session=other_tutor_session).exists())
+        self.assertFalse(TutorSession.objects.filter(is_available=True).exists())
+        self.assertFalse(RequestedStudentSession.objects.exists())
+
+    def test_unmatched_requests_are_reported(self):
+        student_sessions, unassigned = assign_pending_requests()
+        self.assertEqual(len(student_sessions), 1)
+        self.assertEqual([request[0] for request in unassigned], [self.other_request.pk])
+        self.assertTrue(RequestedStudentSession.objects.filter(pk=self.other_request.pk).exists())
+
+    def test_dry_run_writes_nothing(self):
+        student_sessions, unassigned = assign_pending_requests(dry_run=True)
+        self.assertEqual(len(student_sessions), 1)
+        self.assertEqual(len(unassigned), 1)
+        self.assertFalse(StudentSession.objects.exists())
+        self.assertEqual(RequestedStudentSession.objects.count(), 2)
+        self.assertTrue(TutorSession.objects.get(pk=self.tutor_session.pk).is_available)
+
+    def test_every_tutor_of_a_shared_session_is_assigned(self):
+        other_tutor = Tutor.objects.create(user=User.objects.get(username='@peterpickles'))
+        other_tutor_session = TutorSession.objects.create(tutor=other_tutor, session=self.session)
+        third_user = User.objects.create(username='@thirdstudent', first_name='Third', last_name='Student', email='third@example.org')
+        third_request = RequestedStudentSession.objects.create(student=Student.objects.create(user=third_user), session=self.session)
+        student_sessions, unassigned = assign_pending_requests()
+        self.assertEqual(
+            sorted(student_session.tutor_session_id for student_session in student_sessions),
+            [self.tutor_session.pk, other_tutor_session.pk]
+        )
+        # The other request matches the same group and is older than the third
+        self.assertEqual([request[0] for request in unassigned], [third_request.pk])
+
+    def test_tutor_capacity_is_respected(self):
+        TutorSession.objects.create(tutor=self.tutor, session=self.other_session)
+        student_sessions, unassigned = assign_pending_requests(tutor_capacity=1)
+        self.assertEqual(len(student_sessions), 1)
+        self.assertEqual(len(unassigned), 1)
+
+    def test_taken_sessions_are_not_assigned(self):
+        StudentSession.objects.create(student=self.other_student, tutor_session=self.tutor_session)
+        student_sessions, unassigned = assign_pending_requests()
+        self.assertEqual(student_sessions, [])
+        self.assertEqual(len(unassigned), 2)
+
+    def test_tutor_sessions_are_locked_unless_dry_run(self):
+        with patch('tutorials.services.available_tutor_sessions', wraps=available_tutor_sessions) as read:
+            assign_pending_requests(dry_run=True)
+            assign_pending_requests()
+        self.assertEqual([call.kwargs for call in read.call_args_list], [{'lock': False}, {'lock': True}])
+
+    def test_tutor_session_taken_while_planning_is_not_enrolled_twice(self):
+        def plan_while_taking(*args, **kwargs):
+            StudentSession.objects.create(student=self.other_student, tutor_session=self.tutor_session)
+            return plan_assignments(*args, **kwargs)
+
+        with patch('tutorials.services.plan_assignments', side_effect=plan_while_taking):
+            with self.assertRaises(ValidationError):
+                assign_pending_requests()
+        self.assertFalse(StudentSession.objects.filter(student=self.student).exists())
+        self.assertEqual(RequestedStudentSession.objects.count(), 2)
+
+    def _create_session(self, frequency):
+        return Session.objects.create(
+            programming_language=self.language,
+            level='beginner',
+            season='Fall',
+            year=2024,
+            frequency=frequency,
+            duration_hours=2
+        )
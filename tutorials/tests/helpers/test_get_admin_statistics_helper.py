@@ -0,0 +1,62 @@
+from django.core.cache import cache
+from django.test import TestCase
+from tutorials.helpers import get_admin_statistics
+from tutorials.models import User, Student, Tutor, Session, TutorSession, StudentSession, ProgrammingLanguage, RequestedStudentSession, Invoice
+
+class TestGetAdminStatistics(TestCase):
+    """Tests for the get_admin_statistics helper function."""
+
+    fixtures = [
+        'tutorials/tests/fixtures/default_user.json',
+        'tutorials/tests/fixtures/other_users.json'
+    ]
+
+    def setUp(self):
+        cache.clear()
+        self.student = Student.objects.create(user=User.objects.get(username='@janedoe'))
+        self.tutor = Tutor.objects.create(user=User.objects.get(username='@petrapickles'))
+        self.language = ProgrammingLanguage.objects.create(name='Python')
+        self.session = Session.objects.create(
+            programming_language=self.language,
+            level='beginner',
+            season='Fall',
+            year=2024,
+            frequency='Weekly',
+            duration_hours=2
+        )
+
+    def test_statistics_content(self):
+        RequestedStudentSession.objects.create(student=self.student, session=self.session)
+        statistics = get_admin_statistics()
+        self.assertEqual(statistics['total_users'], 4)
+        self.assertEqual(statistics['student_count'], 1)
+        self.assertEqual(statistics['tutor_count'], 2)
+        self.assertEqual(statistics['admin_count'], 1)
+        self.assertEqual(statistics['pending_requests'], 1)
+        self.assertEqual(statistics['invoices_by_status'], {'PENDING': 0, 'PAID': 0, 'OVERDUE': 0, 'CANCELLED': 0})
+        self.assertEqual(statistics['sessions_by_language'], [{'language': 'Python', 'season': 'Fall', 'count': 1}])
+
+    def test_statistics_are_cached(self):
+        get_admin_statistics()
+        with self.assertNumQueries(0):
+            get_admin_statistics()
+
+    def test_statistics_are_invalidated_when_an_invoice_is_created(self):
+        self.assertEqual(get_admin_statistics()['invoices_by_status']['PENDING'], 0)
+        tutor_session = TutorSession.objects.create(tutor=self.tutor, session=self.session)
+        student_session = StudentSession.objects.create(student=self.student, tutor_session=tutor_session)
+        Invoice.objects.create(session=student_session)
+        self.assertEqual(get_admin_statistics()['invoices_by_status']['PENDING'], 1)
+
+    def test_statistics_are_invalidated_when_a_user_changes_role(self):
+        self.assertEqual(get_admin_statistics()['admin_count'], 1)
+        user = User.objects.get(username='@peterpickles')
+        user.role = User.Roles.ADMIN
+        user.save()
+        self.assertEqual(get_admin_statistics()['admin_count'], 2)
+
+    def test_statistics_are_kept_when_a_user_logs_in(self):
+        get_admin_statistics()
+        self.client.login(username='@johndoe', password='Password123')
+        with self.assertNumQueries(0):
+            get_admin_statistics()
@@ -59,3 +59,8 @@ class TestGetUserCounts(TestCase):
         self.assertEqual(counts['student_count'], 3)
         self.assertEqual(counts['tutor_count'], 1)
 
+    def test_user_counts_use_a_single_query(self):
+        """Check that all counts come from one aggregate query."""
+        with self.assertNumQueries(1):
+            counts = get_user_counts()
+        self.assertEqual(counts['admin_count'], 1)
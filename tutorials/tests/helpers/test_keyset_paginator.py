@@ -0,0 +1,94 @@
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from tutorials.models import User, Student
+from tutorials.pagination import KeysetPaginator
+
+class TestKeysetPaginator(TestCase):
+    """Tests for the keyset paginator."""
+
+    def setUp(self):
+        # Several students share a first name so that the primary key breaks ties
+        for index in range(25):
+            user = User.objects.create(
+                username=f'@student{index}',
+                first_name=f'Name{index // 3:02d}',
+                last_name='Test',
+                email=f'student{index}@example.org'
+            )
+            Student.objects.create(user=user)
+        self.students = Student.objects.select_related('user')
+
+    def test_pages_cover_every_row_once_in_ascending_order(self):
+        rows = self._walk_forward(KeysetPaginator(self.students, 10, ['user__first_name']))
+        expected = list(self.students.order_by('user__first_name', 'pk'))
+        self.assertEqual(rows, expected)
+
+    def test_pages_cover_every_row_once_in_descending_order(self):
+        rows = self._walk_forward(KeysetPaginator(self.students, 10, ['-user__first_name']))
+        expected = list(self.students.order_by('-user__first_name', '-pk'))
+        self.assertEqual(rows, expected)
+
+    def test_previous_cursor_returns_the_previous_page(self):
+        paginator = KeysetPaginator(self.students, 10, ['-user__first_name'])
+        first = paginator.get_page()
+        second = paginator.get_page(first.next_cursor)
+        third = paginator.get_page(second.next_cursor)
+        back = paginator.get_page(third.previous_cursor)
+        self.assertEqual(list(back), list(second))
+        self.assertEqual(back.number, 2)
+        self.assertTrue(back.has_previous())
+        self.assertTrue(back.has_next())
+
+    def test_last_page_has_no_next_cursor(self):
+        paginator = KeysetPaginator(self.students, 10, ['user__first_name'])
+        page = paginator.get_page()
+        while page.has_next():
+            page = paginator.get_page(page.next_cursor)
+        self.assertEqual(len(page), 5)
+        self.assertEqual(page.number, 3)
+        self.assertIsNone(page.next_cursor)
+
+    def test_invalid_cursor_returns_first_page(self):
+        paginator = KeysetPaginator(self.students, 10, ['user__first_name'])
+        for cursor in ['invalid', 'WyJuIl0', '!!!']:
+            page = paginator.get_page(cursor)
+            self.assertEqual(page.number, 1)
+            self.assertEqual(list(page), list(paginator.get_page()))
+
+    def test_cursor_from_another_ordering_is_rejected(self):
+        other = KeysetPaginator(self.students, 10, ['user__first_name', 'user__last_name'])
+        cursor = other.get_page().next_cursor
+        page = KeysetPaginator(self.students, 10, ['user__first_name']).get_page(cursor)
+        self.assertEqual(page.number, 1)
+
+    def test_count_is_exact_below_limit(self):
+        paginator = KeysetPaginator(self.students, 10, ['user__first_name'])
+        self.assertEqual(paginator.count, 25)
+        self.assertFalse(paginator.count_is_estimate)
+        self.assertEqual(paginator.num_pages, 3)
+
+    def test_count_is_capped_at_limit(self):
+        paginator = KeysetPaginator(self.students, 10, ['user__first_name'], count_limit=20)
+        self.assertTrue(paginator.count_is_estimate)
+        self.assertEqual(paginator.num_pages, 2)
+
+    def test_deep_pages_cost_the_same_queries_as_the_first(self):
+        paginator = KeysetPaginator(self.students, 5, ['user__first_name'])
+        with CaptureQueriesContext(connection) as first_page:
+            page = paginator.get_page()
+        while page.has_next():
+            cursor = page.next_cursor
+            page = paginator.get_page(cursor)
+        with CaptureQueriesContext(connection) as last_page:
+            paginator.get_page(cursor)
+        self.assertEqual(len(first_page), len(last_page))
+        self.assertNotIn('OFFSET', last_page[0]['sql'])
+
+    def _walk_forward(self, paginator):
+        page = paginator.get_page()
+        rows = list(page)
+        while page.has_next():
+            page = paginator.get_page(page.next_cursor)
+            rows.extend(page)
+        return rows
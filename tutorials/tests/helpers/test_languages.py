@@ -0,0 +1,54 @@
+from django.test import TestCase
+from tutorials import languages
+from tutorials.languages import get_language, get_languages, invalidate_languages
+from tutorials.models import ProgrammingLanguage
+
+class TestLanguages(TestCase):
+    """Tests for the programming language registry."""
+
+    def setUp(self):
+        # The registry outlives the test transaction, so start and end with it empty
+        invalidate_languages()
+        self.addCleanup(invalidate_languages)
+        self.python = ProgrammingLanguage.objects.create(name='Python')
+        self.java = ProgrammingLanguage.objects.create(name='Java')
+
+    def test_registry_holds_every_language_in_primary_key_order(self):
+        self.assertEqual(list(get_languages().values()), [self.python, self.java])
+
+    def test_lookups_do_not_query_once_loaded(self):
+        get_languages()
+        with self.assertNumQueries(0):
+            self.assertEqual(get_language(self.java.pk), self.java)
+            self.assertEqual(get_language(str(self.python.pk)), self.python)
+            self.assertEqual(get_language(self.python), self.python)
+
+    def test_unknown_and_invalid_values_have_no_language(self):
+        self.assertIsNone(get_language(self.java.pk + 1))
+        self.assertIsNone(get_language('Python'))
+        self.assertIsNone(get_language(None))
+
+    def test_registry_is_read_only(self):
+        with self.assertRaises(TypeError):
+            get_languages()[self.java.pk + 1] = self.java
+
+    def test_new_language_is_picked_up(self):
+        get_languages()
+        ruby = ProgrammingLanguage.objects.create(name='Ruby')
+        self.assertEqual(get_language(ruby.pk), ruby)
+
+    def test_renamed_and_deleted_languages_are_picked_up(self):
+        get_languages()
+        self.java.name = 'Kotlin'
+        self.java.save()
+        self.assertEqual(get_language(self.java.pk).name, 'Kotlin')
+        self.java.delete()
+        self.assertEqual(list(get_languages().values()), [self.python])
+
+    def test_registry_loaded_before_the_change_commits_is_discarded(self):
+        stale = get_languages()
+        with self.captureOnCommitCallbacks(execute=True):
+            ruby = ProgrammingLanguage.objects.create(name='Ruby')
+            # Another connection reloading the registry before the commit still reads the old languages
+            languages._languages = stale
+        self.assertEqual(get_language(ruby.pk), ruby)
@@ -0,0 +1,65 @@
+from datetime import timedelta
+from django.core.cache import cache
+from django.test import TestCase
+from django.utils import timezone
+from tutorials.helpers import get_invoice_counts
+from tutorials.models import User, Student, Tutor, Session, TutorSession, StudentSession, ProgrammingLanguage, Invoice
+from tutorials.services import mark_overdue_invoices
+
+class TestMarkOverdueInvoicesService(TestCase):
+    """Tests for the mark_overdue_invoices sweeper."""
+
+    fixtures = [
+        'tutorials/tests/fixtures/default_user.json',
+        'tutorials/tests/fixtures/other_users.json'
+    ]
+
+    def setUp(self):
+        cache.clear()
+        student = Student.objects.create(user=User.objects.get(username='@janedoe'))
+        tutor = Tutor.objects.create(user=User.objects.get(username='@petrapickles'))
+        language = ProgrammingLanguage.objects.create(name='Python')
+        session = Session.objects.create(
+            programming_language=language,
+            level='beginner',
+            season='Fall',
+            year=2024,
+            frequency='Weekly',
+            duration_hours=2
+        )
+        tutor_session = TutorSession.objects.create(tutor=tutor, session=session)
+        self.student_session = StudentSession.objects.create(student=student, tutor_session=tutor_session)
+        self.today = timezone.now().date()
+
+    def test_past_due_pending_invoices_become_overdue(self):
+        past_due = self._create_invoice(self.today - timedelta(days=1))
+        due_today = self._create_invoice(self.today)
+        self.assertEqual(mark_overdue_invoices(), 1)
+        past_due.refresh_from_db()
+        due_today.refresh_from_db()
+        self.assertEqual(past_due.payment_status, 'OVERDUE')
+        self.assertEqual(due_today.payment_status, 'PENDING')
+
+    def test_paid_invoices_are_left_alone(self):
+        paid = self._create_invoice(self.today - timedelta(days=1), payment_status='PAID')
+        self.assertEqual(mark_overdue_invoices(), 0)
+        paid.refresh_from_db()
+        self.assertEqual(paid.payment_status, 'PAID')
+
+    def test_sweep_is_a_single_update(self):
+        for days in range(1, 6):
+            self._create_invoice(self.today - timedelta(days=days))
+        cache.clear()
+        with self.assertNumQueries(1):
+            self.assertEqual(mark_overdue_invoices(), 5)
+
+    def test_invoice_counts_follow_the_sweep(self):
+        self._create_invoice(self.today - timedelta(days=1))
+        self.assertEqual(get_invoice_counts()['PENDING'], 1)
+        mark_overdue_invoices()
+        counts = get_invoice_counts()
+        self.assertEqual(counts['PENDING'], 0)
+        self.assertEqual(counts['OVERDUE'], 1)
+
+    def _create_invoice(self, due_date, payment_status='PENDING'):
+        return Invoice.objects.create(session=self.student_session, due_date=due_date, payment_status=payment_status)
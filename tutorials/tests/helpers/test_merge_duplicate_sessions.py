@@ -0,0 +1,144 @@
+from datetime import date, datetime, timezone
+from django.db import connection
+from django.db.migrations.executor import MigrationExecutor
+from django.test import TransactionTestCase
+
+class TestMergeDuplicateSessions(TransactionTestCase):
+    """Tests for the migration that merges duplicate catalog sessions."""
+
+    before = [('tutorials', '0031_rate_card')]
+    after = [('tutorials', '0033_unique_session')]
+
+    def setUp(self):
+        executor = MigrationExecutor(connection)
+        executor.migrate(self.before)
+        self.apps = executor.loader.project_state(self.before).apps
+
+    def tearDown(self):
+        executor = MigrationExecutor(connection)
+        executor.loader.build_graph()
+        executor.migrate(executor.loader.graph.leaf_nodes())
+
+    def test_duplicates_are_merged_into_the_oldest_session(self):
+        User = self.apps.get_model('tutorials', 'User')
+        Student = self.apps.get_model('tutorials', 'Student')
+        Tutor = self.apps.get_model('tutorials', 'Tutor')
+        ProgrammingLanguage = self.apps.get_model('tutorials', 'ProgrammingLanguage')
+        Session = self.apps.get_model('tutorials', 'Session')
+        TutorSession = self.apps.get_model('tutorials', 'TutorSession')
+        StudentSession = self.apps.get_model('tutorials', 'StudentSession')
+        RequestedStudentSession = self.apps.get_model('tutorials', 'RequestedStudentSession')
+        Invoice = self.apps.get_model('tutorials', 'Invoice')
+
+        users = [
+            User.objects.create(username=f'@merged{index}', email=f'merged{index}@example.org')
+            for index in range(3)
+        ]
+        student = Student.objects.create(user=users[0])
+        other_student = Student.objects.create(user=users[1])
+        tutor = Tutor.objects.create(user=users[2])
+        language = ProgrammingLanguage.objects.create(name='Python')
+        kept, duplicate, other = [
+            Session.objects.create(
+                programming_language=language,
+                level='beginner',
+                season='Fall',
+                year=2024,
+                frequency=frequency,
+                duration_hours=2,
+                start_day=date(2024, 9, 16),
+                end_day=date(2024, 12, 13),
+                is_available=is_available,
+            )
+            for frequency, is_available in [('Weekly', True), ('Weekly', False), ('Bi-Weekly', True)]
+        ]
+        kept_tutor_session = TutorSession.objects.create(tutor=tutor, session=kept)
+        merged_tutor_session = TutorSession.objects.create(tutor=tutor, session=duplicate)
+        kept_enrollment = StudentSession.objects.create(student=student, tutor_session=kept_tutor_session)
+        merged_enrollment = StudentSession.objects.create(student=student, tutor_session=merged_tutor_session)
+        moved_enrollment = StudentSession.objects.create(student=other_student, tutor_session=merged_tutor_session)
+        invoice = Invoice.objects.create(session=merged_enrollment, amount=50, due_date=date(2024, 10, 16))
+        kept_request = RequestedStudentSession.objects.create(student=student, session=kept)
+        dropped_request = RequestedStudentSession.objects.create(student=student, session=duplicate)
+        dropped_request.available_tutor_sessions.add(merged_tutor_session)
+        moved_request = RequestedStudentSession.objects.create(student=other_student, session=duplicate)
+        moved_request.available_tutor_sessions.add(merged_tutor_session)
+        other_student.previous_sessions.add(duplicate)
+
+        executor = MigrationExecutor(connection)
+        executor.migrate(self.after)
+        apps = executor.loader.project_state(self.after).apps
+        Session = apps.get_model('tutorials', 'Session')
+        TutorSession = apps.get_model('tutorials', 'TutorSession')
+        StudentSession = apps.get_model('tutorials', 'StudentSession')
+        RequestedStudentSession = apps.get_model('tutorials', 'RequestedStudentSession')
+        Student = apps.get_model('tutorials', 'Student')
+        Invoice = apps.get_model('tutorials', 'Invoice')
+
+        self.assertEqual(sorted(Session.objects.values_list('pk', flat=True)), [kept.pk, other.pk])
+        self.assertEqual(list(TutorSession.objects.values_list('pk', flat=True)), [kept_tutor_session.pk])
+        self.assertEqual(
+            sorted(StudentSession.objects.values_list('pk', 'tutor_session_id')),
+            [(kept_enrollment.pk, kept_tutor_session.pk), (moved_enrollment.pk, kept_tutor_session.pk)]
+        )
+        self.assertEqual(Invoice.objects.get(pk=invoice.pk).session_id, kept_enrollment.pk)
+        self.assertFalse(RequestedStudentSession.objects.filter(pk=dropped_request.pk).exists())
+        self.assertEqual(
+            list(RequestedStudentSession.objects.get(pk=kept_request.pk).available_tutor_sessions.values_list('pk', flat=True)),
+            [kept_tutor_session.pk]
+        )
+        moved_request = RequestedStudentSession.objects.get(pk=moved_request.pk)
+        self.assertEqual(moved_request.session_id, kept.pk)
+        self.assertEqual(list(moved_request.available_tutor_sessions.values_list('pk', flat=True)), [kept_tutor_session.pk])
+        self.assertEqual(
+            list(Student.objects.get(pk=other_student.pk).previous_sessions.values_list('pk', flat=True)), [kept.pk]
+        )
+
+    def test_merged_enrollment_keeps_the_most_advanced_status_and_earliest_registration(self):
+        User = self.apps.get_model('tutorials', 'User')
+        Student = self.apps.get_model('tutorials', 'Student')
+        Tutor = self.apps.get_model('tutorials', 'Tutor')
+        ProgrammingLanguage = self.apps.get_model('tutorials', 'ProgrammingLanguage')
+        Session = self.apps.get_model('tutorials', 'Session')
+        TutorSession = self.apps.get_model('tutorials', 'TutorSession')
+        StudentSession = self.apps.get_model('tutorials', 'StudentSession')
+        Invoice = self.apps.get_model('tutorials', 'Invoice')
+
+        student = Student.objects.create(user=User.objects.create(username='@paidstudent', email='paid@example.org'))
+        tutor = Tutor.objects.create(user=User.objects.create(username='@paidtutor', email='paidtutor@example.org'))
+        language = ProgrammingLanguage.objects.create(name='Python')
+        kept, duplicate = [
+            Session.objects.create(
+                programming_language=language,
+                level='beginner',
+                season='Fall',
+                year=2024,
+                frequency='Weekly',
+                duration_hours=2,
+                start_day=date(2024, 9, 16),
+                end_day=date(2024, 12, 13),
+            )
+            for _ in range(2)
+        ]
+        kept_enrollment = StudentSession.objects.create(
+            student=student, tutor_session=TutorSession.objects.create(tutor=tutor, session=kept), status='Send Invoice'
+        )
+        paid_enrollment = StudentSession.objects.create(
+            student=student, tutor_session=TutorSession.objects.create(tutor=tutor, session=duplicate), status='Approved'
+        )
+        StudentSession.objects.filter(pk=paid_enrollment.pk).update(registered_at=datetime(2024, 8, 1, tzinfo=timezone.utc))
+        invoice = Invoice.objects.create(
+            session=paid_enrollment, amount=50, due_date=date(2024, 10, 16), payment_status='PAID'
+        )
+
+        executor = MigrationExecutor(connection)
+        executor.migrate(self.after)
+        apps = executor.loader.project_state(self.after).apps
+        StudentSession = apps.get_model('tutorials', 'StudentSession')
+        Invoice = apps.get_model('tutorials', 'Invoice')
+
+        enrollment = StudentSession.objects.get()
+        self.assertEqual(enrollment.pk, kept_enrollment.pk)
+        self.assertEqual(enrollment.status, 'Approved')
+        self.assertEqual(enrollment.registered_at, datetime(2024, 8, 1, tzinfo=timezone.utc))
+        self.assertEqual(Invoice.objects.get(pk=invoice.pk).session_id, kept_enrollment.pk)
@@ -0,0 +1,67 @@
+import re
+from django.test import TestCase
+from django.urls import reverse
+from tutorials.models import User
+from tutorials.perf import PERF_BUCKETS, PERF_WINDOW, get_perf_stats, record_request, reset_perf_stats
+
+class TestPerf(TestCase):
+    """Tests for the request performance instrumentation."""
+
+    fixtures = ['tutorials/tests/fixtures/default_user.json']
+
+    def setUp(self):
+        reset_perf_stats()
+        self.addCleanup(reset_perf_stats)
+        self.user = User.objects.get(username='@johndoe')
+
+    def test_responses_have_a_server_timing_header(self):
+        self.client.login(username=self.user.username, password='Password123')
+        response = self.client.get(reverse('list_students'))
+        timing = dict(
+            (match.group(1), (float(match.group(2)), match.group(3)))
+            for match in re.finditer(r'(\w+);dur=([\d.]+);desc="([^"]*)"', response['Server-Timing'])
+        )
+        self.assertEqual(set(timing), {'db', 'tpl', 'total'})
+        self.assertRegex(timing['db'][1], r'^[1-9]\d* queries$')
+        self.assertGreater(timing['tpl'][0], 0)
+        self.assertGreaterEqual(timing['total'][0], timing['db'][0])
+
+    def test_requests_are_recorded_per_url_name(self):
+        self.client.login(username=self.user.username, password='Password123')
+        self.client.get(reverse('list_students'))
+        self.client.get(reverse('list_students'))
+        self.client.get('/no-such-page/')
+        stats = {row['url_name']: row for row in get_perf_stats()}
+        self.assertEqual(stats['list_students']['count'], 2)
+        self.assertGreater(stats['list_students']['mean_queries'], 0)
+        self.assertEqual(stats['<unresolved>']['count'], 1)
+
+    def test_summary(self):
+        for total in [5, 20, 30, 3000]:
+            record_request('home', total / 1000, 0.002, 4, 0.001)
+        row = get_perf_stats()[0]
+        self.assertEqual(row['count'], 4)
+        self.assertEqual(row['p50'], 30)
+        self.assertEqual(row['p95'], 3000)
+        self.assertEqual(row['max'], 3000)
+        self.assertEqual(row['mean_queries'], 4)
+        self.assertAlmostEqual(row['mean_db'], 2)
+        self.assertAlmostEqual(row['mean_templates'], 1)
+        self.assertEqual(len(row['buckets']), len(PERF_BUCKETS) + 1)
+        self.assertEqual(row['buckets'][0], 1)
+        self.assertEqual(row['buckets'][1], 1)
+        self.assertEqual(row['buckets'][2], 1)
+        self.assertEqual(row['buckets'][-1], 1)
+
+    def test_slowest_url_names_come_first(self):
+        record_request('home', 0.005, 0, 0, 0)
+        record_request('invoices', 0.5, 0, 0, 0)
+        self.assertEqual([row['url_name'] for row in get_perf_stats()], ['invoices', 'home'])
+
+    def test_window_keeps_the_latest_requests(self):
+        for _ in range(PERF_WINDOW):
+            record_request('home', 1, 0, 0, 0)
+        record_request('home', 0.001, 0, 0, 0)
+        row = get_perf_stats()[0]
+        self.assertEqual(row['count'], PERF_WINDOW)
+        self.assertEqual(row['buckets'][0], 1)
@@ -0,0 +1,55 @@
+from decimal import Decimal
+from django.test import TestCase
+from tutorials.models import ProgrammingLanguage, RateCard
+from tutorials import pricing
+from tutorials.pricing import invalidate_rates, price_for
+
+class TestPricing(TestCase):
+    """Tests for the rate card pricing helpers."""
+
+    def setUp(self):
+        # The rate card cache outlives the test transaction, so start and end with it empty
+        invalidate_rates()
+        self.addCleanup(invalidate_rates)
+        self.python = ProgrammingLanguage.objects.create(name='Python')
+        self.java = ProgrammingLanguage.objects.create(name='Java')
+
+    def test_defaults_apply_without_a_rate_card(self):
+        self.assertEqual(price_for(1, 'beginner', self.python.pk), Decimal('30.00'))
+        self.assertEqual(price_for(2, 'advanced', self.python.pk), Decimal('50.00'))
+        self.assertIsNone(price_for(3, 'advanced', self.python.pk))
+
+    def test_most_specific_rate_wins(self):
+        RateCard.objects.create(duration_hours=2, amount=Decimal('60.00'))
+        RateCard.objects.create(duration_hours=2, programming_language=self.python, amount=Decimal('70.00'))
+        RateCard.objects.create(duration_hours=2, level='advanced', amount=Decimal('80.00'))
+        RateCard.objects.create(duration_hours=2, level='advanced', programming_language=self.python, amount=Decimal('90.00'))
+        self.assertEqual(price_for(2, 'beginner', self.java.pk), Decimal('60.00'))
+        self.assertEqual(price_for(2, 'beginner', self.python.pk), Decimal('70.00'))
+        self.assertEqual(price_for(2, 'advanced', self.java.pk), Decimal('80.00'))
+        self.assertEqual(price_for(2, 'advanced', self.python.pk), Decimal('90.00'))
+
+    def test_rates_are_cached(self):
+        price_for(2, 'beginner', self.python.pk)
+        with self.assertNumQueries(0):
+            for _ in range(10):
+                price_for(2, 'beginner', self.python.pk)
+
+    def test_rate_changes_invalidate_the_cache(self):
+        self.assertEqual(price_for(2, 'beginner', self.python.pk), Decimal('50.00'))
+        rate = RateCard.objects.create(duration_hours=2, amount=Decimal('55.00'))
+        self.assertEqual(price_for(2, 'beginner', self.python.pk), Decimal('55.00'))
+        rate.amount = Decimal('65.00')
+        rate.save()
+        self.assertEqual(price_for(2, 'beginner', self.python.pk), Decimal('65.00'))
+        rate.delete()
+        self.assertEqual(price_for(2, 'beginner', self.python.pk), Decimal('50.00'))
+
+    def test_rates_loaded_before_the_change_commits_are_discarded(self):
+        price_for(2, 'beginner', self.python.pk)
+        stale = pricing._rates
+        with self.captureOnCommitCallbacks(execute=True):
+            RateCard.objects.create(duration_hours=2, amount=Decimal('55.00'))
+            # Another connection reloading the rate card before the commit still reads the old rates
+            pricing._rates = stale
+        self.assertEqual(price_for(2, 'beginner', self.python.pk), Decimal('55.00'))
@@ -0,0 +1,54 @@
+from django.contrib.auth.models import AnonymousUser
+from django.test import TestCase
+from django.urls import reverse
+from tutorials.auth import ProfileBackend, get_profile
+from tutorials.models import Admin, Student, Tutor, User
+
+class ProfileAuthTestCase(TestCase):
+    """Tests for loading the signed in user with their role profile."""
+
+    fixtures = [
+        'tutorials/tests/fixtures/default_user.json',
+        'tutorials/tests/fixtures/other_users.json'
+    ]
+
+    def setUp(self):
+        self.admin_user = User.objects.get(username='@johndoe')
+        self.student_user = User.objects.get(username='@janedoe')
+        self.tutor_user = User.objects.get(username='@petrapickles')
+        self.student = Student.objects.create(user=self.student_user)
+        self.tutor = Tutor.objects.create(user=self.tutor_user)
+
+    def test_backend_loads_the_user_and_profiles_in_one_query(self):
+        with self.assertNumQueries(1):
+            user = ProfileBackend().get_user(self.student_user.pk)
+            self.assertEqual(user, self.student_user)
+            self.assertEqual(user.student_profile, self.student)
+            self.assertFalse(hasattr(user, 'tutor_profile'))
+
+    def test_backend_returns_none_for_unknown_or_inactive_users(self):
+        self.assertIsNone(ProfileBackend().get_user(0))
+        self.tutor_user.is_active = False
+        self.tutor_user.save()
+        self.assertIsNone(ProfileBackend().get_user(self.tutor_user.pk))
+
+    def test_profile_matches_the_role(self):
+        self.assertEqual(get_profile(ProfileBackend().get_user(self.student_user.pk)), self.student)
+        self.assertEqual(get_profile(ProfileBackend().get_user(self.tutor_user.pk)), self.tutor)
+
+    def test_admin_profile_is_returned_when_it_exists(self):
+        self.assertIsNone(get_profile(ProfileBackend().get_user(self.admin_user.pk)))
+        admin = Admin.objects.create(user=self.admin_user)
+        self.assertEqual(get_profile(ProfileBackend().get_user(self.admin_user.pk)), admin)
+
+    def test_anonymous_user_has_no_profile(self):
+        self.assertIsNone(get_profile(AnonymousUser()))
+
+    def test_request_profile_is_set_for_signed_in_users(self):
+        self.client.login(username=self.tutor_user.username, password='Password123')
+        response = self.client.get(reverse('dashboard'))
+        self.assertEqual(response.wsgi_request.profile, self.tutor)
+
+    def test_request_profile_is_none_for_anonymous_users(self):
+        response = self.client.get(reverse('home'))
+        self.assertIsNone(response.wsgi_request.profile)
@@ -0,0 +1,116 @@
+from django.test import TestCase
+from tutorials.models import User, Student, Tutor, ProgrammingLanguage
+from tutorials.search import rebuild_search_index, search, search_user_ids
+
+class TestSearch(TestCase):
+    """Tests for the full-text user search."""
+
+    fixtures = [
+        'tutorials/tests/fixtures/default_user.json',
+        'tutorials/tests/fixtures/other_users.json'
+    ]
+
+    def setUp(self):
+        self.jane = User.objects.get(username='@janedoe')
+        self.petra = User.objects.get(username='@petrapickles')
+        self.peter = User.objects.get(username='@peterpickles')
+        self.tutor = Tutor.objects.create(user=self.petra)
+        self.python = ProgrammingLanguage.objects.create(name='Python')
+
+    def test_fixture_users_are_indexed(self):
+        self.assertEqual(set(search_user_ids('pickles')), {self.petra.pk, self.peter.pk})
+
+    def test_words_match_as_prefixes(self):
+        self.assertEqual(set(search_user_ids('pet')), {self.petra.pk, self.peter.pk})
+        self.assertEqual(search_user_ids('petr'), [self.petra.pk])
+
+    def test_every_word_must_match(self):
+        self.assertEqual(search_user_ids('Peter Pickles'), [self.peter.pk])
+
+    def test_email_and_username_are_searched(self):
+        user = User.objects.create(username='@jd', first_name='J', last_name='D', email='contact.jd@example.org')
+        self.assertEqual(search_user_ids('contact'), [user.pk])
+        self.assertEqual(search_user_ids('@janedoe'), [self.jane.pk])
+
+    def test_email_domains_are_not_searched(self):
+        self.assertEqual(search_user_ids('example'), [])
+
+    def test_query_without_words_matches_nothing(self):
+        self.assertEqual(search_user_ids('"*@'), [])
+
+    def test_best_match_comes_first(self):
+        user = User.objects.create(username='@someone', first_name='Some', last_name='One', email='pickles.fan@example.org')
+        self.assertEqual(search_user_ids('pickles')[-1], user.pk)
+
+    def test_limit(self):
+        self.assertEqual(len(search_user_ids('pickles', limit=1)), 1)
+
+    def test_renamed_user_is_reindexed(self):
+        self.peter.last_name = 'Piper'
+        self.peter.save()
+        self.assertEqual(search_user_ids('piper'), [self.peter.pk])
+        self.assertEqual(search_user_ids('pickles'), [self.petra.pk])
+
+    def test_deleted_user_is_removed(self):
+        self.peter.delete()
+        self.assertEqual(search_user_ids('pickles'), [self.petra.pk])
+
+    def test_expertise_is_searched(self):
+        self.tutor.expertise.add(self.python)
+        self.assertEqual(search_user_ids('python'), [self.petra.pk])
+        self.tutor.expertise.remove(self.python)
+        self.assertEqual(search_user_ids('python'), [])
+
+    def test_expertise_changes_from_the_language_side_are_reindexed(self):
+        self.python.tutors.add(self.tutor)
+        self.assertEqual(search_user_ids('python'), [self.petra.pk])
+        self.python.tutors.clear()
+        self.assertEqual(search_user_ids('python'), [])
+
+    def test_deleted_language_is_removed(self):
+        self.tutor.expertise.add(self.python)
+        self.python.delete()
+        self.assertEqual(search_user_ids('python'), [])
+
+    def test_deleted_tutor_loses_expertise(self):
+        self.tutor.expertise.add(self.python)
+        self.tutor.delete()
+        self.assertEqual(search_user_ids('python'), [])
+        self.assertEqual(search_user_ids('petra'), [self.petra.pk])
+
+    def test_bulk_created_users_are_found_after_a_rebuild(self):
+        user = User.objects.bulk_create([User(username='@bulkuser', first_name='Bulk', last_name='User', email='bulk@example.org')])[0]
+        self.assertEqual(search_user_ids('bulk'), [])
+        rebuild_search_index()
+        self.assertEqual(search_user_ids('bulk'), [user.pk])
+
+    def test_search_ranks_a_related_queryset(self):
+        user = User.objects.create(username='@someone', first_name='Some', last_name='One', email='pickles.fan@example.org')
+        Tutor.objects.create(user=user)
+        tutors = list(search(Tutor.objects.all(), 'pickles', 'user').order_by('search_rank'))
+        self.assertEqual([tutor.user for tutor in tutors], [self.petra, user])
+        self.assertLess(tutors[0].search_rank, tutors[1].search_rank)
+
+    def test_role_is_filtered_before_ranking(self):
+        self._create_users('@smithtutor', 'Smith', User.Roles.TUTOR, 150)
+        student = User.objects.create(username='@smithstudent', first_name='Sam', last_name='Smith', email='sam@example.org')
+        Student.objects.create(user=student)
+        self.assertEqual(search_user_ids('smith', role=User.Roles.STUDENT), [student.pk])
+        students = search(Student.objects.all(), 'smith', 'user', User.Roles.STUDENT)
+        self.assertEqual([row.user for row in students], [student])
+
+    def test_every_match_is_kept(self):
+        users = self._create_users('@smith', 'Smith', User.Roles.TUTOR, 150)
+        self.assertEqual(len(search_user_ids('smith')), 150)
+        self.assertEqual(search(User.objects.all(), 'smith').count(), len(users))
+
+    def test_search_without_matches_is_empty(self):
+        self.assertFalse(search(User.objects.all(), 'nobody').exists())
+
+    def _create_users(self, prefix, last_name, role, count):
+        users = User.objects.bulk_create([
+            User(username=f'{prefix}{index}', first_name='Pat', last_name=last_name, email=f'{prefix[1:]}{index}@example.org', role=role)
+            for index in range(count)
+        ])
+        rebuild_search_index()
+        return users
@@ -0,0 +1,82 @@
+from decimal import Decimal
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from tutorials.models import User, Student, Tutor, Session, TutorSession, StudentSession, ProgrammingLanguage, Invoice
+from tutorials.services import send_invoices
+
+class TestSendInvoicesService(TestCase):
+    """Tests for the send_invoices billing run."""
+
+    fixtures = [
+        'tutorials/tests/fixtures/default_user.json',
+        'tutorials/tests/fixtures/other_users.json'
+    ]
+
+    def setUp(self):
+        self.tutor = Tutor.objects.create(user=User.objects.get(username='@petrapickles'))
+        self.language = ProgrammingLanguage.objects.create(name='Python')
+
+    def test_invoices_are_priced_like_a_saved_invoice(self):
+        short = self._create_student_session(duration_hours=1)
+        long = self._create_student_session(duration_hours=2)
+        send_invoices()
+        self.assertEqual(Invoice.objects.get(session=short).amount, Decimal('30.00'))
+        self.assertEqual(Invoice.objects.get(session=long).amount, Decimal('50.00'))
+        saved = Invoice.objects.create(session=long)
+        batched = Invoice.objects.filter(session=long).exclude(pk=saved.pk).get()
+        self.assertEqual(batched.amount, saved.amount)
+        self.assertEqual(batched.due_date, saved.due_date)
+
+    def test_sessions_move_to_payment_pending(self):
+        student_session = self._create_student_session()
+        invoices = send_invoices()
+        self.assertEqual(len(invoices), 1)
+        student_session.refresh_from_db()
+        self.assertEqual(student_session.status, 'Payment Pending')
+
+    def test_run_is_safe_to_repeat(self):
+        self._create_student_session()
+        send_invoices()
+        self.assertEqual(send_invoices(), [])
+        self.assertEqual(Invoice.objects.count(), 1)
+
+    def test_sessions_in_other_statuses_are_skipped(self):
+        self._create_student_session(status='Approved')
+        self.assertEqual(send_invoices(), [])
+
+    def test_run_can_be_limited_to_a_queryset(self):
+        selected = self._create_student_session()
+        self._create_student_session()
+        send_invoices(StudentSession.objects.filter(pk=selected.pk))
+        self.assertEqual(list(Invoice.objects.values_list('session_id', flat=True)), [selected.pk])
+
+    def test_query_count_does_not_grow_with_the_run(self):
+        self._create_student_session()
+        with CaptureQueriesContext(connection) as small_run:
+            send_invoices()
+        for _ in range(20):
+            self._create_student_session()
+        with CaptureQueriesContext(connection) as large_run:
+            send_invoices()
+        self.assertEqual(len(small_run), len(large_run))
+
+    def _create_student_session(self, duration_hours=2, status='Send Invoice'):
+        index = User.objects.count()
+        user = User.objects.create(
+            username=f'@billedstudent{index}',
+            first_name='Billed',
+            last_name='Student',
+            email=f'billedstudent{index}@example.org',
+        )
+        student = Student.objects.create(user=user)
+        session, _ = Session.objects.get_or_create(
+            programming_language=self.language,
+            level='beginner',
+            season='Fall',
+            year=2024,
+            frequency='Weekly',
+            duration_hours=duration_hours
+        )
+        tutor_session, _ = TutorSession.objects.get_or_create(tutor=self.tutor, session=session)
+        return StudentSession.objects.create(student=student, tutor_session=tutor_session, status=status)
@@ -0,0 +1,53 @@
+from datetime import date
+from django.test import TestCase
+from tutorials.models import Term
+from tutorials import terms
+from tutorials.terms import get_terms, invalidate_terms, term_dates, term_years
+
+class TestTerms(TestCase):
+    """Tests for the term calendar helpers."""
+
+    def setUp(self):
+        # The calendar cache outlives the test transaction, so start and end with it empty
+        invalidate_terms()
+        self.addCleanup(invalidate_terms)
+
+    def test_calendar_holds_the_migrated_terms(self):
+        self.assertEqual(term_dates(2024, 'Fall'), (date(2024, 9, 16), date(2024, 12, 13)))
+        self.assertEqual(term_dates(2026, 'Summer'), (date(2026, 5, 4), date(2026, 6, 19)))
+        self.assertEqual(term_years(), [2024, 2025, 2026])
+
+    def test_unscheduled_term_has_no_dates(self):
+        self.assertIsNone(term_dates(2030, 'Fall'))
+
+    def test_lookups_do_not_query_once_loaded(self):
+        get_terms()
+        with self.assertNumQueries(0):
+            term_dates(2025, 'Spring')
+            term_years()
+
+    def test_calendar_is_read_only(self):
+        with self.assertRaises(TypeError):
+            get_terms()[(2030, 'Fall')] = (date(2030, 9, 16), date(2030, 12, 13))
+
+    def test_new_term_is_picked_up(self):
+        get_terms()
+        Term.objects.create(season='Spring', year=2027, start_date=date(2027, 1, 4), weeks=11)
+        self.assertEqual(term_dates(2027, 'Spring'), (date(2027, 1, 4), date(2027, 3, 26)))
+        self.assertEqual(term_years(), [2024, 2025, 2026, 2027])
+
+    def test_changed_and_deleted_terms_are_picked_up(self):
+        get_terms()
+        term = Term.objects.get(season='Fall', year=2026)
+        term.weeks = 10
+        term.save()
+        self.assertEqual(term_dates(2026, 'Fall'), (date(2026, 9, 14), date(2026, 11, 27)))
+        term.delete()
+        self.assertIsNone(term_dates(2026, 'Fall'))
+
+    def test_calendar_loaded_before_the_change_commits_is_discarded(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            Term.objects.create(season='Spring', year=2027, start_date=date(2027, 1, 4), weeks=11)
+            # Another connection reloading the calendar before the commit still reads the old terms
+            terms._terms = terms.MappingProxyType({})
+        self.assertEqual(term_dates(2027, 'Spring'), (date(2027, 1, 4), date(2027, 3, 26)))
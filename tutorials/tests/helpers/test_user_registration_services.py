@@ -0,0 +1,68 @@
+from django.contrib.auth.hashers import make_password
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from tutorials.helpers import get_admin_statistics
+from tutorials.models import Admin, ProgrammingLanguage, Student, Tutor, User
+from tutorials.search import search_user_ids
+from tutorials.services import build_user, import_users, register_user
+
+class TestUserRegistrationServices(TestCase):
+    """Tests for creating users with their role profiles."""
+
+    def setUp(self):
+        cache.clear()
+        self.python = ProgrammingLanguage.objects.create(name='Python')
+        self.java = ProgrammingLanguage.objects.create(name='Java')
+
+    def test_build_user_sets_the_role_and_password_before_insert(self):
+        user = build_user('@newtutor', 'New', 'Tutor', 'NewTutor@EXAMPLE.org', User.Roles.TUTOR, password='Password123')
+        self.assertIsNone(user.pk)
+        self.assertEqual(user.role, User.Roles.TUTOR)
+        self.assertEqual(user.email, 'NewTutor@example.org')
+        self.assertEqual(user.gravatar_hash, User.hash_email('NewTutor@example.org'))
+        self.assertTrue(user.check_password('Password123'))
+
+    def test_build_user_without_a_password_leaves_it_unusable(self):
+        self.assertFalse(build_user('@newuser', 'New', 'User', 'new@example.org', User.Roles.STUDENT).has_usable_password())
+
+    def test_build_user_keeps_a_password_hash(self):
+        password_hash = make_password('Password123')
+        user = build_user('@newuser', 'New', 'User', 'new@example.org', User.Roles.STUDENT, password_hash=password_hash)
+        self.assertEqual(user.password, password_hash)
+
+    def test_register_user_writes_the_user_row_once(self):
+        user = build_user('@newtutor', 'New', 'Tutor', 'newtutor@example.org', User.Roles.TUTOR, password='Password123')
+        with CaptureQueriesContext(connection) as queries:
+            register_user(user, [self.python, self.java])
+        self.assertFalse([query for query in queries if query['sql'].startswith('UPDATE "tutorials_user"')])
+        self.assertEqual(Tutor.objects.get(user=user).expertise_list(), 'Python, Java')
+        self.assertEqual(User.objects.get(pk=user.pk).role, User.Roles.TUTOR)
+
+    def test_register_user_creates_the_profile_of_each_role(self):
+        student = register_user(build_user('@newstudent', 'New', 'Student', 'student@example.org', User.Roles.STUDENT))
+        admin = register_user(build_user('@newadmin', 'New', 'Admin', 'admin@example.org', User.Roles.ADMIN))
+        self.assertTrue(Student.objects.filter(user=student).exists())
+        self.assertTrue(Admin.objects.filter(user=admin).exists())
+
+    def test_import_users_creates_users_profiles_and_expertise(self):
+        users = import_users(
+            [
+                build_user('@importtutor', 'Ada', 'Lovelace', 'ada@example.org', User.Roles.TUTOR),
+                build_user('@importstudent', 'Alan', 'Turing', 'alan@example.org', User.Roles.STUDENT),
+                build_user('@importadmin', 'Grace', 'Hopper', 'grace@example.org', User.Roles.ADMIN),
+            ],
+            {'@importtutor': [self.java.pk]},
+        )
+        self.assertTrue(all(user.pk for user in users))
+        tutor = Tutor.objects.get(user__username='@importtutor')
+        self.assertEqual(tutor.expertise_list(), 'Java')
+        self.assertTrue(Student.objects.filter(user__username='@importstudent').exists())
+        self.assertTrue(Admin.objects.filter(user__username='@importadmin').exists())
+
+    def test_import_users_refreshes_the_search_index_and_statistics(self):
+        get_admin_statistics()
+        users = import_users([build_user('@importtutor', 'Ada', 'Lovelace', 'ada@example.org', User.Roles.TUTOR)])
+        self.assertEqual(get_admin_statistics()['tutor_count'], 1)
+        self.assertEqual(search_user_ids('Lovelace'), [users[0].pk])
@@ -1,4 +1,6 @@
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from django.utils.timezone import now, timedelta
 from tutorials.models import Invoice, StudentSession, TutorSession, Session, Student, Tutor, ProgrammingLanguage, User
 from decimal import Decimal
@@ -78,6 +80,24 @@ class InvoiceTestCase(TestCase):
         self.assertEqual(invoice.payment_status, 'PAID')
         self.assertEqual(invoice.payment_date, now().date())
 
+    def test_mark_as_paid_updates_only_the_payment_columns(self):
+        invoice = Invoice.objects.get(pk=Invoice.objects.create(session=self.student_session).pk)
+        with CaptureQueriesContext(connection) as queries:
+            invoice.mark_as_paid()
+        self.assertEqual(len(queries), 1)
+        self.assertTrue(queries[0]['sql'].startswith('UPDATE'))
+        self.assertNotIn('"amount"', queries[0]['sql'])
+
+    def test_saving_an_existing_invoice_does_not_reprice_it(self):
+        invoice = Invoice.objects.create(session=self.student_session)
+        self.session.duration_hours = 2
+        self.session.save()
+        invoice = Invoice.objects.get(pk=invoice.pk)
+        invoice.notes = 'Reminder sent'
+        invoice.save()
+        invoice.refresh_from_db()
+        self.assertEqual(invoice.amount, Decimal('30.00'))
+
     def test_invoice_due_date_if_not_set(self):
         # Create an Invoice without a due_date
         invoice = Invoice.objects.create(session=self.student_session, due_date=None)
@@ -1,5 +1,7 @@
 from django.core.exceptions import ValidationError
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from tutorials.models import Session, RequestedStudentSession, User, Student, TutorSession, Tutor, ProgrammingLanguage
 from django.utils import timezone
 
@@ -75,6 +77,68 @@ class RequestedStudentSessionModelTestCase(TestCase):
         new_request.save()
         self.assertIn(tutor_session, new_request.available_tutor_sessions.all())
 
+    def test_available_tutor_sessions_only_include_matching_sessions(self):
+        tutor = Tutor.objects.create(user=User.objects.get(username='@petrapickles'))
+        other_session = Session.objects.create(
+            programming_language=self.language,
+            level='advanced',
+            season='Fall',
+            year=2024,
+            frequency='Weekly',
+            duration_hours=2
+        )
+        matching = TutorSession.objects.create(tutor=tutor, session=self.session)
+        not_matching = TutorSession.objects.create(tutor=tutor, session=other_session)
+
+        self.requested_session.save()
+        available = self.requested_session.available_tutor_sessions.all()
+        self.assertIn(matching, available)
+        self.assertNotIn(not_matching, available)
+
+    def test_matching_query_count_does_not_grow_with_tutor_sessions(self):
+        self._create_matching_tutor_sessions(2)
+        with CaptureQueriesContext(connection) as few:
+            self.requested_session.save()
+
+        self._create_matching_tutor_sessions(20, offset=2)
+        with CaptureQueriesContext(connection) as many:
+            self.requested_session.save()
+
+        self.assertEqual(len(few), len(many))
+        self.assertEqual(self.requested_session.available_tutor_sessions.count(), 22)
+
+    def test_new_tutor_session_is_added_to_matching_requests(self):
+        tutor = Tutor.objects.create(user=User.objects.get(username='@petrapickles'))
+        tutor_session = TutorSession.objects.create(tutor=tutor, session=self.session)
+        self.assertIn(tutor_session, self.requested_session.available_tutor_sessions.all())
+
+    def test_changing_session_level_removes_stale_matches(self):
+        tutor = Tutor.objects.create(user=User.objects.get(username='@petrapickles'))
+        tutor_session_session = Session.objects.create(
+            programming_language=self.language,
+            level='beginner',
+            season='Fall',
+            year=2024,
+            frequency='Bi-Weekly',
+            duration_hours=1
+        )
+        tutor_session = TutorSession.objects.create(tutor=tutor, session=tutor_session_session)
+        self.assertIn(tutor_session, self.requested_session.available_tutor_sessions.all())
+
+        tutor_session_session.level = 'advanced'
+        tutor_session_session.save()
+        self.assertNotIn(tutor_session, self.requested_session.available_tutor_sessions.all())
+
+        tutor_session_session.level = 'beginner'
+        tutor_session_session.save()
+        self.assertIn(tutor_session, self.requested_session.available_tutor_sessions.all())
+
+    def test_deleted_tutor_session_is_removed_from_matches(self):
+        tutor = Tutor.objects.create(user=User.objects.get(username='@petrapickles'))
+        tutor_session = TutorSession.objects.create(tutor=tutor, session=self.session)
+        tutor_session.delete()
+        self.assertFalse(self.requested_session.available_tutor_sessions.exists())
+
     def test_str_method(self):
         expected = f"Request by {self.student.user.full_name()} for {self.session} - Pending"
         self.assertEqual(str(self.requested_session), expected)
@@ -112,6 +176,14 @@ class RequestedStudentSessionModelTestCase(TestCase):
         self._assert_requested_session_is_valid()
         self.assertNotEqual(new_request.session, self.requested_session.session)
 
+    def _create_matching_tutor_sessions(self, count, offset=0):
+        for index in range(offset, offset + count):
+            tutor = Tutor.objects.create(user=User.objects.create(
+                username=f'@matchtutor{index}',
+                email=f'matchtutor{index}@example.org'
+            ))
+            TutorSession.objects.create(tutor=tutor, session=self.session)
+
     def _assert_requested_session_is_valid(self):
         try:
             self.requested_session.full_clean()
@@ -1,7 +1,8 @@
 from django.core.exceptions import ValidationError
 from django.test import TestCase
-from tutorials.models import Session, ProgrammingLanguage
-from datetime import datetime, timedelta
+from tutorials.models import Session, ProgrammingLanguage, Term
+from tutorials.terms import invalidate_terms
+from datetime import date, datetime, timedelta
 
 class SessionModelTestCase(TestCase):
     """Unit tests for the Session model."""
@@ -67,7 +68,7 @@ class SessionModelTestCase(TestCase):
     def test_default_season_is_fall(self):
         new_session = Session.objects.create(
             programming_language=self.language,
-            level='beginner',
+            level='intermediate',
             year=2024,
             frequency='Weekly',
             duration_hours=2
@@ -94,6 +95,22 @@ class SessionModelTestCase(TestCase):
         self.session.year = 2027
         self._assert_session_is_invalid()
 
+    def test_year_can_be_after_2026_once_its_term_is_scheduled(self):
+        self.addCleanup(invalidate_terms)
+        Term.objects.create(season='Fall', year=2027, start_date=date(2027, 9, 13), weeks=12)
+        self.session.year = 2027
+        self._assert_session_is_valid()
+        self.session.save()
+        self.assertEqual(self.session.start_day, date(2027, 9, 13))
+        self.assertEqual(self.session.end_day, date(2027, 12, 10))
+
+    def test_season_must_have_a_scheduled_term(self):
+        self.addCleanup(invalidate_terms)
+        Term.objects.filter(season='Summer', year=2025).delete()
+        self.session.season = 'Summer'
+        self.session.year = 2025
+        self._assert_session_is_invalid()
+
     def test_year_must_not_be_blank(self):
         self.session.year = None
         self._assert_session_is_invalid()
@@ -117,7 +134,7 @@ class SessionModelTestCase(TestCase):
     def test_default_frequency_is_weekly(self):
         new_session = Session.objects.create(
             programming_language=self.language,
-            level='beginner',
+            level='intermediate',
             season='Fall',
             year=2024,
             duration_hours=2
@@ -127,7 +144,7 @@ class SessionModelTestCase(TestCase):
     def test_default_duration_hours_is_2(self):
         new_session = Session.objects.create(
             programming_language=self.language,
-            level='beginner',
+            level='intermediate',
             season='Fall',
             year=2024,
             frequency='Weekly',
@@ -146,12 +163,28 @@ class SessionModelTestCase(TestCase):
         self.session.duration_hours = None
         self._assert_session_is_invalid()
 
-    def test_is_available_default_is_true(self):
-        self.assertEqual(self.session.is_available, True)
+    def test_catalog_fields_must_be_unique(self):
+        duplicate = Session(
+            programming_language=self.language,
+            level='beginner',
+            season='Fall',
+            year=2024,
+            frequency='Weekly',
+            duration_hours=2
+        )
+        with self.assertRaises(ValidationError):
+            duplicate.full_clean()
 
-    def test_is_available_can_be_false(self):
-        self.session.is_available = False
-        self._assert_session_is_valid()
+    def test_sessions_can_differ_in_one_catalog_field(self):
+        Session.objects.create(
+            programming_language=self.language,
+            level='beginner',
+            season='Fall',
+            year=2024,
+            frequency='Bi-Weekly',
+            duration_hours=2
+        )
+        self.assertEqual(Session.objects.count(), 2)
 
     def test_start_day_and_end_day_are_set_on_creation(self):
         self.assertIsNotNone(self.session.start_day)
@@ -161,6 +194,23 @@ class SessionModelTestCase(TestCase):
         expected = f"{self.session.programming_language.name} ({self.session.level}) - {self.session.season} {self.session.year} - {self.session.frequency} - {self.session.start_day} to {self.session.end_day}"
         self.assertEqual(str(self.session), expected)
 
+    def test_label_is_stored_on_save(self):
+        session = Session.objects.get(pk=self.session.pk)
+        self.assertEqual(session.label, self.session.build_label())
+
+    def test_label_follows_session_changes(self):
+        self.session.level = 'advanced'
+        self.session.save()
+        session = Session.objects.get(pk=self.session.pk)
+        self.assertIn('(advanced)', session.label)
+
+    def test_label_follows_language_rename(self):
+        self.language.name = 'Python 3'
+        self.language.save()
+        session = Session.objects.get(pk=self.session.pk)
+        self.assertTrue(session.label.startswith('Python 3 (beginner)'))
+        self.assertEqual(str(session), session.label)
+
     def _assert_session_is_valid(self):
         try:
             self.session.full_clean()
@@ -34,8 +34,7 @@ class StudentSessionTestCase(TestCase):
             frequency='Weekly',
             duration_hours=2,
             start_day=datetime(2024, 9, 16),
-            end_day=datetime(2024, 12, 16),
-            is_available=True
+            end_day=datetime(2024, 12, 16)
         )
 
         # Create a tutor session
@@ -54,7 +53,7 @@ class StudentSessionTestCase(TestCase):
         self.assertEqual(student_session.student, self.student)
         self.assertEqual(student_session.tutor_session, self.tutor_session)
         self.assertEqual(student_session.status, 'Send Invoice')
-        self.assertFalse(self.tutor_session.session.is_available)  # Ensure the session is no longer available
+        self.assertFalse(self.tutor_session.is_available)  # Ensure the tutor session is no longer available
 
     def test_unique_together_constraint(self):
         """Test the unique_together constraint for StudentSession."""
@@ -96,8 +95,8 @@ class StudentSessionTestCase(TestCase):
 
     def test_save_method(self):
         """Test the save method of StudentSession."""
-        # Verify the session is available before creating a StudentSession
-        self.assertTrue(self.session.is_available)
+        # Verify the tutor session is available before creating a StudentSession
+        self.assertTrue(self.tutor_session.is_available)
 
         # Create a StudentSession
         student_session = StudentSession.objects.create(
@@ -106,9 +105,9 @@ class StudentSessionTestCase(TestCase):
             status='Approved'
         )
 
-        # Verify that the session is no longer available
-        self.session.refresh_from_db()
-        self.assertFalse(self.session.is_available)
+        # Verify that the tutor session is no longer available
+        self.tutor_session.refresh_from_db()
+        self.assertFalse(self.tutor_session.is_available)
 
     def test_student_session_defaults(self):
         """Test default values in StudentSession."""
@@ -1,5 +1,7 @@
 from django.core.exceptions import ValidationError
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from tutorials.models import Session, StudentSession, User, Student, TutorSession, Tutor, ProgrammingLanguage
 from django.utils import timezone
 
@@ -48,8 +50,8 @@ class StudentSessionModelTestCase(TestCase):
     def test_default_status_is_send_invoice(self):
         self.assertEqual(self.student_session.status, 'Send Invoice')
 
-    def test_session_marked_unavailable_on_save(self):
-        self.assertFalse(self.student_session.tutor_session.session.is_available)
+    def test_tutor_session_marked_unavailable_on_save(self):
+        self.assertFalse(self.student_session.tutor_session.is_available)
 
     def test_str_method(self):
         expected = f'{self.student.user.full_name()} -> {self.tutor_session}'
@@ -114,6 +116,49 @@ class StudentSessionModelTestCase(TestCase):
         updated_session = StudentSession.objects.get(id=self.student_session.id)
         self.assertEqual(updated_session.tutor_session, new_tutor_session)
 
+    def test_new_enrollment_updates_only_the_availability_of_its_tutor_session(self):
+        other_student = Student.objects.create(user=User.objects.get(username='@peterpickles'))
+        self.tutor_session.is_available = True
+        self.tutor_session.save()
+        with CaptureQueriesContext(connection) as queries:
+            StudentSession.objects.create(student=other_student, tutor_session=self.tutor_session)
+        session_writes = [query['sql'] for query in queries if query['sql'].startswith('UPDATE "tutorials_')]
+        self.assertEqual(len(session_writes), 1)
+        self.assertTrue(session_writes[0].startswith('UPDATE "tutorials_tutorsession" SET "is_available" = '))
+        self.assertNotIn('"label"', session_writes[0])
+        self.assertFalse(TutorSession.objects.get(pk=self.tutor_session.pk).is_available)
+
+    def test_status_change_writes_only_the_enrollment(self):
+        self.student_session.status = 'Approved'
+        with CaptureQueriesContext(connection) as queries:
+            self.student_session.save()
+        self.assertEqual(len(queries), 1)
+        self.assertTrue(queries[0]['sql'].startswith('UPDATE "tutorials_studentsession"'))
+
+    def test_removing_the_last_enrollment_makes_the_tutor_session_available(self):
+        self.student_session.delete()
+        self.assertTrue(TutorSession.objects.get(pk=self.tutor_session.pk).is_available)
+
+    def test_session_stays_taken_while_another_enrollment_remains(self):
+        other_student = Student.objects.create(user=User.objects.get(username='@peterpickles'))
+        StudentSession.objects.create(student=other_student, tutor_session=self.tutor_session)
+        self.student_session.delete()
+        self.assertFalse(TutorSession.objects.get(pk=self.tutor_session.pk).is_available)
+
+    def test_enrollment_does_not_take_another_tutor_of_the_same_session(self):
+        other_tutor = Tutor.objects.create(user=User.objects.get(username='@peterpickles'))
+        other_tutor_session = TutorSession.objects.create(tutor=other_tutor, session=self.session)
+        self.assertFalse(TutorSession.objects.get(pk=self.tutor_session.pk).is_available)
+        self.assertTrue(TutorSession.objects.get(pk=other_tutor_session.pk).is_available)
+
+    def test_removing_an_enrollment_releases_only_its_tutor_session(self):
+        other_tutor = Tutor.objects.create(user=User.objects.get(username='@peterpickles'))
+        other_tutor_session = TutorSession.objects.create(tutor=other_tutor, session=self.session)
+        StudentSession.objects.create(student=self.student, tutor_session=other_tutor_session)
+        self.student_session.delete()
+        self.assertTrue(TutorSession.objects.get(pk=self.tutor_session.pk).is_available)
+        self.assertFalse(TutorSession.objects.get(pk=other_tutor_session.pk).is_available)
+
     def _assert_student_session_is_valid(self):
         try:
             self.student_session.full_clean()
@@ -0,0 +1,64 @@
+from datetime import date
+from django.core.exceptions import ValidationError
+from django.test import TestCase
+from tutorials.models import ProgrammingLanguage, Session, Term
+from tutorials.terms import invalidate_terms
+
+class TermModelTestCase(TestCase):
+    """Unit tests for the Term model."""
+
+    def setUp(self):
+        self.addCleanup(invalidate_terms)
+        self.term = Term.objects.create(season='Fall', year=2027, start_date=date(2027, 9, 13), weeks=12)
+
+    def test_valid_term(self):
+        self._assert_term_is_valid()
+
+    def test_season_must_be_valid_choice(self):
+        self.term.season = 'Winter'
+        self._assert_term_is_invalid()
+
+    def test_year_can_not_be_before_2024(self):
+        self.term.year = 2023
+        self._assert_term_is_invalid()
+
+    def test_weeks_can_not_be_less_than_1(self):
+        self.term.weeks = 0
+        self._assert_term_is_invalid()
+
+    def test_season_and_year_must_be_unique(self):
+        duplicate = Term(season='Fall', year=2027, start_date=date(2027, 9, 20), weeks=10)
+        with self.assertRaises(ValidationError):
+            duplicate.full_clean()
+
+    def test_end_date(self):
+        self.assertEqual(self.term.end_date, date(2027, 12, 10))
+
+    def test_str(self):
+        self.assertEqual(str(self.term), 'Fall 2027')
+
+    def test_changing_the_term_moves_its_sessions(self):
+        session = Session.objects.create(
+            programming_language=ProgrammingLanguage.objects.create(name='Python'),
+            level='beginner',
+            season='Fall',
+            year=2027,
+            duration_hours=2
+        )
+        self.term.start_date = date(2027, 9, 20)
+        self.term.weeks = 10
+        self.term.save()
+        session.refresh_from_db()
+        self.assertEqual((session.start_day, session.end_day), (date(2027, 9, 20), date(2027, 12, 3)))
+        self.assertEqual(session.label, session.build_label())
+        self.assertIn('2027-09-20 to 2027-12-03', session.label)
+
+    def _assert_term_is_valid(self):
+        try:
+            self.term.full_clean()
+        except ValidationError:
+            self.fail('Test term should be valid')
+
+    def _assert_term_is_invalid(self):
+        with self.assertRaises(ValidationError):
+            self.term.full_clean()
@@ -1,5 +1,8 @@
 from django.core.exceptions import ValidationError
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from tutorials.languages import invalidate_languages
 from tutorials.models import User, Tutor, ProgrammingLanguage
 
 class TutorModelTestCase(TestCase):
@@ -53,6 +56,22 @@ class TutorModelTestCase(TestCase):
     def test_expertise_list_method_empty(self):
         self.assertEqual(self.tutor.expertise_list(), '')
 
+    def test_expertise_list_method_reads_names_from_the_registry(self):
+        self.addCleanup(invalidate_languages)
+        self.tutor.expertise.add(self.language)
+        self.tutor.expertise_list()
+        with self.assertNumQueries(1):
+            self.assertEqual(self.tutor.expertise_list(), 'Python')
+
+    def test_expertise_list_method_reads_prefetched_languages(self):
+        self.addCleanup(invalidate_languages)
+        java = ProgrammingLanguage.objects.create(name='Java')
+        self.tutor.expertise.add(self.language, java)
+        self.tutor.expertise_list()
+        tutor = Tutor.objects.prefetch_related('expertise').get(pk=self.tutor.pk)
+        with self.assertNumQueries(0):
+            self.assertEqual(tutor.expertise_list(), 'Python, Java')
+
     def test_role_set_to_tutor_on_save(self):
         user = User.objects.create(
             username='@newtutor',
@@ -63,6 +82,18 @@ class TutorModelTestCase(TestCase):
         tutor = Tutor.objects.create(user=user)
         self.assertEqual(tutor.user.role, User.Roles.TUTOR)
 
+    def test_role_change_updates_only_the_role(self):
+        user = User.objects.get(username='@janedoe')
+        user.first_name = 'Unsaved'
+        with CaptureQueriesContext(connection) as queries:
+            Tutor.objects.create(user=user)
+        updates = [query['sql'] for query in queries if query['sql'].startswith('UPDATE "tutorials_user"')]
+        self.assertEqual(len(updates), 1)
+        self.assertNotIn('first_name', updates[0])
+        user.refresh_from_db()
+        self.assertEqual(user.role, User.Roles.TUTOR)
+        self.assertEqual(user.first_name, 'Jane')
+
     def test_role_updated_to_tutor_if_different(self):
         user = User.objects.create(
             username='@newtutor2',
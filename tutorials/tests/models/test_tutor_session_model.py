@@ -45,7 +45,7 @@ class TutorSessionModelTestCase(TestCase):
         new_tutor = Tutor.objects.create(user=new_user)
         new_session = Session.objects.create(
             programming_language=self.language,
-            level='beginner',
+            level='intermediate',
             season='Fall',
             year=2024,
             frequency='Weekly',
@@ -67,6 +67,24 @@ class TutorSessionModelTestCase(TestCase):
         expected = f"Tutor: {self.tutor.user.full_name()} - Session: {self.session}"
         self.assertEqual(str(self.tutor_session), expected)
 
+    def test_label_follows_tutor_rename(self):
+        self.user.first_name = 'Renamed'
+        self.user.save()
+        tutor_session = TutorSession.objects.get(pk=self.tutor_session.pk)
+        self.assertTrue(tutor_session.label.startswith(f'Tutor: Renamed {self.user.last_name}'))
+
+    def test_label_follows_session_changes(self):
+        self.session.level = 'advanced'
+        self.session.save()
+        tutor_session = TutorSession.objects.get(pk=self.tutor_session.pk)
+        self.assertIn('(advanced)', tutor_session.label)
+
+    def test_label_follows_language_rename(self):
+        self.language.name = 'Python 3'
+        self.language.save()
+        tutor_session = TutorSession.objects.get(pk=self.tutor_session.pk)
+        self.assertIn('Session: Python 3 (beginner)', tutor_session.label)
+
     def test_tutor_session_unique_together(self):
         with self.assertRaises(ValidationError):
             duplicate_tutor_session = TutorSession(
@@ -94,6 +112,13 @@ class TutorSessionModelTestCase(TestCase):
         self.tutor.expertise.add(self.language)
         self._assert_tutor_session_is_valid()
 
+    def test_is_available_default_is_true(self):
+        self.assertTrue(self.tutor_session.is_available)
+
+    def test_is_available_can_be_false(self):
+        self.tutor_session.is_available = False
+        self._assert_tutor_session_is_valid()
+
     def test_tutor_session_creation_date(self):
         self.assertIsNotNone(self.tutor_session.created_at)
         self.assertLessEqual(self.tutor_session.created_at.date(), timezone.now().date())
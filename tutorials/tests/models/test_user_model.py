@@ -1,7 +1,9 @@
 """Unit tests for the User model."""
 from django.core.exceptions import ValidationError
 from django.test import TestCase
+from libgravatar import Gravatar
 from tutorials.models import User
+from unittest.mock import patch
 
 class UserModelTestCase(TestCase):
     """Unit tests for the User model."""
@@ -173,6 +175,25 @@ class UserModelTestCase(TestCase):
         expected_gravatar_url = self._gravatar_url(size=60)
         self.assertEqual(actual_gravatar_url, expected_gravatar_url)
 
+    def test_gravatar_hash_is_stored_when_email_is_saved(self):
+        self.user.email = 'Changed@Example.org'
+        self.user.save(update_fields=['email'])
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.gravatar_hash, User.hash_email('changed@example.org'))
+        self.assertEqual(self.user.gravatar_hash, Gravatar('changed@example.org').email_hash)
+
+    def test_gravatar_does_not_hash_the_email(self):
+        self.user.save()
+        with patch('tutorials.models.md5_hash') as md5_hash:
+            for size in [120, 100, 60, 80]:
+                self.user.gravatar(size=size)
+        md5_hash.assert_not_called()
+
+    def test_gravatar_matches_libgravatar(self):
+        for size in [60, 80, 120]:
+            expected = Gravatar(self.user.email).get_image(size=size, default='mp')
+            self.assertEqual(self.user.gravatar(size=size), expected)
+
     def test_get_full_name_returns_full_name(self):
         self.assertEqual(self.user.get_full_name(), "John Doe")
 
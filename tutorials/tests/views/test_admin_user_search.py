@@ -0,0 +1,37 @@
+"""Tests of the full-text search in the admin change lists."""
+from django.test import TestCase
+from django.urls import reverse
+from tutorials.models import User
+
+class AdminUserSearchTestCase(TestCase):
+    """Tests of the full-text search in the admin change lists."""
+
+    fixtures = [
+        'tutorials/tests/fixtures/default_user.json',
+        'tutorials/tests/fixtures/other_users.json'
+    ]
+
+    def setUp(self):
+        self.url = reverse('admin:tutorials_user_changelist')
+        self.admin_user = User.objects.get(username='@johndoe')
+        self.admin_user.is_staff = True
+        self.admin_user.is_superuser = True
+        self.admin_user.save()
+        # Sorted first by name, but only the email matches the search
+        self.fan = User.objects.create(username='@aaron', first_name='Aaron', last_name='Aaron', email='pickles.fan@example.org')
+        self.client.login(username=self.admin_user.username, password='Password123')
+
+    def test_search_results_are_ranked(self):
+        response = self.client.get(self.url, {'q': 'pickles'})
+        usernames = [user.username for user in response.context['cl'].result_list]
+        self.assertEqual(sorted(usernames[:2]), ['@peterpickles', '@petrapickles'])
+        self.assertEqual(usernames[2:], ['@aaron'])
+
+    def test_picked_column_overrides_the_rank(self):
+        response = self.client.get(self.url, {'q': 'pickles', 'o': '2'})
+        emails = [user.email for user in response.context['cl'].result_list]
+        self.assertEqual(emails, ['peterpickles@example.org', 'petrapickles@example.org', 'pickles.fan@example.org'])
+
+    def test_list_without_a_search_keeps_the_default_ordering(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.context['cl'].result_list[0], self.fan)
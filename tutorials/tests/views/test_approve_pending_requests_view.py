@@ -0,0 +1,76 @@
+"""Tests of the approve pending requests view."""
+from unittest.mock import patch
+from django.contrib import messages
+from django.core.exceptions import ValidationError
+from django.test import TestCase
+from django.urls import reverse
+from tutorials.models import User, Student, Tutor, Session, TutorSession, RequestedStudentSession, ProgrammingLanguage, StudentSession
+
+class ApprovePendingRequestsViewTestCase(TestCase):
+    """Tests of the approve pending requests view."""
+
+    fixtures = [
+        'tutorials/tests/fixtures/default_user.json',
+        'tutorials/tests/fixtures/other_users.json'
+    ]
+
+    def setUp(self):
+        self.admin_user = User.objects.get(username='@johndoe')
+        self.student_user = User.objects.get(username='@janedoe')
+        self.tutor_user = User.objects.get(username='@petrapickles')
+
+        self.student = Student.objects.create(user=self.student_user)
+        self.tutor = Tutor.objects.create(user=self.tutor_user)
+
+        self.language = ProgrammingLanguage.objects.create(name='Python')
+        self.session = Session.objects.create(
+            programming_language=self.language,
+            level='beginner',
+            season='Fall',
+            year=2024,
+            frequency='Weekly',
+            duration_hours=2
+        )
+        self.tutor_session = TutorSession.objects.create(tutor=self.tutor, session=self.session)
+        self.requested_session = RequestedStudentSession.objects.create(student=self.student, session=self.session)
+        self.url = reverse('approve_pending_requests')
+
+    def test_approve_pending_requests_url(self):
+        self.assertEqual(self.url, '/pending-requests/approve/')
+
+    def test_post_redirects_when_not_logged_in(self):
+        response = self.client.post(self.url, {'request_ids': [self.requested_session.id]})
+        redirect_url = reverse('log_in') + f'?next={self.url}'
+        self.assertRedirects(response, redirect_url, status_code=302, target_status_code=200)
+        self.assertEqual(StudentSession.objects.count(), 0)
+
+    def test_post_redirects_when_student(self):
+        self.client.login(username=self.student_user.username, password='Password123')
+        response = self.client.post(self.url, {'request_ids': [self.requested_session.id]})
+        self.assertRedirects(response, reverse('dashboard'), status_code=302, target_status_code=200)
+        self.assertEqual(StudentSession.objects.count(), 0)
+
+    def test_get_does_not_approve(self):
+        self.client.login(username=self.admin_user.username, password='Password123')
+        response = self.client.get(self.url, {'request_ids': [self.requested_session.id]})
+        self.assertRedirects(response, reverse('pending_requests'), status_code=302, target_status_code=200)
+        self.assertEqual(StudentSession.objects.count(), 0)
+
+    def test_successful_bulk_approval(self):
+        self.client.login(username=self.admin_user.username, password='Password123')
+        response = self.client.post(self.url, {'request_ids': [self.requested_session.id, 99999, 'invalid']}, follow=True)
+        self.assertRedirects(response, reverse('pending_requests'), status_code=302, target_status_code=200)
+        student_session = StudentSession.objects.get()
+        self.assertEqual(student_session.student, self.student)
+        self.assertEqual(student_session.tutor_session, self.tutor_session)
+        self.assertFalse(RequestedStudentSession.objects.exists())
+        levels = [message.level for message in response.context['messages']]
+        self.assertEqual(levels, [messages.SUCCESS, messages.WARNING])
+
+    def test_bulk_approval_losing_a_tutor_session_reports_an_error(self):
+        self.client.login(username=self.admin_user.username, password='Password123')
+        taken = ValidationError("A tutor session has already been taken.")
+        with patch('tutorials.services.approve_sessions', side_effect=taken):
+            response = self.client.post(self.url, {'request_ids': [self.requested_session.id]}, follow=True)
+        self.assertRedirects(response, reverse('pending_requests'), status_code=302, target_status_code=200)
+        self.assertEqual([message.level for message in response.context['messages']], [messages.ERROR])
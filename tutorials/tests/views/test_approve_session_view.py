@@ -98,7 +98,7 @@ class ApproveSessionViewTestCase(TestCase):
         student_session = StudentSession.objects.latest('id')
         self.assertEqual(student_session.student, self.student)
         self.assertEqual(student_session.tutor_session, self.tutor_session)
-        self.assertFalse(student_session.tutor_session.session.is_available)
+        self.assertFalse(student_session.tutor_session.is_available)
 
     def test_approve_session_with_already_approved_request(self):
         # First approve the session
@@ -108,3 +108,13 @@ class ApproveSessionViewTestCase(TestCase):
         # Try to approve again
         response = self.client.post(self.url)
         self.assertEqual(response.status_code, 404)  # Should return 404 as request no longer exists
+
+    def test_approve_session_for_a_taken_tutor_session_shows_an_error(self):
+        other_student = Student.objects.create(user=User.objects.get(username='@peterpickles'))
+        StudentSession.objects.create(student=other_student, tutor_session=self.tutor_session)
+        self.client.login(username=self.admin_user.username, password='Password123')
+        response = self.client.post(self.url, follow=True)
+        self.assertRedirects(response, reverse('available_tutors', kwargs={'request_id': self.requested_session.id}))
+        messages = [str(message) for message in response.context['messages']]
+        self.assertEqual(messages, ['This tutor session has already been taken.'])
+        self.assertTrue(RequestedStudentSession.objects.filter(pk=self.requested_session.pk).exists())
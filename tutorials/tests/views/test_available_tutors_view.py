@@ -1,4 +1,6 @@
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from tutorials.models import User, Student, Tutor, Session, TutorSession, RequestedStudentSession, ProgrammingLanguage
 
@@ -123,6 +125,35 @@ class AvailableTutorsViewTestCase(TestCase):
         response = self.client.get(f"{self.url}?page=999")
         self.assertEqual(len(response.context['tutors']), 2)  # Should show last page
 
+    def test_get_available_tutors_does_not_write(self):
+        self.client.login(username=self.admin_user.username, password='Password123')
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        for query in queries:
+            self.assertTrue(query['sql'].startswith('SELECT'), query['sql'])
+
+    def test_available_tutors_query_count_is_constant_across_pages(self):
+        self.client.login(username=self.admin_user.username, password='Password123')
+        for i in range(15):
+            tutor = Tutor.objects.create(
+                user=User.objects.create(
+                    username=f'@tutor{i}',
+                    first_name=f'Tutor{i}',
+                    last_name='Test',
+                    email=f'tutor{i}@example.org'
+                )
+            )
+            TutorSession.objects.create(tutor=tutor, session=self.session)
+
+        with CaptureQueriesContext(connection) as first_page:
+            response = self.client.get(self.url)
+        self.assertEqual(len(response.context['tutors']), 10)
+        with CaptureQueriesContext(connection) as second_page:
+            response = self.client.get(f"{self.url}?page=2")
+        self.assertEqual(len(response.context['tutors']), 6)
+        self.assertEqual(len(first_page), len(second_page))
+
     def test_available_tutors_post_request(self):
         self.client.login(username=self.admin_user.username, password='Password123')
         response = self.client.post(self.url)
@@ -1,4 +1,5 @@
 """Tests of the dashboard view."""
+from django.core.cache import cache
 from django.test import TestCase
 from django.urls import reverse
 from tutorials.models import User, Student, Tutor
@@ -19,6 +20,7 @@ class DashboardViewTestCase(TestCase):
         
         Student.objects.create(user=self.student_user)
         Tutor.objects.create(user=self.tutor_user)
+        cache.clear()
 
     def test_dashboard_url(self):
         self.assertEqual(self.url,'/dashboard/')
@@ -49,3 +51,11 @@ class DashboardViewTestCase(TestCase):
         self.assertEqual(response.status_code, 200)
         self.assertTemplateUsed(response, 'admin_dashboard.html')
         self.assertEqual(response.context['user'], self.admin_user)
+
+    def test_get_dashboard_for_admin_shows_statistics(self):
+        self.client.login(username=self.admin_user.username, password='Password123')
+        response = self.client.get(self.url)
+        statistics = response.context['statistics']
+        self.assertEqual(statistics['total_users'], User.objects.count())
+        self.assertEqual(statistics['admin_count'], 1)
+        self.assertEqual(statistics['pending_requests'], 0)
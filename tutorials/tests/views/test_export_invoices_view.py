@@ -0,0 +1,81 @@
+"""Tests of the export invoices view."""
+import csv
+import io
+import json
+from django.test import TestCase
+from django.urls import reverse
+from tutorials.models import User, Student, StudentSession, Session, TutorSession, Tutor, ProgrammingLanguage, Invoice
+
+class ExportInvoicesViewTestCase(TestCase):
+    """Tests of the export invoices view."""
+
+    fixtures = [
+        'tutorials/tests/fixtures/default_user.json',
+        'tutorials/tests/fixtures/other_users.json'
+    ]
+
+    def setUp(self):
+        self.url = reverse('export_invoices', kwargs={'export_format': 'csv'})
+        self.admin_user = User.objects.get(username='@johndoe')
+        self.student_user = User.objects.get(username='@janedoe')
+        student = Student.objects.create(user=self.student_user)
+        tutor = Tutor.objects.create(user=User.objects.get(username='@petrapickles'))
+        language = ProgrammingLanguage.objects.create(name='Python')
+        self.sessions = []
+        for frequency in ['Weekly', 'Bi-Weekly']:
+            session = Session.objects.create(
+                programming_language=language,
+                level='beginner',
+                season='Fall',
+                year=2024,
+                frequency=frequency,
+                duration_hours=2
+            )
+            tutor_session = TutorSession.objects.create(tutor=tutor, session=session)
+            student_session = StudentSession.objects.create(student=student, tutor_session=tutor_session)
+            Invoice.objects.create(session=student_session)
+            self.sessions.append(session)
+
+    def test_export_invoices_url(self):
+        self.assertEqual(self.url, '/invoices/export/csv/')
+
+    def test_export_redirects_when_not_logged_in(self):
+        response = self.client.get(self.url)
+        redirect_url = reverse('log_in') + f'?next={self.url}'
+        self.assertRedirects(response, redirect_url, status_code=302, target_status_code=200)
+
+    def test_export_redirects_when_not_admin(self):
+        self.client.login(username=self.student_user.username, password='Password123')
+        response = self.client.get(self.url)
+        self.assertRedirects(response, reverse('dashboard'), status_code=302, target_status_code=200)
+
+    def test_export_unknown_format_is_not_found(self):
+        self.client.login(username=self.admin_user.username, password='Password123')
+        response = self.client.get(reverse('export_invoices', kwargs={'export_format': 'xml'}))
+        self.assertEqual(response.status_code, 404)
+
+    def test_export_csv_streams_every_invoice(self):
+        self.client.login(username=self.admin_user.username, password='Password123')
+        response = self.client.get(self.url)
+        self.assertTrue(response.streaming)
+        self.assertEqual(response['Content-Type'], 'text/csv')
+        self.assertIn('attachment; filename="invoices-', response['Content-Disposition'])
+        rows = list(csv.DictReader(io.StringIO(b''.join(response.streaming_content).decode())))
+        self.assertEqual(len(rows), 2)
+        self.assertEqual(rows[0]['student_username'], '@janedoe')
+        self.assertEqual(rows[0]['tutor_username'], '@petrapickles')
+        self.assertEqual(rows[0]['session'], str(self.sessions[0]))
+        self.assertEqual(rows[0]['amount'], '50.00')
+
+    def test_export_jsonl_streams_every_invoice(self):
+        self.client.login(username=self.admin_user.username, password='Password123')
+        response = self.client.get(reverse('export_invoices', kwargs={'export_format': 'jsonl'}))
+        lines = b''.join(response.streaming_content).decode().splitlines()
+        rows = [json.loads(line) for line in lines]
+        self.assertEqual([row['payment_status'] for row in rows], ['PENDING', 'PENDING'])
+
+    def test_export_runs_one_query(self):
+        self.client.login(username=self.admin_user.username, password='Password123')
+        response = self.client.get(self.url)
+        with self.assertNumQueries(1):
+            b''.join(response.streaming_content)
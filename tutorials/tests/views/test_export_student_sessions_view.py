@@ -0,0 +1,58 @@
+"""Tests of the export student sessions view."""
+import csv
+import io
+import json
+from django.test import TestCase
+from django.urls import reverse
+from tutorials.models import User, Student, StudentSession, Session, TutorSession, Tutor, ProgrammingLanguage
+
+class ExportStudentSessionsViewTestCase(TestCase):
+    """Tests of the export student sessions view."""
+
+    fixtures = [
+        'tutorials/tests/fixtures/default_user.json',
+        'tutorials/tests/fixtures/other_users.json'
+    ]
+
+    def setUp(self):
+        self.url = reverse('export_student_sessions', kwargs={'export_format': 'csv'})
+        self.admin_user = User.objects.get(username='@johndoe')
+        self.student_user = User.objects.get(username='@janedoe')
+        student = Student.objects.create(user=self.student_user)
+        tutor = Tutor.objects.create(user=User.objects.get(username='@petrapickles'))
+        language = ProgrammingLanguage.objects.create(name='Python')
+        session = Session.objects.create(
+            programming_language=language,
+            level='beginner',
+            season='Fall',
+            year=2024,
+            frequency='Weekly',
+            duration_hours=2
+        )
+        tutor_session = TutorSession.objects.create(tutor=tutor, session=session)
+        self.student_session = StudentSession.objects.create(student=student, tutor_session=tutor_session)
+
+    def test_export_student_sessions_url(self):
+        self.assertEqual(self.url, '/student-sessions/export/csv/')
+
+    def test_export_redirects_when_not_admin(self):
+        self.client.login(username=self.student_user.username, password='Password123')
+        response = self.client.get(self.url)
+        self.assertRedirects(response, reverse('dashboard'), status_code=302, target_status_code=200)
+
+    def test_export_csv_streams_every_student_session(self):
+        self.client.login(username=self.admin_user.username, password='Password123')
+        response = self.client.get(self.url)
+        self.assertTrue(response.streaming)
+        rows = list(csv.DictReader(io.StringIO(b''.join(response.streaming_content).decode())))
+        self.assertEqual(len(rows), 1)
+        self.assertEqual(rows[0]['id'], str(self.student_session.pk))
+        self.assertEqual(rows[0]['programming_language'], 'Python')
+        self.assertEqual(rows[0]['status'], 'Send Invoice')
+
+    def test_export_jsonl_streams_every_student_session(self):
+        self.client.login(username=self.admin_user.username, password='Password123')
+        response = self.client.get(reverse('export_student_sessions', kwargs={'export_format': 'jsonl'}))
+        rows = [json.loads(line) for line in b''.join(response.streaming_content).decode().splitlines()]
+        self.assertEqual(rows[0]['student_username'], '@janedoe')
+        self.assertEqual(rows[0]['year'], 2024)
@@ -1,4 +1,6 @@
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from tutorials.models import User, Student, StudentSession, Session, TutorSession, Tutor, ProgrammingLanguage, Invoice
 
@@ -69,6 +71,12 @@ class InvoicesViewTestCase(TestCase):
         self.assertEqual(len(invoices), 1)
         self.assertEqual(invoices[0], self.invoice)
 
+    def test_get_invoices_shows_counts_per_status(self):
+        self.client.login(username=self.admin_user.username, password='Password123')
+        response = self.client.get(self.url)
+        self.assertEqual(response.context['invoice_counts'], {'PENDING': 1, 'PAID': 0, 'OVERDUE': 0, 'CANCELLED': 0})
+        self.assertContains(response, 'Pending: 1')
+
     def test_invoices_pagination(self):
         self.client.login(username=self.admin_user.username, password='Password123')
         response = self.client.get(self.url)
@@ -93,7 +101,7 @@ class InvoicesViewTestCase(TestCase):
                 )
             )
             
-            session = Session.objects.create(
+            session, _ = Session.objects.get_or_create(
                 programming_language=self.language,
                 level='beginner',
                 season='Fall',
@@ -102,7 +110,7 @@ class InvoicesViewTestCase(TestCase):
                 duration_hours=2
             )
             
-            tutor_session = TutorSession.objects.create(
+            tutor_session, _ = TutorSession.objects.get_or_create(
                 tutor=self.tutor,
                 session=session
             )
@@ -123,14 +131,24 @@ class InvoicesViewTestCase(TestCase):
         self.assertFalse(response.context['invoices'].has_previous())
         
         # Test second page
-        response = self.client.get(f"{self.url}?page=2")
+        next_cursor = response.context['invoices'].next_cursor
+        response = self.client.get(f"{self.url}?cursor={next_cursor}")
         self.assertEqual(len(response.context['invoices']), 2)  # Second page should have 2 items
         self.assertFalse(response.context['invoices'].has_next())
         self.assertTrue(response.context['invoices'].has_previous())
         
-        # Test invalid page
-        response = self.client.get(f"{self.url}?page=999")
-        self.assertEqual(len(response.context['invoices']), 2)  # Should show last page
+        self.assertEqual(response.context['invoices'].number, 2)
+
+        # Test going back to the first page
+        previous_cursor = response.context['invoices'].previous_cursor
+        response = self.client.get(f"{self.url}?cursor={previous_cursor}")
+        self.assertEqual(len(response.context['invoices']), 10)
+        self.assertEqual(response.context['invoices'].number, 1)
+        self.assertFalse(response.context['invoices'].has_previous())
+
+        # Test invalid cursor
+        response = self.client.get(f"{self.url}?cursor=invalid")
+        self.assertEqual(len(response.context['invoices']), 10)  # Should show first page
 
     def test_get_invoices_tutor_redirect(self):
         self.client.login(username=self.tutor_user.username, password='Password123')
@@ -142,3 +160,36 @@ class InvoicesViewTestCase(TestCase):
         response = self.client.post(self.url)
         self.assertEqual(response.status_code, 200)
         self.assertTemplateUsed(response, 'invoices.html')
+
+    def test_invoices_query_count_does_not_depend_on_rows(self):
+        self.client.login(username=self.admin_user.username, password='Password123')
+        with CaptureQueriesContext(connection) as one_row:
+            self.client.get(self.url)
+
+        for i in range(5):
+            Invoice.objects.create(session=self._create_student_session(i))
+        with CaptureQueriesContext(connection) as many_rows:
+            response = self.client.get(self.url)
+
+        self.assertEqual(len(response.context['invoices']), 6)
+        self.assertEqual(len(one_row), len(many_rows))
+
+    def _create_student_session(self, index):
+        student = Student.objects.create(
+            user=User.objects.create(
+                username=f'@student{index}',
+                first_name=f'Student{index}',
+                last_name='Test',
+                email=f'student{index}@example.org'
+            )
+        )
+        tutor = Tutor.objects.create(
+            user=User.objects.create(
+                username=f'@tutor{index}',
+                first_name=f'Tutor{index}',
+                last_name='Test',
+                email=f'tutor{index}@example.org'
+            )
+        )
+        tutor_session = TutorSession.objects.create(tutor=tutor, session=self.session)
+        return StudentSession.objects.create(student=student, tutor_session=tutor_session)
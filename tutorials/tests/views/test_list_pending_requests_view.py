@@ -1,5 +1,8 @@
 """Tests of the list pending requests view."""
+from itertools import islice, product
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from tutorials.models import User, Student, Session, RequestedStudentSession, ProgrammingLanguage
 
@@ -113,13 +116,14 @@ class ListPendingRequestsViewTestCase(TestCase):
         self.client.login(username=self.admin_user.username, password='Password123')
         
         # Create 11 more requests (12 total)
-        for i in range(11):
+        catalog_keys = product(['beginner', 'intermediate', 'advanced'], ['Fall', 'Spring', 'Summer'], [2024, 2025, 2026])
+        for level, season, year in islice(catalog_keys, 11):
             session = Session.objects.create(
                 programming_language=self.language,
-                level='beginner',
-                season='Fall',
-                year=2024,
-                frequency='Weekly',
+                level=level,
+                season=season,
+                year=year,
+                frequency='Bi-Weekly',
                 duration_hours=2
             )
             RequestedStudentSession.objects.create(
@@ -135,11 +139,42 @@ class ListPendingRequestsViewTestCase(TestCase):
         self.assertFalse(response.context['requests'].has_previous())
         
         # Test second page
-        response = self.client.get(f"{self.url}?page=2")
+        next_cursor = response.context['requests'].next_cursor
+        response = self.client.get(f"{self.url}?cursor={next_cursor}")
         self.assertEqual(len(response.context['requests']), 2)  # Second page should have 2 items
         self.assertFalse(response.context['requests'].has_next())
         self.assertTrue(response.context['requests'].has_previous())
         
-        # Test invalid page
-        response = self.client.get(f"{self.url}?page=999")
-        self.assertEqual(len(response.context['requests']), 2)  # Should show last page
+        self.assertEqual(response.context['requests'].number, 2)
+
+        # Test going back to the first page
+        previous_cursor = response.context['requests'].previous_cursor
+        response = self.client.get(f"{self.url}?cursor={previous_cursor}")
+        self.assertEqual(len(response.context['requests']), 10)
+        self.assertEqual(response.context['requests'].number, 1)
+        self.assertFalse(response.context['requests'].has_previous())
+
+        # Test invalid cursor
+        response = self.client.get(f"{self.url}?cursor=invalid")
+        self.assertEqual(len(response.context['requests']), 10)  # Should show first page
+
+    def test_list_pending_requests_query_count_does_not_depend_on_rows(self):
+        self.client.login(username=self.admin_user.username, password='Password123')
+        with CaptureQueriesContext(connection) as one_row:
+            self.client.get(self.url)
+
+        for i in range(5):
+            student = Student.objects.create(
+                user=User.objects.create(
+                    username=f'@student{i}',
+                    first_name=f'Student{i}',
+                    last_name='Test',
+                    email=f'student{i}@example.org'
+                )
+            )
+            RequestedStudentSession.objects.create(student=student, session=self.session)
+        with CaptureQueriesContext(connection) as many_rows:
+            response = self.client.get(self.url)
+
+        self.assertEqual(len(response.context['requests']), 6)
+        self.assertEqual(len(one_row), len(many_rows))
@@ -1,6 +1,7 @@
 from django.test import TestCase
 from django.urls import reverse
 from tutorials.models import User, Student
+from tutorials.search import rebuild_search_index
 
 class ListStudentsViewTestCase(TestCase):
     """Test of the list students view"""
@@ -93,11 +94,53 @@ class ListStudentsViewTestCase(TestCase):
         self.assertFalse(response.context['students'].has_previous())
         
         # Test second page
-        response = self.client.get(f"{self.url}?page=2")
+        next_cursor = response.context['students'].next_cursor
+        response = self.client.get(f"{self.url}?cursor={next_cursor}")
         self.assertEqual(len(response.context['students']), 2)  # Second page should have 2 items
         self.assertFalse(response.context['students'].has_next())
         self.assertTrue(response.context['students'].has_previous())
         
-        # Test invalid page
-        response = self.client.get(f"{self.url}?page=999")
-        self.assertEqual(len(response.context['students']), 2)  # Should show last page
+        self.assertEqual(response.context['students'].number, 2)
+
+        # Test going back to the first page
+        previous_cursor = response.context['students'].previous_cursor
+        response = self.client.get(f"{self.url}?cursor={previous_cursor}")
+        self.assertEqual(len(response.context['students']), 10)
+        self.assertEqual(response.context['students'].number, 1)
+        self.assertFalse(response.context['students'].has_previous())
+
+        # Test invalid cursor
+        response = self.client.get(f"{self.url}?cursor=invalid")
+        self.assertEqual(len(response.context['students']), 10)  # Should show first page
+
+    def test_list_students_search(self):
+        self.client.login(username=self.admin_user.username, password='Password123')
+        Student.objects.create(user=User.objects.get(username='@peterpickles'))
+        response = self.client.get(self.url, {'q': 'jane'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([student.user for student in response.context['students']], [self.student_user])
+        self.assertContains(response, 'value="jane"')
+
+    def test_list_students_search_does_not_list_other_roles(self):
+        self.client.login(username=self.admin_user.username, password='Password123')
+        response = self.client.get(self.url, {'q': 'petra'})
+        self.assertEqual(len(response.context['students']), 0)
+        self.assertContains(response, 'No students found.')
+
+    def test_list_students_search_pages_through_every_match(self):
+        users = User.objects.bulk_create([
+            User(username=f'@smith{index}', first_name='Pat', last_name='Smith', email=f'smith{index}@example.org')
+            for index in range(150)
+        ])
+        Student.objects.bulk_create([Student(user=user) for user in users])
+        rebuild_search_index()
+        self.client.login(username=self.admin_user.username, password='Password123')
+        listed = []
+        response = self.client.get(self.url, {'q': 'smith'})
+        while True:
+            students = response.context['students']
+            listed.extend(student.user for student in students)
+            if not students.has_next():
+                break
+            response = self.client.get(self.url, {'q': 'smith', 'cursor': students.next_cursor})
+        self.assertEqual(sorted(user.pk for user in listed), sorted(user.pk for user in users))
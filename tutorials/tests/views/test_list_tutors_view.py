@@ -93,11 +93,54 @@ class ListTutorViewTestCase(TestCase):
         self.assertFalse(response.context['tutors'].has_previous())
         
         # Test second page
-        response = self.client.get(f"{self.url}?page=2")
+        next_cursor = response.context['tutors'].next_cursor
+        response = self.client.get(f"{self.url}?cursor={next_cursor}")
         self.assertEqual(len(response.context['tutors']), 2)  # Second page should have 2 items
         self.assertFalse(response.context['tutors'].has_next())
         self.assertTrue(response.context['tutors'].has_previous())
         
-        # Test invalid page
-        response = self.client.get(f"{self.url}?page=999")
-        self.assertEqual(len(response.context['tutors']), 2)  # Should show last page
+        self.assertEqual(response.context['tutors'].number, 2)
+
+        # Test going back to the first page
+        previous_cursor = response.context['tutors'].previous_cursor
+        response = self.client.get(f"{self.url}?cursor={previous_cursor}")
+        self.assertEqual(len(response.context['tutors']), 10)
+        self.assertEqual(response.context['tutors'].number, 1)
+        self.assertFalse(response.context['tutors'].has_previous())
+
+        # Test invalid cursor
+        response = self.client.get(f"{self.url}?cursor=invalid")
+        self.assertEqual(len(response.context['tutors']), 10)  # Should show first page
+
+    def test_list_tutors_search(self):
+        self.client.login(username=self.admin_user.username, password='Password123')
+        Tutor.objects.create(user=User.objects.get(username='@peterpickles'))
+        response = self.client.get(self.url, {'q': 'petra'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([tutor.user for tutor in response.context['tutors']], [self.tutor_user])
+        self.assertEqual(response.context['query'], 'petra')
+        self.assertContains(response, 'value="petra"')
+
+    def test_list_tutors_search_without_matches(self):
+        self.client.login(username=self.admin_user.username, password='Password123')
+        response = self.client.get(self.url, {'q': 'nobody'})
+        self.assertEqual(len(response.context['tutors']), 0)
+        self.assertContains(response, 'No tutors found.')
+
+    def test_list_tutors_search_pages_keep_the_query(self):
+        self.client.login(username=self.admin_user.username, password='Password123')
+        for i in range(11):
+            user = User.objects.create(
+                username=f'@tutor{i}',
+                first_name=f'Tutor{i}',
+                last_name='Searchable',
+                email=f'tutor{i}@example.org'
+            )
+            Tutor.objects.create(user=user)
+        response = self.client.get(self.url, {'q': 'searchable'})
+        self.assertEqual(len(response.context['tutors']), 10)
+        self.assertContains(response, '&q=searchable')
+        next_cursor = response.context['tutors'].next_cursor
+        response = self.client.get(self.url, {'q': 'searchable', 'cursor': next_cursor})
+        self.assertEqual(len(response.context['tutors']), 1)
+        self.assertNotIn(self.tutor_user, [tutor.user for tutor in response.context['tutors']])
@@ -0,0 +1,42 @@
+"""Tests of the performance report view."""
+from django.test import TestCase
+from django.urls import reverse
+from tutorials.models import User
+from tutorials.perf import reset_perf_stats
+
+class PerfReportViewTestCase(TestCase):
+    """Tests of the performance report view."""
+
+    fixtures = [
+        'tutorials/tests/fixtures/default_user.json',
+        'tutorials/tests/fixtures/other_users.json'
+    ]
+
+    def setUp(self):
+        reset_perf_stats()
+        self.addCleanup(reset_perf_stats)
+        self.url = reverse('perf_report')
+        self.admin_user = User.objects.get(username='@johndoe')
+        self.student_user = User.objects.get(username='@janedoe')
+
+    def test_perf_report_url(self):
+        self.assertEqual(self.url, '/ops/perf/')
+
+    def test_get_perf_report_redirects_when_not_logged_in(self):
+        response = self.client.get(self.url)
+        redirect_url = reverse('log_in') + f'?next={self.url}'
+        self.assertRedirects(response, redirect_url, status_code=302, target_status_code=200)
+
+    def test_get_perf_report_redirects_when_not_admin(self):
+        self.client.login(username=self.student_user.username, password='Password123')
+        response = self.client.get(self.url)
+        self.assertRedirects(response, reverse('dashboard'), status_code=302, target_status_code=200)
+
+    def test_get_perf_report(self):
+        self.client.login(username=self.admin_user.username, password='Password123')
+        self.client.get(reverse('list_tutors'))
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertTemplateUsed(response, 'perf_report.html')
+        self.assertIn('list_tutors', [row['url_name'] for row in response.context['stats']])
+        self.assertContains(response, '<td>list_tutors</td>', html=True)
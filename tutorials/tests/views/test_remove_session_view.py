@@ -63,6 +63,12 @@ class RemoveSessionViewTestCase(TestCase):
         with self.assertRaises(StudentSession.DoesNotExist):
             StudentSession.objects.get(pk=self.student_session.pk)
 
+    def test_remove_session_makes_the_tutor_session_available_again(self):
+        self.assertFalse(TutorSession.objects.get(pk=self.tutor_session.pk).is_available)
+        self.client.login(username=self.admin_user.username, password='Password123')
+        self.client.get(self.url)
+        self.assertTrue(TutorSession.objects.get(pk=self.tutor_session.pk).is_available)
+
     def test_remove_session_non_existing_session(self):
         self.client.login(username=self.admin_user.username, password='Password123')
         non_existing_url = reverse('remove_session', kwargs={'session_id': 9999})
@@ -1,6 +1,9 @@
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
-from tutorials.models import User, Student, RequestedStudentSession, ProgrammingLanguage, TutorSession, Tutor
+from tutorials.languages import invalidate_languages
+from tutorials.models import User, Student, RequestedStudentSession, ProgrammingLanguage, Session, TutorSession, Tutor
 from tutorials.forms import SessionForm
 
 class RequestSessionViewTestCase(TestCase):
@@ -104,3 +107,45 @@ class RequestSessionViewTestCase(TestCase):
         self.assertTemplateUsed(response, 'request_session.html')
         self.assertIn('message', response.context)
         self.assertEqual(response.context['message'], 'There was an error with your submission.')
+
+    def test_student_and_tutor_requests_share_the_catalog_session(self):
+        session_data = {
+            'programming_language': self.language.id,
+            'level': 'beginner',
+            'season': 'Fall',
+            'year': 2024,
+            'frequency': 'Weekly',
+            'duration_hours': 1,
+        }
+        self.client.login(username=self.tutor_user.username, password='Password123')
+        self.client.post(self.url, session_data)
+        self.client.login(username=self.student_user.username, password='Password123')
+        self.client.post(self.url, session_data)
+        session = Session.objects.get()
+        self.assertEqual(TutorSession.objects.get().session, session)
+        self.assertEqual(RequestedStudentSession.objects.get().session, session)
+
+    def test_repeated_session_offer_for_tutor(self):
+        session_data = {
+            'programming_language': self.language.id,
+            'level': 'beginner',
+            'season': 'Fall',
+            'year': 2024,
+            'frequency': 'Weekly',
+            'duration_hours': 1,
+        }
+        self.client.login(username=self.tutor_user.username, password='Password123')
+        self.client.post(self.url, session_data)
+        response = self.client.post(self.url, session_data)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(TutorSession.objects.count(), 1)
+        self.assertEqual(response.context['message'], 'There was a validation error with your request.')
+
+    def test_get_request_session_does_not_query_languages_once_loaded(self):
+        self.addCleanup(invalidate_languages)
+        self.client.login(username=self.student_user.username, password='Password123')
+        self.client.get(self.url)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.url)
+        self.assertContains(response, 'Python')
+        self.assertFalse([query for query in queries if 'tutorials_programminglanguage' in query['sql']])
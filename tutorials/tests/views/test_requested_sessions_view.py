@@ -1,4 +1,6 @@
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from tutorials.models import User, Student, Session, RequestedStudentSession, ProgrammingLanguage
 
@@ -103,3 +105,24 @@ class RequestedSessionsViewTestCase(TestCase):
         self.assertEqual(response.status_code, 200)
         sessions = response.context['requested_sessions']
         self.assertEqual(len(sessions), 0)
+
+    def test_requested_sessions_query_count_does_not_depend_on_rows(self):
+        self.client.login(username=self.student_user.username, password='Password123')
+        with CaptureQueriesContext(connection) as one_row:
+            self.client.get(self.url)
+
+        for level in ['intermediate', 'advanced']:
+            session = Session.objects.create(
+                programming_language=self.language,
+                level=level,
+                season='Spring',
+                year=2025,
+                frequency='Weekly',
+                duration_hours=2
+            )
+            RequestedStudentSession.objects.create(student=self.student, session=session)
+        with CaptureQueriesContext(connection) as many_rows:
+            response = self.client.get(self.url)
+
+        self.assertEqual(len(response.context['requested_sessions']), 3)
+        self.assertEqual(len(one_row), len(many_rows))
@@ -1,9 +1,12 @@
 """Tests of the sign up view."""
 from django.contrib.auth.hashers import check_password
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from tutorials.forms import SignUpForm
-from tutorials.models import User
+from tutorials.languages import invalidate_languages
+from tutorials.models import ProgrammingLanguage, User
 from tutorials.tests.helper_classes import LogInTester
 
 class SignUpViewTestCase(TestCase, LogInTester):
@@ -131,3 +134,12 @@ class SignUpViewTestCase(TestCase, LogInTester):
         redirect_url = reverse('dashboard')
         self.assertRedirects(response, redirect_url, status_code=302, target_status_code=200)
         self.assertTemplateUsed(response, 'tutor_dashboard.html')
+
+    def test_get_sign_up_does_not_query_languages_once_loaded(self):
+        self.addCleanup(invalidate_languages)
+        ProgrammingLanguage.objects.create(name='Python')
+        self.client.get(self.url)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.url)
+        self.assertContains(response, 'Python')
+        self.assertFalse([query for query in queries if 'tutorials_programminglanguage' in query['sql']])
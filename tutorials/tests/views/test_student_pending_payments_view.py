@@ -1,4 +1,6 @@
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from tutorials.models import User, Student, StudentSession, Session, TutorSession, Tutor, ProgrammingLanguage, Invoice
 
@@ -97,6 +99,22 @@ class StudentPendingPaymentsViewTestCase(TestCase):
         self.assertEqual(pending_payments[0], self.invoice)
         self.assertNotIn(other_invoice, pending_payments)
 
+    def test_student_pending_payments_shows_overdue_invoices(self):
+        self.invoice.payment_status = 'OVERDUE'
+        self.invoice.save()
+        self.client.login(username=self.student_user.username, password='Password123')
+        response = self.client.get(self.url)
+        self.assertEqual(list(response.context['pending_payments']), [self.invoice])
+        self.assertContains(response, 'Overdue')
+        self.assertContains(response, reverse('confirm_payment', args=[self.invoice.pk]))
+
+    def test_student_pending_payments_hides_paid_invoices(self):
+        self.invoice.mark_as_paid()
+        self.client.login(username=self.student_user.username, password='Password123')
+        response = self.client.get(self.url)
+        self.assertEqual(len(response.context['pending_payments']), 0)
+        self.assertContains(response, 'You have no pending invoices at this time.')
+
     def test_student_pending_payments_with_non_existent_student(self):
         # Create a user with student role but no Student profile
         user_without_student = User.objects.create_user(
@@ -120,3 +138,30 @@ class StudentPendingPaymentsViewTestCase(TestCase):
         self.assertEqual(response.status_code, 200)
         self.assertTemplateUsed(response, 'student_pending_payment.html')
         self.assertIn('pending_payments', response.context)
+
+    def test_student_pending_payments_query_count_does_not_depend_on_rows(self):
+        self.client.login(username=self.student_user.username, password='Password123')
+        with CaptureQueriesContext(connection) as one_row:
+            self.client.get(self.url)
+
+        for i in range(5):
+            tutor = Tutor.objects.create(
+                user=User.objects.create(
+                    username=f'@tutor{i}',
+                    first_name=f'Tutor{i}',
+                    last_name='Test',
+                    email=f'tutor{i}@example.org'
+                )
+            )
+            tutor_session = TutorSession.objects.create(tutor=tutor, session=self.session)
+            student_session = StudentSession.objects.create(
+                student=self.student,
+                tutor_session=tutor_session,
+                status='Payment Pending'
+            )
+            Invoice.objects.create(session=student_session, payment_status='PENDING')
+        with CaptureQueriesContext(connection) as many_rows:
+            response = self.client.get(self.url)
+
+        self.assertEqual(len(response.context['pending_payments']), 6)
+        self.assertEqual(len(one_row), len(many_rows))
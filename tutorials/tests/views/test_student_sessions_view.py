@@ -1,4 +1,6 @@
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from django.core.paginator import Paginator
 from tutorials.models import User, Student, StudentSession, Session, TutorSession, Tutor, ProgrammingLanguage
@@ -90,7 +92,7 @@ class StudentSessionsViewTestCase(TestCase):
                 )
             )
             
-            session = Session.objects.create(
+            session, _ = Session.objects.get_or_create(
                 programming_language=self.language,
                 level='beginner',
                 season='Fall',
@@ -99,7 +101,7 @@ class StudentSessionsViewTestCase(TestCase):
                 duration_hours=2
             )
             
-            tutor_session = TutorSession.objects.create(
+            tutor_session, _ = TutorSession.objects.get_or_create(
                 tutor=self.tutor,
                 session=session
             )
@@ -116,11 +118,54 @@ class StudentSessionsViewTestCase(TestCase):
         self.assertFalse(response.context['sessions'].has_previous())
         
         # Test second page
-        response = self.client.get(f"{self.url}?page=2")
+        next_cursor = response.context['sessions'].next_cursor
+        response = self.client.get(f"{self.url}?cursor={next_cursor}")
         self.assertEqual(len(response.context['sessions']), 2)  # Second page should have 2 items
         self.assertFalse(response.context['sessions'].has_next())
         self.assertTrue(response.context['sessions'].has_previous())
         
-        # Test invalid page
-        response = self.client.get(f"{self.url}?page=999")
-        self.assertEqual(len(response.context['sessions']), 2)  # Should show last page
+        self.assertEqual(response.context['sessions'].number, 2)
+
+        # Test going back to the first page
+        previous_cursor = response.context['sessions'].previous_cursor
+        response = self.client.get(f"{self.url}?cursor={previous_cursor}")
+        self.assertEqual(len(response.context['sessions']), 10)
+        self.assertEqual(response.context['sessions'].number, 1)
+        self.assertFalse(response.context['sessions'].has_previous())
+
+        # Test invalid cursor
+        response = self.client.get(f"{self.url}?cursor=invalid")
+        self.assertEqual(len(response.context['sessions']), 10)  # Should show first page
+
+    def test_student_sessions_query_count_does_not_depend_on_rows(self):
+        self.client.login(username=self.admin_user.username, password='Password123')
+        with CaptureQueriesContext(connection) as one_row:
+            self.client.get(self.url)
+
+        for i in range(5):
+            self._create_student_session(i)
+        with CaptureQueriesContext(connection) as many_rows:
+            response = self.client.get(self.url)
+
+        self.assertEqual(len(response.context['sessions']), 6)
+        self.assertEqual(len(one_row), len(many_rows))
+
+    def _create_student_session(self, index):
+        student = Student.objects.create(
+            user=User.objects.create(
+                username=f'@student{index}',
+                first_name=f'Student{index}',
+                last_name='Test',
+                email=f'student{index}@example.org'
+            )
+        )
+        tutor = Tutor.objects.create(
+            user=User.objects.create(
+                username=f'@tutor{index}',
+                first_name=f'Tutor{index}',
+                last_name='Test',
+                email=f'tutor{index}@example.org'
+            )
+        )
+        tutor_session = TutorSession.objects.create(tutor=tutor, session=self.session)
+        return StudentSession.objects.create(student=student, tutor_session=tutor_session)
@@ -1,4 +1,6 @@
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from tutorials.models import User, Student, StudentSession, Session, TutorSession, Tutor, ProgrammingLanguage
 
@@ -108,3 +110,25 @@ class YourSessionsViewTestCase(TestCase):
         self.client.login(username=user_without_profile.username, password='Password123')
         response = self.client.get(self.url)
         self.assertEqual(response.status_code, 404)
+
+    def test_your_sessions_query_count_does_not_depend_on_rows(self):
+        self.client.login(username=self.student_user.username, password='Password123')
+        with CaptureQueriesContext(connection) as one_row:
+            self.client.get(self.url)
+
+        for i in range(5):
+            tutor = Tutor.objects.create(
+                user=User.objects.create(
+                    username=f'@tutor{i}',
+                    first_name=f'Tutor{i}',
+                    last_name='Test',
+                    email=f'tutor{i}@example.org'
+                )
+            )
+            tutor_session = TutorSession.objects.create(tutor=tutor, session=self.session)
+            StudentSession.objects.create(student=self.student, tutor_session=tutor_session)
+        with CaptureQueriesContext(connection) as many_rows:
+            response = self.client.get(self.url)
+
+        self.assertEqual(len(response.context['student_sessions']), 6)
+        self.assertEqual(len(one_row), len(many_rows))
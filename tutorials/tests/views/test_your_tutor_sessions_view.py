@@ -1,4 +1,6 @@
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from tutorials.models import User, Student, StudentSession, Session, TutorSession, Tutor, ProgrammingLanguage
 
@@ -102,3 +104,38 @@ class YourTutorSessionsViewTestCase(TestCase):
         self.client.login(username=user_without_profile.username, password='Password123')
         response = self.client.get(self.url)
         self.assertEqual(response.status_code, 404)
+
+    def test_your_tutor_sessions_query_count_does_not_depend_on_rows(self):
+        self.client.login(username=self.tutor_user.username, password='Password123')
+        self._enroll_student(0, self.tutor_session)
+        with CaptureQueriesContext(connection) as one_row:
+            self.client.get(self.url)
+
+        for i in range(1, 4):
+            session = Session.objects.create(
+                programming_language=self.language,
+                level='advanced',
+                season='Spring',
+                year=2023 + i,
+                frequency='Weekly',
+                duration_hours=2
+            )
+            tutor_session = TutorSession.objects.create(tutor=self.tutor, session=session)
+            self._enroll_student(i, tutor_session)
+            self._enroll_student(i + 10, tutor_session)
+        with CaptureQueriesContext(connection) as many_rows:
+            response = self.client.get(self.url)
+
+        self.assertEqual(len(response.context['tutor_sessions']), 4)
+        self.assertEqual(len(one_row), len(many_rows))
+
+    def _enroll_student(self, index, tutor_session):
+        student = Student.objects.create(
+            user=User.objects.create(
+                username=f'@student{index}',
+                first_name=f'Student{index}',
+                last_name='Test',
+                email=f'student{index}@example.org'
+            )
+        )
+        return StudentSession.objects.create(student=student, tutor_session=tutor_session)
@@ -1,4 +1,4 @@
-from django.http import Http404, HttpResponseRedirect
+from django.http import Http404, HttpResponseRedirect, StreamingHttpResponse
 from django.conf import settings
 from django.contrib import messages
 from django.contrib.auth import login, logout
@@ -10,7 +10,12 @@ from django.views import View
 from django.views.generic.edit import FormView, UpdateView
 from django.urls import reverse
 from tutorials.forms import LogInForm, PasswordForm, UserForm, SignUpForm
-from tutorials.helpers import login_prohibited
+from tutorials.helpers import login_prohibited, get_admin_statistics, get_invoice_counts
+from tutorials import selectors, services
+from tutorials.exports import EXPORT_FORMATS, export_lines
+from tutorials.pagination import KeysetPaginator
+from tutorials.perf import PERF_BUCKETS, PERF_WINDOW, get_perf_stats
+from tutorials.search import search
 from tutorials.models import Student, Tutor, TutorSession, Invoice, StudentSession
 from django.shortcuts import redirect
 from django.http import HttpResponseForbidden
@@ -43,8 +48,8 @@ def request_session(request):
                 # Save the session object
                 session = form.save()
 
-                # Get the related student profile
-                student = Student.objects.get(user=current_user)
+                # The student profile loaded with the user
+                student = request.profile
 
                 print(f"Student: {student}")
 
@@ -83,13 +88,13 @@ def request_session(request):
                 # Save the session objec
                 session = form.save()
 
-                # Get the related tutor profile
-                tutor = Tutor.objects.get(user=current_user)
+                # The tutor profile loaded with the user
+                tutor = request.profile
 
                 print(f"Tutor: {tutor}")
 
                 # Assign the tutor to the session
-                tutor_session = TutorSession.objects.create(
+                tutor_session = TutorSession(
                     tutor=tutor,
                     session=session,
                 )
@@ -131,6 +136,7 @@ def dashboard(request):
         return render(request, 'tutor_dashboard.html', context)
 
     elif current_user.role == 'ADMIN':
+        context['statistics'] = get_admin_statistics()
         return render(request, 'admin_dashboard.html', context)
 
     else:
@@ -282,7 +288,7 @@ def list_pending_requests(request):
     language_filter = request.GET.get('language')
 
     # Base queryset for pending requests
-    pending_requests = RequestedStudentSession.objects.filter(is_approved=False)
+    pending_requests = selectors.pending_requests_list()
 
     # Apply filters
     if level_filter and level_filter != "All Levels":
@@ -293,9 +299,8 @@ def list_pending_requests(request):
         pending_requests = pending_requests.filter(session__programming_language__name=language_filter)
 
     # Pagination
-    paginator = Paginator(pending_requests, 10)
-    page_number = request.GET.get('page')
-    requests = paginator.get_page(page_number)
+    paginator = KeysetPaginator(pending_requests, 10, ['-requested_at'])
+    requests = paginator.get_page(request.GET.get('cursor'))
 
     # Fetch distinct levels, years, and programming languages for filter options
     levels = RequestedStudentSession.objects.values_list('session__level', flat=True).distinct()
@@ -325,22 +330,26 @@ def list_tutors(request):
 
     # Get sort order from query parameters, default to ascending
     sort_order = request.GET.get('sort', 'asc')  
+    query = request.GET.get('q', '').strip()
 
     # Fetch the tutor list and apply sorting based on the sort_order
     tutor_list = Tutor.objects.all().select_related('user')
 
-    if sort_order == 'asc':
-        tutor_list = tutor_list.order_by('user__first_name')
+    if query:
+        # Search results are listed best match first
+        tutor_list = search(tutor_list, query, 'user', User.Roles.TUTOR)
+        ordering = ['search_rank']
+    elif sort_order == 'asc':
+        ordering = ['user__first_name']
     else:
-        tutor_list = tutor_list.order_by('-user__first_name')
+        ordering = ['-user__first_name']
 
     # Paginate the tutors
-    paginator = Paginator(tutor_list, 10)
-    page_number = request.GET.get('page')
-    tutors = paginator.get_page(page_number)
+    paginator = KeysetPaginator(tutor_list, 10, ordering)
+    tutors = paginator.get_page(request.GET.get('cursor'))
 
     # Render the template with tutors and sort order
-    return render(request, 'list_tutors.html', {'tutors': tutors, 'sort_order': sort_order})
+    return render(request, 'list_tutors.html', {'tutors': tutors, 'sort_order': sort_order, 'query': query})
 
     
 @login_required
@@ -351,18 +360,22 @@ def list_students(request):
         return redirect('dashboard')  # Redirect non-admin users to their dashboard
 
     sort_order = request.GET.get('sort', 'asc')  # Default sort order is ascending
+    query = request.GET.get('q', '').strip()
     students_list = Student.objects.all().select_related('user')
 
-    if sort_order == 'asc':
-        students_list = students_list.order_by('user__first_name')
+    if query:
+        # Search results are listed best match first
+        students_list = search(students_list, query, 'user', User.Roles.STUDENT)
+        ordering = ['search_rank']
+    elif sort_order == 'asc':
+        ordering = ['user__first_name']
     else:
-        students_list = students_list.order_by('-user__first_name')
+        ordering = ['-user__first_name']
 
-    paginator = Paginator(students_list, 10)
-    page_number = request.GET.get('page')
-    students = paginator.get_page(page_number)
+    paginator = KeysetPaginator(students_list, 10, ordering)
+    students = paginator.get_page(request.GET.get('cursor'))
 
-    return render(request, 'list_students.html', {'students': students, 'sort_order': sort_order})
+    return render(request, 'list_students.html', {'students': students, 'sort_order': sort_order, 'query': query})
 
 
 @login_required
@@ -442,11 +455,10 @@ def student_sessions(request):
     current_user = request.user
     if current_user.role != 'ADMIN':
         return redirect('dashboard')
-    session_list = StudentSession.objects.all()
+    session_list = selectors.student_sessions_list()
 
-    paginator = Paginator(session_list, 10)
-    page_number = request.GET.get('page')
-    sessions = paginator.get_page(page_number)
+    paginator = KeysetPaginator(session_list, 10, ['-registered_at'])
+    sessions = paginator.get_page(request.GET.get('cursor'))
     return render(request, 'student_sessions.html', {'sessions': sessions})
 
 
@@ -458,28 +470,19 @@ def send_invoice(request, session_id):
         return redirect('dashboard')
         
     try:
-        student_session = StudentSession.objects.get(pk=session_id)
-        
-        # Check if session status is valid for sending invoice
-        if student_session.status != 'Send Invoice':
-            messages.error(request, "Cannot send invoice for this session - invalid status.")
-            return redirect('student_sessions')
-            
-        student_session.status = 'Payment Pending'
-        student_session.save()
-        
-        # Create invoice only if status was valid
-        invoice = Invoice.objects.create(
-            session=student_session,
-        )
-        invoice.save()
-        
-        messages.success(request, "Invoice sent successfully.")
-        return redirect('student_sessions')
-        
+        status = StudentSession.objects.values_list('status', flat=True).get(pk=session_id)
     except StudentSession.DoesNotExist:
         raise Http404(f"Could not find student session with primary key {session_id}")
 
+    # Check if session status is valid for sending invoice
+    if status != 'Send Invoice':
+        messages.error(request, "Cannot send invoice for this session - invalid status.")
+        return redirect('student_sessions')
+
+    services.send_invoices(StudentSession.objects.filter(pk=session_id))
+    messages.success(request, "Invoice sent successfully.")
+    return redirect('student_sessions')
+
 
 @login_required
 def remove_session(request, session_id):
@@ -503,13 +506,35 @@ def invoices(request):
     current_user = request.user
     if current_user.role != 'ADMIN':
         return redirect('dashboard')
-    invoices = Invoice.objects.all()
-    paginator = Paginator(invoices, 10)
-    page_number = request.GET.get('page')
-    invoices = paginator.get_page(page_number)
-    return render(request, 'invoices.html', {'invoices': invoices})
+    invoices = selectors.invoices_list()
+    paginator = KeysetPaginator(invoices, 10, ['-created_at'])
+    invoices = paginator.get_page(request.GET.get('cursor'))
+    return render(request, 'invoices.html', {'invoices': invoices, 'invoice_counts': get_invoice_counts()})
  
 
+@login_required
+def export_invoices(request, export_format):
+    """Stream every invoice as a CSV or JSON Lines download."""
+    return _export_response(request, 'invoices', export_format)
+
+
+@login_required
+def export_student_sessions(request, export_format):
+    """Stream every student session as a CSV or JSON Lines download."""
+    return _export_response(request, 'student_sessions', export_format)
+
+
+def _export_response(request, name, export_format):
+    if request.user.role != 'ADMIN':
+        return redirect('dashboard')
+    if export_format not in EXPORT_FORMATS:
+        raise Http404(f"Unknown export format {export_format}")
+    response = StreamingHttpResponse(export_lines(name, export_format), content_type=EXPORT_FORMATS[export_format])
+    filename = f"{name}-{timezone.now():%Y-%m-%d}.{export_format}"
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    return response
+
+
 @login_required
 def available_tutors(request, request_id):
     """Display all available tutors for a specific session request."""
@@ -521,9 +546,10 @@ def available_tutors(request, request_id):
     except RequestedStudentSession.DoesNotExist:
         raise Http404(f"Could not find session request with primary key {request_id}")
     else:
-        requested_session.save()
-        tutors = requested_session.available_tutor_sessions.all()
-        print(f"Available tutors: {tutors}")
+        # Matches are maintained when sessions change, so this view only reads them
+        tutors = requested_session.available_tutor_sessions.select_related(
+            'tutor__user', 'session'
+        ).order_by('created_at', 'pk')
         paginator = Paginator(tutors, 10)
         page_number = request.GET.get('page')
         tutors = paginator.get_page(page_number)                  
@@ -537,29 +563,41 @@ def approve_session(request, request_id, tutor_session_id):
     current_user = request.user
     if current_user.role != 'ADMIN':
         return redirect('dashboard')
+    if request.method != "POST":
+        return redirect('available_tutors', request_id=request_id)
     try:
-        requested_session = RequestedStudentSession.objects.get(pk=request_id)
+        services.approve_session(request_id, tutor_session_id)
     except RequestedStudentSession.DoesNotExist:
         raise Http404(f"Could not find session request with primary key {request_id}")
-    else:
-        if request.method == "POST":
-            try:
-                tutor_session = TutorSession.objects.get(pk=tutor_session_id)
-            except TutorSession.DoesNotExist:
-                raise Http404(f"Could not find tutor session with primary key {tutor_session_id}")
-            else:
-                tutor_session.session.is_available = True
-                tutor_session.session.save()
-                StudentSession.objects.create(
-                    student=requested_session.student,
-                    tutor_session=tutor_session,
-                )
+    except TutorSession.DoesNotExist:
+        raise Http404(f"Could not find tutor session with primary key {tutor_session_id}")
+    except ValidationError as error:
+        messages.error(request, ' '.join(error.messages))
+        return redirect('available_tutors', request_id=request_id)
+    path = reverse('pending_requests')
+    return HttpResponseRedirect(path)
+
+
+@login_required
+def approve_pending_requests(request):
+    """Approve the selected session requests, each with the first available tutor session."""
+    current_user = request.user
+    if current_user.role != 'ADMIN':
+        return redirect('dashboard')
+    if request.method == "POST":
+        request_ids = [int(request_id) for request_id in request.POST.getlist('request_ids') if request_id.isdigit()]
+        try:
+            student_sessions, skipped = services.approve_sessions(request_ids)
+        except ValidationError as error:
+            messages.error(request, ' '.join(error.messages))
+            return redirect('pending_requests')
+        if student_sessions:
+            messages.success(request, f"Approved {len(student_sessions)} session requests.")
+        if skipped:
+            messages.warning(request, f"{len(skipped)} session requests have no available tutor session.")
+    return redirect('pending_requests')
+
 
-            requested_session.delete()
-            path = reverse('pending_requests')
-            return HttpResponseRedirect(path)
-   
-        
 @login_required
 def student_pending_payments(request):
     """Display all pending payments for student lessons with tutors."""
@@ -569,21 +607,16 @@ def student_pending_payments(request):
     if current_user.role != User.Roles.STUDENT:
         return redirect('dashboard')
         
-    try:
-        student = Student.objects.get(user=current_user)
-        student_sessions = StudentSession.objects.filter(student=student)
-        pending_payments = Invoice.objects.filter(
-            session__in=student_sessions,
-            payment_status='PENDING'
-        )
-        
-        return render(request, 'student_pending_payment.html', {
-            'pending_payments': pending_payments
-        })
-    except Student.DoesNotExist:
+    student = request.profile
+    if student is None:
         messages.error(request, "Student profile not found.")
         return redirect('dashboard')
 
+    pending_payments = selectors.student_pending_invoices(student)
+    return render(request, 'student_pending_payment.html', {
+        'pending_payments': pending_payments
+    })
+
 
 @login_required
 def confirm_payment(request, invoice_id):
@@ -591,68 +624,72 @@ def confirm_payment(request, invoice_id):
     current_user = request.user
     if current_user.role != 'STUDENT':
         return redirect('dashboard')
+    if request.profile is None:
+        messages.error(request, "Student profile not found.")
+        return redirect('dashboard')
         
     try:
         # Get the invoice and verify it belongs to the current student
         invoice = Invoice.objects.get(pk=invoice_id)
         
         # Check if the invoice belongs to the current student
-        if invoice.session.student != current_user.student_profile:
+        if invoice.session.student_id != request.profile.pk:
             messages.error(request, "You do not have permission to confirm this payment.")
             return redirect('student_pending_payments')
             
-        invoice.payment_status = 'PAID'
         invoice.session.status = 'Approved'
-        invoice.session.save()
-        invoice.save()
+        invoice.session.save(update_fields=['status'])
+        invoice.mark_as_paid()
         
         messages.success(request, "Payment confirmed successfully.")
         return redirect('student_pending_payments')
         
     except Invoice.DoesNotExist:
         raise Http404(f"Could not find invoice with ID {invoice_id}")
-    except Student.DoesNotExist:
-        messages.error(request, "Student profile not found.")
-        return redirect('dashboard')
 
 @login_required
 def your_sessions(request):
     # Check if the user has a student profile
-    try:
-        student_profile = request.user.student_profile
-    except AttributeError:
+    student_profile = request.profile
+    if not isinstance(student_profile, Student):
         raise Http404("You do not have a student profile.")
 
     # Fetch the sessions for the student
-    student_sessions = StudentSession.objects.filter(student=student_profile)
+    student_sessions = selectors.student_enrollments(student_profile)
 
     return render(request, 'your_sessions.html', {'student_sessions': student_sessions})
 
 @login_required
 def requested_sessions(request):
     # Filter requested sessions for the current student
-    try:
-        student_profile = request.user.student_profile
-    except AttributeError:
+    student_profile = request.profile
+    if not isinstance(student_profile, Student):
         return render(request, 'requested_sessions.html', {'requested_sessions': []})
 
-    requested_sessions = RequestedStudentSession.objects.filter(student=student_profile)
+    requested_sessions = selectors.student_requested_sessions(student_profile)
     return render(request, 'requested_sessions.html', {'requested_sessions': requested_sessions})
 
 @login_required
 def your_tutor_sessions(request):
     # Check if the user has a tutor profile
-    try:
-        tutor_profile = request.user.tutor_profile
-    except AttributeError:
+    tutor_profile = request.profile
+    if not isinstance(tutor_profile, Tutor):
         raise Http404("You do not have a tutor profile.")
 
     # Fetch the sessions for the tutor
-    tutor_sessions = TutorSession.objects.filter(tutor=tutor_profile)
+    tutor_sessions = selectors.tutor_sessions_with_students(tutor_profile)
 
     return render(request, 'your_tutor_sessions.html', {'tutor_sessions': tutor_sessions})
 
 @login_required
 def session_details(request, session_id):
     tutor_session = get_object_or_404(TutorSession, id=session_id)
-    return render(request, 'session_details.html', {'tutor_session': tutor_session})
\ No newline at end of file
+    return render(request, 'session_details.html', {'tutor_session': tutor_session})
+
+
+@login_required
+def perf_report(request):
+    """Display the recent request timings of every URL name."""
+    if request.user.role != 'ADMIN':
+        return redirect('dashboard')
+    return render(request, 'perf_report.html', {'stats': get_perf_stats(), 'buckets': PERF_BUCKETS, 'window': PERF_WINDOW})